@@ -0,0 +1,89 @@
+"""
+Cooperative build and shift helpers behind MOSbiusV2Driver.program_async.
+
+Works with MicroPython's asyncio/uasyncio and CPython's asyncio. The build
+runs as a generator (see bitstream_builder.build_steps) that is resumed one
+chunk per event-loop turn; the shift runs in bursts of whole bytes sized
+from the clock plan so no burst holds the CPU for more than max_burst_us.
+"""
+
+import time
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+PIO_TX_FIFO_DEPTH = 4
+
+
+async def run_steps_async(steps):
+    """
+    Drive a build_steps-style generator, yielding to the event loop between steps.
+    """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as e:
+            return e.value
+        await asyncio.sleep(0)
+
+
+def burst_bits(plan, max_burst_us):
+    """
+    Bits per burst: the whole bytes the plan predicts to fit in max_burst_us (at least 8).
+    """
+    if max_burst_us is None or max_burst_us <= 0:
+        raise ValueError("max_burst_us must be > 0, got {}".format(max_burst_us))
+    bit_ns = max(1, int(plan.high_ns + plan.low_ns))
+    return max(8, (int(max_burst_us) * 1000 // bit_ns) & ~7)
+
+
+async def shift_bursts_async(shift_range, nbits, step):
+    """
+    Call shift_range(high, low) for bits nbits-1 down to 0, step bits at a time.
+
+    Burst starts (low) fall on byte boundaries. Returns (busy_us, bursts):
+    the time spent inside shift_range and the number of calls.
+    """
+    busy_us = 0
+    bursts = 0
+    high = nbits
+    while high > 0:
+        low = high - step
+        low = 0 if low <= 0 else (low + 7) & ~7
+        start = time.ticks_us()
+        shift_range(high, low)
+        busy_us += time.ticks_diff(time.ticks_us(), start)
+        bursts += 1
+        high = low
+        if high:
+            await asyncio.sleep(0)
+    return busy_us, bursts
+
+
+async def feed_pio_async(sm, words, timeout_ms):
+    """
+    Feed the PIO word stream as FIFO space frees up, then await the done word.
+
+    The state machine clocks on its own, so the CPU only tops up the TX FIFO
+    and yields instead of blocking in put(). Returns the number of yields.
+    """
+    yields = 0
+    i = 0
+    n = len(words)
+    while i < n:
+        while i < n and sm.tx_fifo() < PIO_TX_FIFO_DEPTH:
+            sm.put(words[i])
+            i += 1
+        if i < n:
+            yields += 1
+            await asyncio.sleep(0)
+    start = time.ticks_ms()
+    while not sm.rx_fifo():
+        if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+            raise OSError("PIO shift did not finish within {} ms".format(timeout_ms))
+        yields += 1
+        await asyncio.sleep(0)
+    sm.get()
+    return yields
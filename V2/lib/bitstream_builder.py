@@ -1,6 +1,5 @@
 import register_map_equations as reg_eq
-
-EXPECTED_BITS = 2008
+from packed_bitstream import EXPECTED_BITS, PackedBitstream, concat_bitstreams
 
 
 def _sbus_mode_to_pair(mode):
@@ -16,86 +15,288 @@ def _sbus_mode_to_pair(mode):
     raise ValueError("Invalid SBUS mode '{}'".format(mode))
 
 
-def _set_bit(bitstream, register, value, source, set_sources):
-    if register < 1 or register > EXPECTED_BITS:
-        raise ValueError("{}: register {} out of range 1..{}".format(source, register, EXPECTED_BITS))
-    index = register - 1
-    if set_sources is not None:
-        current = bitstream[index]
-        if set_sources[index] is not None and current != value:
-            raise ValueError(
-                "{}: conflicting write for register {} ({} -> {}, previous source: {})".format(
-                    source, register, current, value, set_sources[index]
-                )
-            )
-    bitstream[index] = value
-    if set_sources is not None:
-        set_sources[index] = source
-
-
-def build_bitstream(connections, sizes, pin_to_sw_matrix, track_sources=False):
-    bitstream = bytearray(EXPECTED_BITS)
-    set_sources = [None] * EXPECTED_BITS if track_sources else None
+def _iter_writes(connections, sizes, pin_to_sw_matrix, describe=False):
+    """
+    Yield (register, value, source) for every register write in build order.
 
+    None is yielded after each bus and after the sizing registers (the
+    cooperative checkpoints of build_steps). source is only formatted with
+    describe=True; builds pass False and replay with True on the error path.
+    """
+    source = None
     for bus, entries in connections.items():
         if bus.startswith("RBUS"):
+            column = reg_eq.bus_column(bus)
             for terminal in entries:
-                sw_pin = pin_to_sw_matrix[terminal]
-                register = reg_eq.rbus_register(sw_pin, bus)
-                _set_bit(bitstream, register, 1, "RBUS {} {}".format(bus, terminal), set_sources)
+                s = reg_eq.switch_equation_index(pin_to_sw_matrix[terminal])
+                if describe:
+                    source = "RBUS {} {}".format(bus, terminal)
+                yield reg_eq.switch_register_by_index(s, column), 1, source
+            yield None
             continue
 
         if bus.startswith("SBUS"):
             has_suffix = bus[-1:] in ("a", "b")
+            if has_suffix:
+                column = reg_eq.bus_column(bus)
+            else:
+                column = reg_eq.bus_column("{}a".format(bus))
             for entry in entries:
                 terminal = entry["terminal"]
                 connection = entry["connection"]
-                sw_pin = pin_to_sw_matrix[terminal]
+                s = reg_eq.switch_equation_index(pin_to_sw_matrix[terminal])
+                a, b = _sbus_mode_to_pair(connection)
 
                 if has_suffix:
-                    register = reg_eq.sbus_register(sw_pin, bus)
-                    a, b = _sbus_mode_to_pair(connection)
-                    value = a if bus.endswith("a") else b
-                    _set_bit(
-                        bitstream,
-                        register,
-                        value,
-                        "SBUS {} {} {}".format(bus, terminal, connection),
-                        set_sources,
-                    )
+                    if describe:
+                        source = "SBUS {} {} {}".format(bus, terminal, connection)
+                    yield reg_eq.switch_register_by_index(s, column), a if bus.endswith("a") else b, source
                     continue
 
-                reg_a = reg_eq.sbus_register(sw_pin, "{}a".format(bus))
-                reg_b = reg_eq.sbus_register(sw_pin, "{}b".format(bus))
-                a, b = _sbus_mode_to_pair(connection)
-                _set_bit(
-                    bitstream,
-                    reg_a,
-                    a,
-                    "SBUS {}a {} {}".format(bus, terminal, connection),
-                    set_sources,
-                )
-                _set_bit(
-                    bitstream,
-                    reg_b,
-                    b,
-                    "SBUS {}b {} {}".format(bus, terminal, connection),
-                    set_sources,
-                )
+                if describe:
+                    source = "SBUS {}a {} {}".format(bus, terminal, connection)
+                yield reg_eq.switch_register_by_index(s, column), a, source
+                if describe:
+                    source = "SBUS {}b {} {}".format(bus, terminal, connection)
+                yield reg_eq.switch_register_by_index(s, column + 1), b, source
+            yield None
             continue
 
         raise ValueError("Unknown bus '{}'".format(bus))
 
     for device, size in sizes.items():
-        for bit_weight in (1, 2, 4, 8, 16):
-            register = reg_eq.sizing_register(device, bit_weight)
-            value = 1 if (size & bit_weight) else 0
-            _set_bit(
-                bitstream,
-                register,
-                value,
-                "sizes {} bit {}".format(device, bit_weight),
-                set_sources,
+        device_index = reg_eq.sizing_device_index(device)
+        for bit_index in range(5):
+            bit_weight = 1 << bit_index
+            if describe:
+                source = "sizes {} bit {}".format(device, bit_weight)
+            yield reg_eq.sizing_register_by_index(device_index, bit_index), 1 if (size & bit_weight) else 0, source
+    yield None
+
+
+def _write_source(connections, sizes, pin_to_sw_matrix, ordinal):
+    # Replay the writes with descriptions; only runs when a build fails.
+    n = 0
+    for write in _iter_writes(connections, sizes, pin_to_sw_matrix, describe=True):
+        if write is None:
+            continue
+        if n == ordinal:
+            return write[2]
+        n += 1
+    return None
+
+
+def _last_writer(connections, sizes, pin_to_sw_matrix, register, before):
+    # Ordinal of the last write to register ahead of write number `before`.
+    last = None
+    n = 0
+    for write in _iter_writes(connections, sizes, pin_to_sw_matrix):
+        if write is None:
+            continue
+        if n == before:
+            break
+        if write[0] == register:
+            last = n
+        n += 1
+    return last
+
+
+def run_steps(steps):
+    """
+    Drive a build_steps-style generator to completion and return its result.
+    """
+    try:
+        while True:
+            next(steps)
+    except StopIteration as e:
+        return e.value
+
+
+def build_bitstream(connections, sizes, pin_to_sw_matrix, track_sources=False):
+    return run_steps(build_steps(connections, sizes, pin_to_sw_matrix, track_sources))
+
+
+def build_steps(connections, sizes, pin_to_sw_matrix, track_sources=False):
+    """
+    Generator form of build_bitstream for cooperative callers.
+
+    Yields after each bus and after the sizing registers; the built
+    bitstream is the generator's return value (see run_steps).
+
+    track_sources rejects a second write of a different value to the same
+    register. Written registers are kept as a packed bitmask and each write
+    is identified only by its ordinal; the conflicting writes' descriptions
+    are rebuilt by replaying the config when the error is raised.
+    """
+    bitstream = PackedBitstream(EXPECTED_BITS)
+    data = bitstream.data
+    written = bytearray(len(data)) if track_sources else None
+    ordinal = 0
+
+    for write in _iter_writes(connections, sizes, pin_to_sw_matrix):
+        if write is None:
+            yield
+            continue
+        register, value, _ = write
+        index = register - 1
+        if index < 0 or index >= EXPECTED_BITS:
+            raise ValueError(
+                "{}: register {} out of range 1..{}".format(
+                    _write_source(connections, sizes, pin_to_sw_matrix, ordinal), register, EXPECTED_BITS
+                )
             )
+        byte = index >> 3
+        mask = 1 << (index & 7)
+        if written is not None:
+            if written[byte] & mask and bool(data[byte] & mask) != bool(value):
+                previous = _last_writer(connections, sizes, pin_to_sw_matrix, register, ordinal)
+                raise ValueError(
+                    "{}: conflicting write for register {} ({} -> {}, previous source: {})".format(
+                        _write_source(connections, sizes, pin_to_sw_matrix, ordinal),
+                        register,
+                        1 - value,
+                        value,
+                        _write_source(connections, sizes, pin_to_sw_matrix, previous),
+                    )
+                )
+            written[byte] |= mask
+        if value:
+            data[byte] |= mask
+        else:
+            data[byte] &= ~mask & 0xFF
+        ordinal += 1
+
+    return bitstream
 
+
+def compile_config(config, pin_to_sw_matrix, track_sources=False):
+    """
+    Validate a raw config and build its bitstream in one pass.
+
+    Equivalent to validate_and_normalize_config followed by build_bitstream,
+    without the normalized dicts in between.
+    """
+    return run_steps(compile_steps(config, pin_to_sw_matrix, track_sources))
+
+
+def compile_steps(config, pin_to_sw_matrix, track_sources=False):
+    """
+    Generator form of compile_config (yields like build_steps).
+
+    Each entry is checked and its register bits are written straight into
+    the output. On any error the config is re-run through the two-pass
+    validate/build path, so callers see exactly the error (and precedence)
+    that path reports.
+    """
+    try:
+        bitstream = yield from _compile_steps(config, pin_to_sw_matrix, track_sources)
+    except ValueError as e:
+        from config_validation import validate_and_normalize_config
+
+        normalized = validate_and_normalize_config(config, pin_to_sw_matrix)
+        build_bitstream(normalized["connections"], normalized["sizes"], pin_to_sw_matrix, track_sources)
+        raise e
     return bitstream
+
+
+def _compile_steps(config, pin_to_sw_matrix, track_sources):
+    from config_validation import check_bus_name, normalize_size_value, sbus_entry_parts
+
+    if not isinstance(config, dict):
+        raise ValueError("config must be a JSON object")
+    raw_connections = config.get("connections", config)
+    raw_sizes = config.get("sizes", {})
+    if not isinstance(raw_connections, dict):
+        raise ValueError("connections must be a JSON object")
+    if not isinstance(raw_sizes, dict):
+        raise ValueError("sizes must be a JSON object")
+
+    bitstream = PackedBitstream(EXPECTED_BITS)
+    data = bitstream.data
+    written = bytearray(len(data)) if track_sources else None
+    switch_equation_index = reg_eq.switch_equation_index
+    switch_register_by_index = reg_eq.switch_register_by_index
+
+    def write(register, value):
+        index = register - 1
+        byte = index >> 3
+        mask = 1 << (index & 7)
+        if written is not None:
+            if written[byte] & mask and bool(data[byte] & mask) != bool(value):
+                raise ValueError("conflicting write for register {}".format(register))
+            written[byte] |= mask
+        if value:
+            data[byte] |= mask
+        else:
+            data[byte] &= ~mask & 0xFF
+
+    for bus, entries in raw_connections.items():
+        if not isinstance(bus, str):
+            raise ValueError("connections keys must be strings")
+        if not isinstance(entries, list):
+            raise ValueError("connections.{} must be a list".format(bus))
+        check_bus_name(bus)
+        rbus = bus.startswith("RBUS")
+        pair = not rbus and bus[-1:] not in ("a", "b")
+        column = reg_eq.bus_column(bus + "a" if pair else bus)
+        phase_b = bus.endswith("b")
+
+        for i, entry in enumerate(entries):
+            if rbus:
+                if not isinstance(entry, str):
+                    raise ValueError("connections.{}[{}] must be string terminal".format(bus, i))
+                terminal = entry
+                a = b = 1
+            else:
+                terminal, connection = sbus_entry_parts(entry, bus, i)
+                a, b = _sbus_mode_to_pair(connection)
+            sw_pin = pin_to_sw_matrix.get(terminal)
+            if sw_pin is None:
+                raise ValueError("connections.{}[{}] unknown terminal '{}'".format(bus, i, terminal))
+            s = switch_equation_index(sw_pin)
+            if pair:
+                write(switch_register_by_index(s, column), a)
+                write(switch_register_by_index(s, column + 1), b)
+            else:
+                write(switch_register_by_index(s, column), b if phase_b else a)
+        yield
+
+    for device in raw_sizes:
+        reg_eq.sizing_device_index(device)
+    # Sizing registers (1889..2008) never overlap switch registers or each
+    # other, so they need no conflict tracking.
+    for device_index, device in enumerate(reg_eq.SIZING_DEVICE_ORDER):
+        size = normalize_size_value(device, raw_sizes.get(device, 0))
+        for bit_index in range(5):
+            bitstream.set(reg_eq.sizing_register_by_index(device_index, bit_index) - 1, (size >> bit_index) & 1)
+    yield
+
+    return bitstream
+
+
+def build_chain_bitstream(normalized_configs, pin_to_sw_matrix, track_sources=False):
+    """
+    Build one stream for daisy-chained chips, normalized_configs[0] nearest DATA.
+
+    Each chip is built (and conflict-checked) on its own; errors name the chip.
+    """
+    return run_steps(build_chain_steps(normalized_configs, pin_to_sw_matrix, track_sources))
+
+
+def build_chain_steps(normalized_configs, pin_to_sw_matrix, track_sources=False):
+    """
+    Generator form of build_chain_bitstream (yields like build_steps).
+    """
+    parts = []
+    for chip, normalized in enumerate(normalized_configs):
+        try:
+            bitstream = yield from build_steps(
+                normalized["connections"],
+                normalized["sizes"],
+                pin_to_sw_matrix,
+                track_sources=track_sources,
+            )
+        except ValueError as e:
+            raise ValueError("chip {}: {}".format(chip, e))
+        parts.append(bitstream)
+    return concat_bitstreams(parts)
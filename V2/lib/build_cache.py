@@ -0,0 +1,163 @@
+"""
+Content-addressed on-flash cache of built bitstreams.
+
+Entries are binary bitstream files named by a SHA-256 key over the raw
+inputs (config bytes, pin-map bytes, library version). A cache hit returns
+the packed bitstream without parsing JSON or running validation.
+
+Eviction removes the oldest-written entries (tracked in a small index file)
+until the cache fits its flash budget. Each entry is charged at least one
+filesystem block, since that is what a small file really costs on littlefs.
+"""
+
+import os
+import hashlib
+import binascii
+
+from packed_bitstream import load_bitstream_binary, write_bitstream_binary
+
+CACHE_DIRNAME = ".mosbius_cache"
+DEFAULT_BUDGET_BYTES = 64 * 1024
+ENTRY_SUFFIX = ".bin"
+INDEX_FILENAME = "index.txt"
+DEFAULT_BLOCK_SIZE = 4096
+
+
+def cache_key(*blobs):
+    """
+    Return a hex SHA-256 over length-prefixed byte blobs.
+    """
+    h = hashlib.sha256()
+    for blob in blobs:
+        if isinstance(blob, str):
+            blob = blob.encode()
+        h.update("{}:".format(len(blob)).encode())
+        h.update(blob)
+    return binascii.hexlify(h.digest()).decode()
+
+
+def join_path(a, b):
+    """
+    Join two path parts with "/" (MicroPython has no os.path); shared with driver.
+    """
+    if not a or a == ".":
+        return b
+    if a.endswith("/"):
+        return a + b
+    return a + "/" + b
+
+
+def remove_file(path):
+    """
+    Remove path, ignoring a missing file.
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class BuildCache:
+    def __init__(self, directory, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.directory = directory
+        self.budget_bytes = int(budget_bytes)
+
+    def _path(self, key):
+        return join_path(self.directory, key + ENTRY_SUFFIX)
+
+    def _block_size(self):
+        try:
+            return os.statvfs(self.directory)[0] or DEFAULT_BLOCK_SIZE
+        except (AttributeError, OSError):
+            return DEFAULT_BLOCK_SIZE
+
+    def get(self, key):
+        """
+        Return the cached PackedBitstream for key, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            return load_bitstream_binary(path)
+        except OSError:
+            return None
+        except ValueError:
+            # Corrupt or truncated entry (e.g. power loss mid-write); drop it.
+            remove_file(path)
+            return None
+
+    def _read_index(self):
+        try:
+            with open(join_path(self.directory, INDEX_FILENAME), "r") as f:
+                return [line.strip() for line in f if line.strip()]
+        except OSError:
+            return []
+
+    def _write_index(self, keys):
+        path = join_path(self.directory, INDEX_FILENAME)
+        with open(path + ".tmp", "w") as f:
+            for key in keys:
+                f.write(key + "\n")
+        remove_file(path)
+        os.rename(path + ".tmp", path)
+
+    def put(self, key, bitstream):
+        try:
+            os.mkdir(self.directory)
+        except OSError:
+            pass
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        write_bitstream_binary(tmp_path, bitstream)
+        remove_file(path)
+        os.rename(tmp_path, path)
+        self.evict(newest=key)
+
+    def keys(self):
+        """
+        Return cached keys, oldest-written first.
+
+        Entry files missing from the index (e.g. after a crash) count as oldest.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        present = set(name[: -len(ENTRY_SUFFIX)] for name in names if name.endswith(ENTRY_SUFFIX))
+        indexed = [key for key in self._read_index() if key in present]
+        seen = set(indexed)
+        orphans = sorted(key for key in present if key not in seen)
+        return orphans + indexed
+
+    def evict(self, newest=None):
+        """
+        Remove oldest-written entries until the cache fits the budget.
+
+        `newest` is moved to the end of the write order and never evicted.
+        Returns the number of entries removed.
+        """
+        keys = self.keys()
+        if newest is not None:
+            keys = [key for key in keys if key != newest] + [newest]
+        block = self._block_size()
+        sizes = []
+        total = 0
+        for key in keys:
+            try:
+                size = os.stat(self._path(key))[6]
+            except OSError:
+                size = 0
+            size = ((size + block - 1) // block) * block
+            sizes.append(size)
+            total += size
+        removed = 0
+        while removed < len(keys) - 1 and total > self.budget_bytes:
+            remove_file(self._path(keys[removed]))
+            total -= sizes[removed]
+            removed += 1
+        self._write_index(keys[removed:])
+        return removed
+
+    def clear(self):
+        for key in self.keys():
+            remove_file(self._path(key))
+        remove_file(join_path(self.directory, INDEX_FILENAME))
@@ -0,0 +1,252 @@
+"""
+Programmatic MOSbius V2 circuit builder.
+
+    c = Circuit()
+    c.rbus(3, "OTA_P_OUT", "CC_N_G_CS").sbus(1, "CC_P_D_CS", "PHI1").size("CC_N", 5)
+    bitstream = c.bitstream()      # PackedBitstream, ready for program_bitstream
+    config = c.to_config()         # same circuit as a config dict (json.dumps-able)
+
+Every call is validated immediately (bus, terminal, connection, size,
+conflicting register writes) and written straight into a packed
+bitstream, so bitstream() is a copy and no JSON is involved. Entries
+are kept as one 32-bit integer each (bus column, SBUS pair flag, connection,
+terminal index) only to describe conflicts and to emit a config on demand.
+copy() is cheap, which suits sweeps: build the common part once, then copy
+and vary.
+"""
+
+from array import array
+
+import register_map_equations as reg_eq
+from packed_bitstream import EXPECTED_BITS, PackedBitstream
+
+CONNECTIONS = ("ON", "OFF", "PHI1", "PHI2")
+# (SBUSna bit, SBUSnb bit) per connection, as in bitstream_builder.
+_CONNECTION_BITS = ((1, 1), (0, 0), (1, 0), (0, 1))
+_PAIR_FLAG = 0x20
+_UNSET_SIZE = 0xFF  # _sizes slot of a device never passed to size()
+
+_default_pin_map = None
+_terminal_tables = {}
+
+
+def _default_pin_map_path():
+    path = globals().get("__file__", "")
+    head = path.rsplit("/", 1)[0] if "/" in path else "."
+    return (head or "/") + "/pin_name_to_sw_matrix_pin_number.json"
+
+
+def default_pin_map():
+    """
+    Return the pin map shipped next to this module (loaded once).
+    """
+    global _default_pin_map
+    if _default_pin_map is None:
+        import json
+
+        with open(_default_pin_map_path(), "r") as f:
+            _default_pin_map = json.load(f)
+    return _default_pin_map
+
+
+def _terminal_table(pin_map):
+    # (names, index by name, switch index s by terminal index), shared per pin map.
+    table = _terminal_tables.get(id(pin_map))
+    if table is None or table[3] is not pin_map:
+        names = tuple(sorted(pin_map))
+        if len(names) > 0xFFFFFF:
+            raise ValueError("pin map has too many terminals")
+        index = dict((name, i) for i, name in enumerate(names))
+        rows = bytes(reg_eq.switch_equation_index(pin_map[name]) for name in names)
+        table = (names, index, rows, pin_map)
+        _terminal_tables[id(pin_map)] = table
+    return table
+
+
+def _bus_number(kind, n, count):
+    # Only plain ints: True == 1 and 3.0 == 3, but neither names a bus.
+    if isinstance(n, bool) or not isinstance(n, int) or not 1 <= n <= count:
+        raise ValueError("unknown {} '{}{}'; expected {}1..{}{}".format(kind, kind, n, kind, kind, count))
+    return n
+
+
+class Circuit:
+    __slots__ = ("pin_map", "_names", "_index", "_rows", "_entries", "_sizes", "_data", "_written")
+
+    def __init__(self, pin_map=None):
+        self.pin_map = pin_map if pin_map is not None else default_pin_map()
+        self._names, self._index, self._rows, _ = _terminal_table(self.pin_map)
+        self._entries = array("I")
+        self._sizes = bytearray(b"\xff" * len(reg_eq.SIZING_DEVICE_ORDER))
+        self._data = bytearray((EXPECTED_BITS + 7) >> 3)
+        self._written = bytearray(len(self._data))
+
+    def copy(self):
+        other = Circuit.__new__(Circuit)
+        other.pin_map = self.pin_map
+        other._names = self._names
+        other._index = self._index
+        other._rows = self._rows
+        other._entries = array("I", self._entries)
+        other._sizes = bytearray(self._sizes)
+        other._data = bytearray(self._data)
+        other._written = bytearray(self._written)
+        return other
+
+    def rbus(self, n, *terminals):
+        """
+        Connect terminals to RBUSn (1..8).
+        """
+        column = reg_eq.bus_column("RBUS{}".format(_bus_number("RBUS", n, 8)))
+        for terminal in terminals:
+            self._add(column, 0, 0, terminal)
+        return self
+
+    def sbus(self, n, terminal, connection="ON", half=None):
+        """
+        Connect terminal to SBUSn (1..6) as ON/OFF/PHI1/PHI2.
+
+        half="a" or "b" writes only that half, like an SBUSna/SBUSnb entry.
+        """
+        number = _bus_number("SBUS", n, 6)
+        if half is None:
+            column = reg_eq.bus_column("SBUS{}a".format(number))
+            flags = _PAIR_FLAG
+        elif half in ("a", "b"):
+            column = reg_eq.bus_column("SBUS{}{}".format(number, half))
+            flags = 0
+        else:
+            raise ValueError("SBUS half must be 'a', 'b' or None, got {!r}".format(half))
+        mode = str(connection).upper()
+        if mode not in CONNECTIONS:
+            raise ValueError(
+                "SBUS{} {}: invalid connection '{}'; expected ON/OFF/PHI1/PHI2".format(number, terminal, connection)
+            )
+        self._add(column, flags, CONNECTIONS.index(mode), terminal)
+        return self
+
+    def size(self, device, value):
+        """
+        Set a sizing device to 0..31; setting it again replaces the value.
+        """
+        device_index = reg_eq.sizing_device_index(device)
+        if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= 31:
+            raise ValueError("sizes.{}={!r} out of range 0..31".format(device, value))
+        self._sizes[device_index] = value
+        for bit_index in range(5):
+            self._set(reg_eq.sizing_register_by_index(device_index, bit_index) - 1, (value >> bit_index) & 1)
+        return self
+
+    def bitstream(self):
+        return PackedBitstream(EXPECTED_BITS, bytearray(self._data))
+
+    def to_config(self):
+        """
+        Return the circuit as a config dict (buses in first-use order).
+        """
+        connections = {}
+        for entry in self._entries:
+            bus, item = self._describe(entry)
+            if bus not in connections:
+                connections[bus] = []
+            connections[bus].append(item)
+        sizes = {}
+        for device_index, device in enumerate(reg_eq.SIZING_DEVICE_ORDER):
+            if self._sizes[device_index] != _UNSET_SIZE:
+                sizes[device] = self._sizes[device_index]
+        return {"connections": connections, "sizes": sizes}
+
+    def to_json(self):
+        import json
+
+        return json.dumps(self.to_config())
+
+    @classmethod
+    def from_config(cls, config, pin_map=None):
+        """
+        Build a Circuit from a config dict; the config is validated with
+        validate_and_normalize_config first, so its errors read the same.
+        """
+        from config_validation import validate_and_normalize_config
+
+        circuit = cls(pin_map)
+        normalized = validate_and_normalize_config(config, circuit.pin_map)
+        for bus, entries in normalized["connections"].items():
+            number = int(bus[4])
+            if bus.startswith("RBUS"):
+                circuit.rbus(number, *entries)
+                continue
+            half = bus[5:] or None
+            for entry in entries:
+                circuit.sbus(number, entry["terminal"], entry["connection"], half)
+        for device, value in normalized["sizes"].items():
+            if device in config.get("sizes", {}):
+                circuit.size(device, value)
+        return circuit
+
+    def _add(self, column, flags, mode, terminal):
+        index = self._index.get(terminal) if isinstance(terminal, str) else None
+        if index is None:
+            raise ValueError("unknown terminal {!r}".format(terminal))
+        entry = column | flags | (mode << 6) | (index << 8)
+        s = self._rows[index]
+        a, b = _CONNECTION_BITS[mode]
+        if flags & _PAIR_FLAG:
+            writes = ((reg_eq.switch_register_by_index(s, column), a), (reg_eq.switch_register_by_index(s, column + 1), b))
+        elif column >= 12:
+            writes = ((reg_eq.switch_register_by_index(s, column), 1),)
+        else:
+            writes = ((reg_eq.switch_register_by_index(s, column), b if column & 1 else a),)
+        for register, value in writes:
+            self._check(register - 1, value, entry)
+        for register, value in writes:
+            self._set(register - 1, value)
+        self._entries.append(entry)
+
+    def _check(self, index, value, entry):
+        byte = index >> 3
+        mask = 1 << (index & 7)
+        if self._written[byte] & mask and bool(self._data[byte] & mask) != bool(value):
+            raise ValueError(
+                "{}: conflicting write for register {} ({} -> {}, previous source: {})".format(
+                    self._source(entry), index + 1, 1 - value, value, self._last_source(index)
+                )
+            )
+
+    def _set(self, index, value):
+        byte = index >> 3
+        mask = 1 << (index & 7)
+        self._written[byte] |= mask
+        if value:
+            self._data[byte] |= mask
+        else:
+            self._data[byte] &= ~mask & 0xFF
+
+    def _describe(self, entry):
+        # (bus name, config entry) for a packed entry.
+        column = entry & 0x1F
+        terminal = self._names[entry >> 8]
+        if column >= 12:
+            return reg_eq.SWITCH_BUS_COLUMNS[column], terminal
+        bus = reg_eq.SWITCH_BUS_COLUMNS[column]
+        if entry & _PAIR_FLAG:
+            bus = bus[:-1]
+        return bus, {"terminal": terminal, "connection": CONNECTIONS[(entry >> 6) & 3]}
+
+    def _source(self, entry):
+        bus, item = self._describe(entry)
+        if isinstance(item, str):
+            return "RBUS {} {}".format(bus, item)
+        return "SBUS {} {} {}".format(bus, item["terminal"], item["connection"])
+
+    def _last_source(self, index):
+        # Only runs on the error path: find the last entry that wrote this register.
+        # Sizing registers never conflict (size() replaces), so only switches are searched.
+        for entry in reversed(self._entries):
+            column = entry & 0x1F
+            s = self._rows[entry >> 8]
+            columns = (column, column + 1) if entry & _PAIR_FLAG else (column,)
+            for c in columns:
+                if reg_eq.switch_register_by_index(s, c) - 1 == index:
+                    return self._source(entry)
+        return None
@@ -0,0 +1,199 @@
+"""
+CLK timing plans for the shift engines.
+
+A plan turns a target half-period into engine-specific delays, using the
+loop overhead measured once at startup, so each CLK half-period is at least
+the target instead of "requested delay + whatever the interpreter costs".
+
+Targets come from t_clk_half_cycle_us ("fixed" mode) or from a configurable
+minimum half-period ("fastest" mode: run as fast as the chip tolerates).
+This module does the arithmetic; the engines supply the loops to measure.
+"""
+
+import time
+
+SHIFT_ENGINES = ("auto", "generic", "viper", "pio")
+CLOCK_MODES = ("fixed", "fastest")
+DEFAULT_MIN_HALF_CYCLE_NS = 500
+CALIBRATION_BITS = 256
+CALIBRATION_RUNS = 5
+# sleep_us counts whole microsecond ticks, so one call can end up to a tick
+# before the requested time; each sleeping half budgets for that.
+SLEEP_JITTER_NS = 1000
+
+
+def _ceil_div(a, b):
+    return -(-a // b)
+
+
+def fastest_us(*runs):
+    """
+    Time each (func, args) run CALIBRATION_RUNS times; return the shortest of each, in us.
+
+    A plan must hold when the loop runs at full speed, so interrupts and a
+    cold first run must not inflate the measured overhead. The runs take
+    turns, so a drifting clock or host affects all of them alike.
+    """
+    best = [None] * len(runs)
+    for _ in range(CALIBRATION_RUNS):
+        for i, (run, args) in enumerate(runs):
+            start = time.ticks_us()
+            run(*args)
+            elapsed = time.ticks_diff(time.ticks_us(), start)
+            if best[i] is None or elapsed < best[i]:
+                best[i] = elapsed
+    return best
+
+
+def target_half_ns(t_clk_half_cycle_us, clock_mode="fixed", min_half_cycle_ns=DEFAULT_MIN_HALF_CYCLE_NS):
+    if clock_mode not in CLOCK_MODES:
+        raise ValueError("clock_mode must be one of {}, got '{}'".format(", ".join(CLOCK_MODES), clock_mode))
+    if clock_mode == "fastest":
+        if min_half_cycle_ns is None or min_half_cycle_ns <= 0:
+            raise ValueError("fastest clock mode needs min_half_cycle_ns > 0")
+        return int(min_half_cycle_ns)
+    return int(t_clk_half_cycle_us * 1000)
+
+
+class ClockPlan:
+    """
+    Delays for one engine plus the half-periods they are expected to give.
+
+    delay_high/delay_low are sleep_us values (generic, parallel) or spin
+    counts (viper); the pio engine has no delays and sets sm_freq_hz, the
+    state-machine frequency, instead. high_ns/low_ns are the predicted CLK
+    high/low durations including loop overhead.
+    """
+
+    __slots__ = (
+        "engine",
+        "target_ns",
+        "delay_high",
+        "delay_low",
+        "high_ns",
+        "low_ns",
+        "overhead_ns",
+        "sleeps",
+        "sm_freq_hz",
+    )
+
+    def __init__(
+        self, engine, target_ns, delay_high, delay_low, high_ns, low_ns, overhead_ns, sleeps=True, sm_freq_hz=None
+    ):
+        self.engine = engine
+        self.target_ns = target_ns
+        self.delay_high = delay_high
+        self.delay_low = delay_low
+        self.high_ns = high_ns
+        self.low_ns = low_ns
+        self.overhead_ns = overhead_ns
+        self.sleeps = sleeps
+        self.sm_freq_hz = sm_freq_hz
+
+    def clock_hz(self):
+        period_ns = self.high_ns + self.low_ns
+        return 1000000000 / period_ns if period_ns > 0 else None
+
+    def as_dict(self):
+        return {
+            "engine": self.engine,
+            "target_half_ns": self.target_ns,
+            "delay_high": self.delay_high,
+            "delay_low": self.delay_low,
+            "high_ns": self.high_ns,
+            "low_ns": self.low_ns,
+            "overhead_ns": self.overhead_ns,
+            "sm_freq_hz": self.sm_freq_hz,
+            "clock_hz": self.clock_hz(),
+        }
+
+
+def uncompensated_plan(t_clk_half_cycle_us):
+    """
+    Plain sleep_us(t) per half, ignoring overhead (the historic behaviour).
+    """
+    t = int(t_clk_half_cycle_us)
+    return ClockPlan("generic", t * 1000, t, t, t * 1000, t * 1000, None)
+
+
+def _halves(bit_ns, short_ns, short_high):
+    short_ns = min(short_ns, bit_ns)
+    if short_high:
+        return short_ns, bit_ns - short_ns
+    return bit_ns - short_ns, short_ns
+
+
+def _sleep_delay(target_ns, half_ns, sleep_call_ns):
+    delay = _ceil_div(target_ns + SLEEP_JITTER_NS - half_ns, 1000)
+    if delay <= 0:
+        # sleep_us(0) may return at once, taking the calibrated call cost with it.
+        return 0 if half_ns - sleep_call_ns >= target_ns else 1
+    return delay
+
+
+def _plan_sleeps(engine, target_ns, bare_bit_ns, sleep_bit_ns, write_ns, short_high):
+    # The short half runs from one pin/port write straight into the next (plus
+    # a sleep_us call when sleeping), so it lasts one measured write; the long
+    # half holds the rest of the bit, loop and DATA work included.
+    high, low = _halves(bare_bit_ns, write_ns, short_high)
+    if high >= target_ns and low >= target_ns:
+        return ClockPlan(engine, target_ns, 0, 0, high, low, bare_bit_ns, sleeps=False)
+    sleep_call_ns = (sleep_bit_ns - bare_bit_ns) // 2
+    high, low = _halves(sleep_bit_ns, write_ns + sleep_call_ns, short_high)
+    delay_high = _sleep_delay(target_ns, high, sleep_call_ns)
+    delay_low = _sleep_delay(target_ns, low, sleep_call_ns)
+    return ClockPlan(
+        engine,
+        target_ns,
+        delay_high,
+        delay_low,
+        high + 1000 * delay_high,
+        low + 1000 * delay_low,
+        sleep_bit_ns,
+    )
+
+
+def plan_generic(target_ns, bare_bit_ns, sleep_bit_ns, write_ns):
+    """
+    Plan for the Pin.value() loop.
+
+    bare_bit_ns is the measured cost of one bit without sleep calls,
+    sleep_bit_ns the cost with sleep_us calls, excluding the slept time, and
+    write_ns the time between two back-to-back Pin.value() edges. CLK high
+    is the short half: CLK rises and falls in consecutive writes.
+    """
+    return _plan_sleeps("generic", target_ns, bare_bit_ns, sleep_bit_ns, write_ns, True)
+
+
+def plan_parallel(target_ns, bare_bit_ns, sleep_bit_ns, write_ns):
+    """
+    Plan for parallel_shift's port-write loop; arguments as for plan_generic.
+
+    CLK low is the short half: the XOR write drops CLK, the next write raises it.
+    """
+    return _plan_sleeps("parallel", target_ns, bare_bit_ns, sleep_bit_ns, write_ns, False)
+
+
+def plan_viper(target_ns, half_overhead_ns, ns_per_spin):
+    """
+    Plan for the viper SIO loop: spin counts with sub-microsecond resolution.
+    """
+    remaining = target_ns - half_overhead_ns
+    spins = 0
+    if remaining > 0:
+        spins = int(remaining / ns_per_spin)
+        if spins * ns_per_spin < remaining:
+            spins += 1
+    half_ns = half_overhead_ns + spins * ns_per_spin
+    return ClockPlan("viper", target_ns, spins, spins, half_ns, half_ns, 2 * half_overhead_ns)
+
+
+def plan_pio(target_ns, cycles_per_bit):
+    """
+    Plan for the PIO engine: exact, half a bit's cycles per half-period.
+    """
+    if target_ns <= 0:
+        raise ValueError("PIO half-period must be > 0 ns")
+    freq = int(1000000000 * cycles_per_bit // (2 * target_ns))
+    half_ns = 1000000000 * (cycles_per_bit // 2) / freq
+    return ClockPlan("pio", target_ns, 0, 0, half_ns, half_ns, 0, sleeps=False, sm_freq_hz=freq)
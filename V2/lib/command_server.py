@@ -0,0 +1,249 @@
+"""
+Resident command loop for reprogramming MOSbius over USB serial.
+
+Keeps a MOSbiusV2Driver (pin map, lookup tables, clock calibration) in
+memory and serves one command per line on stdin:
+
+  PING                                  -> {"version": LIB_VERSION}
+  PROGRAM_BITS <nbits> <nbytes> [force] + nbytes packed payload (LSB-first)
+  PROGRAM_CONFIG <nbytes> [force] [save] + nbytes config JSON
+  STREAM <nbits> [force]                + CRC-checked frames (frame_stream)
+  STATS                                 -> last run's per-phase stats
+  FINGERPRINT                           -> last programmed fingerprint
+  QUIT                                  -> leave the loop
+
+Every command gets exactly one reply line, "@OK <json>" (with the handling
+time in "us") or "@ERR <type>: <message>". A payload is read off the stream
+before the rest of its command is checked, so a rejected command leaves no
+stray bytes. Other output (driver prints) can appear on other lines; clients
+skip lines that do not start with "@". Ctrl-C is disabled only while a binary
+payload is being read. STREAM answers each frame with a 4-byte ACK/NACK
+before its reply line.
+"""
+
+import sys
+import json
+
+from packed_bitstream import PackedBitstream
+from program_stats import ProgramStats, ticks_diff, ticks_us
+
+REPLY_OK = "@OK "
+REPLY_ERR = "@ERR "
+MAX_PAYLOAD_BYTES = 64 * 1024
+
+
+def _set_kbd_intr(char):
+    try:
+        import micropython
+
+        micropython.kbd_intr(char)
+    except (ImportError, AttributeError):
+        pass
+
+
+def read_exact(stream, nbytes):
+    """
+    Read exactly nbytes into a new bytearray, with Ctrl-C disabled meanwhile.
+    """
+    buf = bytearray(nbytes)
+    view = memoryview(buf)
+    pos = 0
+    _set_kbd_intr(-1)
+    try:
+        while pos < nbytes:
+            n = stream.readinto(view[pos:])
+            if not n:
+                raise OSError("payload truncated: got {} of {} bytes".format(pos, nbytes))
+            pos += n
+    finally:
+        _set_kbd_intr(3)
+    return buf
+
+
+def _parse_flags(args, allowed):
+    flags = {}
+    for arg in args:
+        if arg not in allowed:
+            raise ValueError("unknown flag '{}'".format(arg))
+        flags[arg] = True
+    return flags
+
+
+def drain(stream, nbytes):
+    """
+    Read and discard nbytes, so a rejected payload is not parsed as commands.
+    """
+    buf = bytearray(min(nbytes, 256))
+    view = memoryview(buf)
+    while nbytes > 0:
+        n = stream.readinto(view[: min(nbytes, len(buf))])
+        if not n:
+            return
+        nbytes -= n
+
+
+def read_payload(stream, text):
+    """
+    Read the payload whose declared size is text.
+
+    An out-of-range size is drained before it is rejected; only a size that
+    is not a number leaves the stream untouched, since its length is unknown.
+    """
+    nbytes = int(text)
+    if nbytes <= 0 or nbytes > MAX_PAYLOAD_BYTES:
+        if nbytes > 0:
+            drain(stream, nbytes)
+        raise ValueError("payload size must be 1..{}, got {}".format(MAX_PAYLOAD_BYTES, nbytes))
+    return read_exact(stream, nbytes)
+
+
+class CommandServer:
+    def __init__(self, driver, stream_in=None, stream_out=None):
+        self.driver = driver
+        # Unbuffered on CPython, so frame_stream's poll timeout sees every pending byte.
+        self.stream_in = stream_in if stream_in is not None else getattr(sys.stdin.buffer, "raw", sys.stdin.buffer)
+        self.stream_out = stream_out if stream_out is not None else sys.stdout
+        self.running = False
+        # Created on the first STREAM; the shift buffer is reused while nbits stays the same.
+        self._receiver = None
+        self._stream_bitstream = None
+        # STATS reports the last command's phases, so always collect them.
+        if driver.stats is None:
+            driver.stats = ProgramStats()
+        self.commands = {
+            "PING": self._cmd_ping,
+            "PROGRAM_BITS": self._cmd_program_bits,
+            "PROGRAM_CONFIG": self._cmd_program_config,
+            "STREAM": self._cmd_stream,
+            "STATS": self._cmd_stats,
+            "FINGERPRINT": self._cmd_fingerprint,
+            "QUIT": self._cmd_quit,
+        }
+
+    def register(self, name, handler):
+        """
+        Add a command; handler(args) returns a JSON-serialisable dict.
+        """
+        self.commands[name.upper()] = handler
+
+    def _reply(self, line):
+        self.stream_out.write(line + "\n")
+        if hasattr(self.stream_out, "flush"):
+            self.stream_out.flush()
+
+    def handle_line(self, line):
+        """
+        Run one command line and send its reply.
+        """
+        parts = line.split()
+        if not parts:
+            return
+        start = ticks_us()
+        try:
+            handler = self.commands.get(parts[0].upper())
+            if handler is None:
+                raise ValueError("unknown command '{}'".format(parts[0]))
+            result = handler(parts[1:])
+        except Exception as e:
+            # Any handler failure (e.g. TypeError from a malformed config) must not end serve().
+            self._reply(REPLY_ERR + "{}: {}".format(type(e).__name__, e))
+            return
+        result["us"] = ticks_diff(ticks_us(), start)
+        self._reply(REPLY_OK + json.dumps(result))
+
+    def serve(self):
+        """
+        Handle commands until QUIT or end of input.
+        """
+        self.running = True
+        self._reply(REPLY_OK + json.dumps({"ready": True}))
+        while self.running:
+            raw = self.stream_in.readline()
+            if not raw:
+                break
+            if isinstance(raw, bytes):
+                try:
+                    raw = raw.decode()
+                except UnicodeError as e:
+                    self._reply(REPLY_ERR + "{}: {}".format(type(e).__name__, e))
+                    continue
+            self.handle_line(raw.strip())
+        self.running = False
+
+    def _cmd_ping(self, args):
+        from driver import LIB_VERSION
+
+        return {"version": LIB_VERSION}
+
+    def _program(self, bitstream, force):
+        programmed = self.driver.program_bitstream(bitstream, force=force)
+        return {
+            "programmed": programmed,
+            "nbits": bitstream.nbits,
+            "clock_hz": self.driver.achieved_clock_hz if programmed else None,
+        }
+
+    def _cmd_program_bits(self, args):
+        if len(args) < 2:
+            raise ValueError("usage: PROGRAM_BITS <nbits> <nbytes> [force]")
+        # Take the payload off the stream before checking the other arguments.
+        payload = read_payload(self.stream_in, args[1])
+        nbits = int(args[0])
+        flags = _parse_flags(args[2:], ("force",))
+        self.driver.stats.reset()
+        return self._program(PackedBitstream(nbits, payload), flags.get("force", False))
+
+    def _cmd_program_config(self, args):
+        if not args:
+            raise ValueError("usage: PROGRAM_CONFIG <nbytes> [force] [save]")
+        payload = read_payload(self.stream_in, args[0])
+        flags = _parse_flags(args[1:], ("force", "save"))
+        bitstream = self.driver.bitstream_from_config_bytes(payload)
+        result = self._program(bitstream, flags.get("force", False))
+        if flags.get("save"):
+            self.driver.save_config(payload)
+            result["saved"] = self.driver.config_path
+        return result
+
+    def _cmd_stream(self, args):
+        if not args:
+            raise ValueError("usage: STREAM <nbits> [force]")
+        nbits = int(args[0])
+        if nbits <= 0 or (nbits + 7) // 8 > MAX_PAYLOAD_BYTES:
+            raise ValueError("nbits must be 1..{}, got {}".format(8 * MAX_PAYLOAD_BYTES, nbits))
+        flags = _parse_flags(args[1:], ("force",))
+        from frame_stream import FrameReceiver
+
+        if self._receiver is None:
+            self._receiver = FrameReceiver(self.stream_in, getattr(self.stream_out, "buffer", self.stream_out))
+        if self._stream_bitstream is None or self._stream_bitstream.nbits != nbits:
+            self._stream_bitstream = None
+            self._stream_bitstream = PackedBitstream(nbits)
+        bitstream = self._stream_bitstream
+        stats = self.driver.stats
+        stats.reset()
+        if hasattr(self.stream_out, "flush"):
+            self.stream_out.flush()
+        t = stats.begin()
+        _set_kbd_intr(-1)
+        try:
+            frames = self._receiver.receive_into(bitstream.data, len(bitstream.data))
+        finally:
+            _set_kbd_intr(3)
+        stats.end("receive", t)
+        result = self._program(bitstream, flags.get("force", False))
+        result["frames"] = frames
+        result["naks"] = self._receiver.naks
+        return result
+
+    def _cmd_stats(self, args):
+        if self.driver.stats is None:
+            return {"stats": None}
+        return {"stats": self.driver.stats.as_dict()}
+
+    def _cmd_fingerprint(self, args):
+        return {"fingerprint": self.driver.last_fingerprint()}
+
+    def _cmd_quit(self, args):
+        self.running = False
+        return {"bye": True}
@@ -1,9 +1,11 @@
 import register_map_equations as reg_eq
 
 VALID_SBUS_MODES = ("ON", "OFF", "PHI1", "PHI2")
+RBUS_NAMES = ("RBUS1", "RBUS2", "RBUS3", "RBUS4", "RBUS5", "RBUS6", "RBUS7", "RBUS8")
+SBUS_NAMES = ("SBUS1", "SBUS2", "SBUS3", "SBUS4", "SBUS5", "SBUS6")
 
 
-def _parse_terminal_and_mode(value):
+def parse_terminal_and_mode(value):
     if "@" not in value:
         return value, None, False
     terminal, mode = value.rsplit("@", 1)
@@ -13,7 +15,7 @@ def _parse_terminal_and_mode(value):
     return terminal, mode, True
 
 
-def _normalize_size_value(device, raw):
+def normalize_size_value(device, raw):
     if isinstance(raw, list):
         if len(raw) != 1:
             raise ValueError(
@@ -31,29 +33,47 @@ def _normalize_size_value(device, raw):
     return value
 
 
-def _parse_sbus_entry(entry, path):
+def check_bus_name(bus):
+    """
+    Raise ValueError unless bus is a known RBUS/SBUS name (SBUS with or without a/b).
+    """
+    if bus.startswith("RBUS"):
+        if bus not in RBUS_NAMES:
+            raise ValueError("unknown RBUS '{}'".format(bus))
+        return
+    if bus.startswith("SBUS"):
+        if (bus[:-1] if bus[-1:] in ("a", "b") else bus) not in SBUS_NAMES:
+            raise ValueError("unknown SBUS '{}'".format(bus))
+        return
+    raise ValueError("unknown bus '{}' (expected RBUS*/SBUS*)".format(bus))
+
+
+def sbus_entry_parts(entry, bus, i):
+    """
+    Return (terminal, connection) for connections[bus][i]; the path is only formatted for errors.
+    """
     if isinstance(entry, str):
-        terminal, parsed_mode, _ = _parse_terminal_and_mode(entry)
-        return {"terminal": terminal, "connection": parsed_mode or "ON"}
+        terminal, parsed_mode, _ = parse_terminal_and_mode(entry)
+        return terminal, parsed_mode or "ON"
 
     if isinstance(entry, dict):
         terminal = entry.get("terminal")
         if terminal is None:
-            raise ValueError("{} missing required field 'terminal'".format(path))
-        terminal, parsed_mode, had_suffix = _parse_terminal_and_mode(terminal)
-        connection = entry.get("connection", "OFF")
-        connection = str(connection).upper()
+            raise ValueError("connections.{}[{}] missing required field 'terminal'".format(bus, i))
+        terminal, parsed_mode, had_suffix = parse_terminal_and_mode(terminal)
         if had_suffix:
             connection = parsed_mode
+        else:
+            connection = str(entry.get("connection", "OFF")).upper()
         if connection not in VALID_SBUS_MODES:
             raise ValueError(
-                "{} has invalid connection '{}'; expected ON/OFF/PHI1/PHI2".format(
-                    path, connection
+                "connections.{}[{}] has invalid connection '{}'; expected ON/OFF/PHI1/PHI2".format(
+                    bus, i, connection
                 )
             )
-        return {"terminal": terminal, "connection": connection}
+        return terminal, connection
 
-    raise ValueError("{} invalid entry type {}".format(path, type(entry).__name__))
+    raise ValueError("connections.{}[{}] invalid entry type {}".format(bus, i, type(entry).__name__))
 
 
 def validate_and_normalize_config(config, pin_to_sw_matrix):
@@ -75,9 +95,9 @@ def validate_and_normalize_config(config, pin_to_sw_matrix):
         if not isinstance(entries, list):
             raise ValueError("connections.{} must be a list".format(bus))
 
+        check_bus_name(bus)
+
         if bus.startswith("RBUS"):
-            if bus not in ("RBUS1", "RBUS2", "RBUS3", "RBUS4", "RBUS5", "RBUS6", "RBUS7", "RBUS8"):
-                raise ValueError("unknown RBUS '{}'".format(bus))
             pin_list = []
             for i, terminal in enumerate(entries):
                 if not isinstance(terminal, str):
@@ -88,27 +108,15 @@ def validate_and_normalize_config(config, pin_to_sw_matrix):
             normalized_connections[bus] = pin_list
             continue
 
-        if bus.startswith("SBUS"):
-            if bus[-1:] in ("a", "b"):
-                base = bus[:-1]
-                if base not in ("SBUS1", "SBUS2", "SBUS3", "SBUS4", "SBUS5", "SBUS6"):
-                    raise ValueError("unknown SBUS '{}'".format(bus))
-            elif bus not in ("SBUS1", "SBUS2", "SBUS3", "SBUS4", "SBUS5", "SBUS6"):
-                raise ValueError("unknown SBUS '{}'".format(bus))
-
-            out_entries = []
-            for i, entry in enumerate(entries):
-                parsed = _parse_sbus_entry(entry, "connections.{}[{}]".format(bus, i))
-                terminal = parsed["terminal"]
-                if terminal not in pin_to_sw_matrix:
-                    raise ValueError(
-                        "connections.{}[{}] unknown terminal '{}'".format(bus, i, terminal)
-                    )
-                out_entries.append(parsed)
-            normalized_connections[bus] = out_entries
-            continue
-
-        raise ValueError("unknown bus '{}' (expected RBUS*/SBUS*)".format(bus))
+        out_entries = []
+        for i, entry in enumerate(entries):
+            terminal, connection = sbus_entry_parts(entry, bus, i)
+            if terminal not in pin_to_sw_matrix:
+                raise ValueError(
+                    "connections.{}[{}] unknown terminal '{}'".format(bus, i, terminal)
+                )
+            out_entries.append({"terminal": terminal, "connection": connection})
+        normalized_connections[bus] = out_entries
 
     known_devices = set(reg_eq.SIZING_DEVICE_ORDER)
     unknown_devices = sorted(set(raw_sizes.keys()) - known_devices)
@@ -118,6 +126,6 @@ def validate_and_normalize_config(config, pin_to_sw_matrix):
     normalized_sizes = {}
     for device in reg_eq.SIZING_DEVICE_ORDER:
         raw = raw_sizes.get(device, 0)
-        normalized_sizes[device] = _normalize_size_value(device, raw)
+        normalized_sizes[device] = normalize_size_value(device, raw)
 
     return {"connections": normalized_connections, "sizes": normalized_sizes}
@@ -1,11 +1,32 @@
-import sys
-import json
+import os
 import time
+import hashlib
+import binascii
 
-from bitstream_builder import build_bitstream
-from config_validation import validate_and_normalize_config
+from build_cache import CACHE_DIRNAME, DEFAULT_BUDGET_BYTES, BuildCache, cache_key, join_path, remove_file
+from clock_timing import (
+    CALIBRATION_BITS,
+    DEFAULT_MIN_HALF_CYCLE_NS,
+    SHIFT_ENGINES,
+    ClockPlan,
+    fastest_us,
+    plan_generic,
+    plan_parallel,
+    plan_pio,
+    target_half_ns,
+    uncompensated_plan,
+)
+from packed_bitstream import EXPECTED_BITS, PackedBitstream, concat_bitstreams, write_bitstream_text
+from program_stats import ProgramStats
+
+# Bump when the builder may produce different bits for the same inputs (invalidates build caches).
+LIB_VERSION = "2.2"
 
 DEBUG_BITSTREAM_FILENAME = "bitstream.txt"
+FINGERPRINT_FILENAME = ".mosbius_last_program"
+FINGERPRINT_VERSION = "v2"
+# Longest CPU-bound shift burst in program_async before it yields to other tasks.
+DEFAULT_MAX_BURST_US = 2000
 
 
 def _dirname(path):
@@ -17,22 +38,14 @@ def _dirname(path):
     return head if head else "/"
 
 
-def _join(a, b):
-    if not a or a == ".":
-        return b
-    if a.endswith("/"):
-        return a + b
-    return a + "/" + b
-
-
 def _isabs(path):
     return isinstance(path, str) and path.startswith("/")
 
 
-def _load_json(path):
+def _read_bytes(path):
     try:
-        with open(path, "r") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return f.read()
     except OSError as e:
         if e.args and e.args[0] == 2:
             raise OSError(
@@ -41,36 +54,102 @@ def _load_json(path):
         raise
 
 
-def _write_bitstream_text(path, bitstream, order="asc", m2k=False):
-    if order not in ("asc", "desc"):
-        raise ValueError("order must be 'asc' or 'desc'")
-    iterable = reversed(bitstream) if order == "desc" else bitstream
-    with open(path, "w") as f:
-        if m2k:
-            f.write("0\n")
-        for bit in iterable:
-            f.write("{}\n".format(int(bit)))
+def _file_sha256(path):
+    """
+    Hex SHA-256 of a file's bytes, or None if it cannot be read.
+    """
+    try:
+        data = _read_bytes(path)
+    except OSError:
+        return None
+    return binascii.hexlify(hashlib.sha256(data).digest()).decode()
 
 
-def _program_bitstream(bitstream, pin_en, pin_clk, pin_data, t_clk_half_cycle_us):
+def _shift_bits(data, nbits, pin_clk, pin_data, plan, low=0):
+    # Bitstream is packed in ascending register order; shift last bit first.
+    # Bits nbits-1 down to low are shifted (program_async shifts in bursts).
+    if not plan.sleeps:
+        for i in range(nbits - 1, low - 1, -1):
+            pin_data.value((data[i >> 3] >> (i & 7)) & 1)
+            pin_clk.value(1)
+            pin_clk.value(0)
+        return
+    sleep_us = time.sleep_us
+    delay_high = plan.delay_high
+    delay_low = plan.delay_low
+    for i in range(nbits - 1, low - 1, -1):
+        pin_data.value((data[i >> 3] >> (i & 7)) & 1)
+        pin_clk.value(1)
+        sleep_us(delay_high)
+        pin_clk.value(0)
+        sleep_us(delay_low)
+
+
+def _program_bitstream(bitstream, pin_en, pin_clk, pin_data, t_clk_half_cycle_us, plan=None):
+    """
+    Shift with Pin.value(); plan (see clock_timing) defaults to sleep_us(t) per half.
+    """
     if pin_en is None or pin_clk is None or pin_data is None:
         raise ValueError("GPIO pins are not initialized")
-    if not bitstream:
+    if not bitstream.nbits:
         raise ValueError("Bitstream is empty")
 
     pin_data.value(0)
     pin_clk.value(0)
     pin_en.value(0)
+    _shift_bits(bitstream.data, bitstream.nbits, pin_clk, pin_data, plan or uncompensated_plan(t_clk_half_cycle_us))
+    pin_en.value(1)
 
-    # Bitstream is generated in ascending register order; shift last bit first.
-    for bit in reversed(bitstream):
-        pin_data.value(bit)
-        pin_clk.value(1)
-        time.sleep_us(t_clk_half_cycle_us)
-        pin_clk.value(0)
-        time.sleep_us(t_clk_half_cycle_us)
 
-    pin_en.value(1)
+def _write_once(pin, count):
+    for _ in range(count):
+        pin.value(0)
+
+
+def _write_twice(pin, count):
+    for _ in range(count):
+        pin.value(0)
+        pin.value(0)
+
+
+def _calibrate_generic(pin_data):
+    """
+    Time the generic loop with DATA standing in for CLK (nothing is clocked).
+
+    Returns (bare_bit_ns, sleep_bit_ns, write_ns): per-bit cost without sleep
+    calls, with sleep_us(1) calls minus the 2 us slept, and the time from one
+    Pin.value() write to the next when they run back to back.
+    """
+    scratch = bytearray(CALIBRATION_BITS >> 3)
+    bare_plan = ClockPlan("generic", 0, 0, 0, 0, 0, None, sleeps=False)
+    sleep_plan = ClockPlan("generic", 0, 1, 1, 0, 0, None)
+    bare_us, sleep_us, single_us, double_us = fastest_us(
+        (_shift_bits, (scratch, CALIBRATION_BITS, pin_data, pin_data, bare_plan)),
+        (_shift_bits, (scratch, CALIBRATION_BITS, pin_data, pin_data, sleep_plan)),
+        (_write_once, (pin_data, CALIBRATION_BITS)),
+        (_write_twice, (pin_data, CALIBRATION_BITS)),
+    )
+    bare_bit_ns = bare_us * 1000 // CALIBRATION_BITS
+    sleep_bit_ns = max(bare_bit_ns, sleep_us * 1000 // CALIBRATION_BITS - 2000)
+    write_ns = max(0, (double_us - single_us) * 1000 // CALIBRATION_BITS)
+    return bare_bit_ns, sleep_bit_ns, write_ns
+
+
+def _round_hz(hz):
+    return int(hz + 0.5) if hz else hz
+
+
+def _bitstream_fingerprint(bitstream, clock_settings):
+    digest = binascii.hexlify(hashlib.sha256(bitstream.data).digest()).decode()
+    return "{} {} {} {}".format(FINGERPRINT_VERSION, digest, bitstream.nbits, clock_settings)
+
+
+def _read_text(path):
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
 
 
 class MOSbiusV2Driver:
@@ -83,15 +162,66 @@ class MOSbiusV2Driver:
         config_file="config.json",
         pin_map_path=None,
         write_debug_bitstream=False,
+        fingerprint_file=FINGERPRINT_FILENAME,
+        cache_dir=CACHE_DIRNAME,
+        cache_budget_bytes=DEFAULT_BUDGET_BYTES,
+        collect_stats=False,
+        shift_engine="generic",
+        pin_numbers=None,
+        pio_clock_hz=None,
+        pio_state_machine=None,
+        clock_mode="fixed",
+        min_half_cycle_ns=DEFAULT_MIN_HALF_CYCLE_NS,
+        check_conflicts=True,
     ):
         self.pin_en = pin_en
         self.pin_clk = pin_clk
         self.pin_data = pin_data
         self.t_clk_half_cycle_us = int(t_clk_half_cycle_us)
         self.config_file = config_file
-        self.config_path = self._resolve_local_path(config_file)
+        # A list/tuple of configs programs daisy-chained chips, first = nearest DATA.
+        config_files = config_file if isinstance(config_file, (list, tuple)) else (config_file,)
+        if not config_files:
+            raise ValueError("config_file list is empty")
+        self.config_paths = [self._resolve_local_path(path) for path in config_files]
+        self.config_path = self.config_paths[0]
         self.pin_map_path = pin_map_path or self._default_pin_map_path()
         self.write_debug_bitstream = write_debug_bitstream
+        # Reject configs that write one register twice with different values.
+        self.check_conflicts = check_conflicts
+        # Fingerprint of the last successfully programmed bitstream; None disables skipping.
+        self.fingerprint_path = self._resolve_local_path(fingerprint_file) if fingerprint_file else None
+        # Built bitstreams keyed by raw config/pin-map bytes; None disables caching.
+        self.cache = BuildCache(self._resolve_local_path(cache_dir), cache_budget_bytes) if cache_dir else None
+        # Per-phase timing/heap of the last run; None unless collect_stats=True.
+        self.stats = ProgramStats() if collect_stats else None
+        # "generic" (Pin.value loop), "viper" (SIO writes), "pio" (state machine) or "auto".
+        # viper and pio need pin_numbers = (en, clk, data) GPIO numbers.
+        self.shift_engine = shift_engine
+        self.pin_numbers = tuple(pin_numbers) if pin_numbers is not None else None
+        # PIO CLK rate in Hz; None derives it from t_clk_half_cycle_us.
+        self.pio_clock_hz = pio_clock_hz
+        # None uses pio_shift.DEFAULT_STATE_MACHINE.
+        self.pio_state_machine = pio_state_machine
+        # "fixed" targets t_clk_half_cycle_us, "fastest" targets min_half_cycle_ns;
+        # either way measured loop overhead is compensated (see clock_timing).
+        self.clock_mode = clock_mode
+        self.min_half_cycle_ns = min_half_cycle_ns
+        self.target_half_ns = target_half_ns(t_clk_half_cycle_us, clock_mode, min_half_cycle_ns)
+        self._clock_plans = {}
+        self.achieved_clock_hz = None
+        # Parsed pin map, kept resident once loaded (see pin_map()).
+        self._pin_map = None
+        if shift_engine not in SHIFT_ENGINES:
+            raise ValueError("shift_engine must be one of {}, got '{}'".format(", ".join(SHIFT_ENGINES), shift_engine))
+
+    def _begin(self):
+        return self.stats.begin() if self.stats is not None else None
+
+    def _end(self, phase, token):
+        if token is not None:
+            return self.stats.end(phase, token)
+        return None
 
     @staticmethod
     def _base_dir():
@@ -102,47 +232,491 @@ class MOSbiusV2Driver:
 
     @classmethod
     def _default_pin_map_path(cls):
-        return _join(cls._base_dir(), "pin_name_to_sw_matrix_pin_number.json")
+        return join_path(cls._base_dir(), "pin_name_to_sw_matrix_pin_number.json")
 
     @classmethod
     def _resolve_local_path(cls, path):
         if _isabs(path):
             return path
-        return _join(cls._project_dir(), path)
+        return join_path(cls._project_dir(), path)
 
     @classmethod
     def _project_dir(cls):
         return _dirname(cls._base_dir())
 
     def build_bitstream_from_config(self):
-        config = _load_json(self.config_path)
-        pin_to_sw_matrix = _load_json(self.pin_map_path)
-        normalized = validate_and_normalize_config(config, pin_to_sw_matrix)
-        bitstream = build_bitstream(
-            normalized["connections"],
-            normalized["sizes"],
-            pin_to_sw_matrix,
-            track_sources=self.write_debug_bitstream,
-        )
+        if self.stats is not None:
+            self.stats.reset()
+        return self._build_from_paths(self.config_paths)
+
+    def _build_from_paths(self, config_paths):
+        steps = self._build_steps(config_paths)
+        # Step through the read and cache lookup by hand: a hit returns there,
+        # and only a miss pays for importing the builder (and its run_steps).
+        try:
+            next(steps)
+            next(steps)
+        except StopIteration as e:
+            return e.value
+        from bitstream_builder import run_steps
+
+        return run_steps(steps)
+
+    def _build_steps(self, config_paths):
+        """
+        Generator behind _build_from_paths; yields between phases and builder
+        chunks so build_async can hand control back to other tasks.
+        """
+        t = self._begin()
+        config_blobs = [_read_bytes(path) for path in config_paths]
+        pin_map_bytes = _read_bytes(self.pin_map_path)
+        self._end("read", t)
+        yield
+
+        key = None
+        if self.cache is not None:
+            t = self._begin()
+            # check_conflicts is keyed too: a build that skipped the check must not serve one that runs it.
+            conflicts = "conflicts={}".format(int(bool(self.check_conflicts)))
+            key = cache_key(*(config_blobs + [pin_map_bytes, LIB_VERSION, conflicts]))
+            bitstream = self.cache.get(key)
+            self._end("cache_lookup", t)
+            if self.stats is not None:
+                self.stats.set("cache_hit", bitstream is not None)
+            if bitstream is not None:
+                return bitstream
+            yield
+
+        # Cache miss: only now pay for json, validation and the builder.
+        import json
+        from bitstream_builder import compile_steps
+
+        t = self._begin()
+        configs = [json.loads(blob) for blob in config_blobs]
+        self._end("json_load", t)
+        t = self._begin()
+        pin_to_sw_matrix = json.loads(pin_map_bytes)
+        self._end("pin_map_load", t)
+        del config_blobs, pin_map_bytes
+        yield
+        t = self._begin()
+        if len(configs) == 1:
+            bitstream = yield from compile_steps(configs[0], pin_to_sw_matrix, self.check_conflicts)
+        else:
+            parts = []
+            for chip, config in enumerate(configs):
+                try:
+                    parts.append((yield from compile_steps(config, pin_to_sw_matrix, self.check_conflicts)))
+                except ValueError as e:
+                    raise ValueError("chip {} ({}): {}".format(chip, config_paths[chip], e))
+            bitstream = concat_bitstreams(parts)
+        del configs
+        self._end("compile", t)
+        if key is not None:
+            t = self._begin()
+            try:
+                self.cache.put(key, bitstream)
+            except OSError as e:
+                print("Warning: could not write build cache: {}".format(e))
+            self._end("cache_store", t)
         return bitstream
 
-    def program_from_config(self):
-        bitstream = self.build_bitstream_from_config()
+    def bitstream_from_compiled(self, compiled):
+        """
+        Return the bitstream of a compiled config module, or None if stale.
 
-        if self.write_debug_bitstream:
-            debug_path = _join(self._base_dir(), DEBUG_BITSTREAM_FILENAME)
-            _write_bitstream_text(debug_path, bitstream, order="asc", m2k=False)
+        The module (see V2/tools/frozen_config_generator.py) is stale when it
+        was built by a different LIB_VERSION, does not hold EXPECTED_BITS, or
+        when CONFIG_FILE or the pin map exists and its bytes no longer match
+        the hash compiled into the module. No JSON is parsed.
+        """
+        if self.stats is not None:
+            self.stats.reset()
+        if len(self.config_paths) != 1:
+            print("Compiled configs cover a single chip; ignoring for a {}-chip chain".format(len(self.config_paths)))
+            return None
+        t = self._begin()
+        if compiled.LIB_VERSION != LIB_VERSION:
+            print(
+                "Compiled config built for lib {} (runtime {}); ignoring".format(
+                    compiled.LIB_VERSION, LIB_VERSION
+                )
+            )
+            return None
+        if compiled.NBITS != EXPECTED_BITS or len(compiled.BITSTREAM) != (EXPECTED_BITS + 7) // 8:
+            print(
+                "Compiled config holds {} bits in {} bytes (chip has {} bits); ignoring".format(
+                    compiled.NBITS, len(compiled.BITSTREAM), EXPECTED_BITS
+                )
+            )
+            return None
+        sources = ((self.config_path, compiled.SOURCE_SHA256), (self.pin_map_path, compiled.PIN_MAP_SHA256))
+        for path, expected in sources:
+            digest = _file_sha256(path)
+            if digest is not None and digest != expected:
+                print("Compiled config does not match {}; ignoring".format(path))
+                return None
+        bitstream = PackedBitstream(compiled.NBITS, compiled.BITSTREAM)
+        self._end("compiled_check", t)
+        return bitstream
+
+    def clock_plan(self, engine):
+        """
+        Return the ClockPlan for an engine, calibrating its overhead on first use.
+        """
+        plan = self._clock_plans.get(engine)
+        if plan is not None:
+            return plan
+        target_ns = self.target_half_ns
+        if engine == "pio":
+            from pio_shift import PIO_CYCLES_PER_BIT
+
+            if self.clock_mode == "fixed" and self.pio_clock_hz:
+                target_ns = 500000000 / self.pio_clock_hz
+            plan = plan_pio(target_ns, PIO_CYCLES_PER_BIT)
+        elif engine == "viper":
+            from fast_shift import viper_clock_plan
+
+            plan = viper_clock_plan(target_ns)
+        elif engine == "parallel":
+            from parallel_shift import calibrate_parallel
+
+            t = self._begin()
+            bare_bit_ns, sleep_bit_ns, write_ns = calibrate_parallel()
+            self._end("calibrate", t)
+            plan = plan_parallel(target_ns, bare_bit_ns, sleep_bit_ns, write_ns)
+        else:
+            t = self._begin()
+            bare_bit_ns, sleep_bit_ns, write_ns = _calibrate_generic(self.pin_data)
+            self._end("calibrate", t)
+            plan = plan_generic(target_ns, bare_bit_ns, sleep_bit_ns, write_ns)
+        self._clock_plans[engine] = plan
+        return plan
+
+    def clock_settings(self, engine):
+        """
+        Describe how the given engine would clock, for the programming fingerprint.
+        """
+        return "{} {} {} {} {}".format(
+            engine, self.clock_mode, self.t_clk_half_cycle_us, self.min_half_cycle_ns, self.pio_clock_hz
+        )
+
+    def _resolve_engine(self):
+        """
+        Return the engine that will shift; only non-generic requests load fast_shift.
+        """
+        if self.shift_engine == "generic":
+            return "generic"
+        from fast_shift import resolve_engine
+
+        return resolve_engine(self.shift_engine, self.pin_numbers)
+
+    def last_fingerprint(self):
+        if not self.fingerprint_path:
+            return None
+        return _read_text(self.fingerprint_path)
 
-        if sys.implementation.name != "micropython":
+    def program_bitstream(self, bitstream, force=False):
+        """
+        Shift a packed bitstream into the chip.
+
+        Skips shifting when the persisted fingerprint matches, unless force=True.
+        Returns True if the chip was programmed, False if skipped.
+        """
+        if self.pin_en is None or self.pin_clk is None or self.pin_data is None:
             print("Generated {} bits (desktop mode, no GPIO programming)".format(len(bitstream)))
-            return
+            return False
+        engine = self._resolve_engine()
+        fingerprint = self._begin_program(bitstream, engine, force)
+        if fingerprint is None:
+            return False
 
+        plan = self.clock_plan(engine)
         print("Programming bitstream")
-        _program_bitstream(
-            bitstream,
-            self.pin_en,
-            self.pin_clk,
-            self.pin_data,
-            t_clk_half_cycle_us=self.t_clk_half_cycle_us,
+        t = self._begin()
+        start_us = time.ticks_us()
+        if engine == "pio":
+            from pio_shift import program_bitstream_pio
+
+            program_bitstream_pio(
+                bitstream,
+                self.pin_en,
+                self.pin_clk,
+                self.pin_data,
+                self.pin_numbers,
+                t_clk_half_cycle_us=self.t_clk_half_cycle_us,
+                state_machine=self.pio_state_machine,
+                freq=plan.sm_freq_hz,
+            )
+        elif engine == "viper":
+            from fast_shift import program_bitstream_viper
+
+            program_bitstream_viper(
+                bitstream,
+                self.pin_en,
+                self.pin_clk,
+                self.pin_data,
+                self.pin_numbers,
+                t_clk_half_cycle_us=self.t_clk_half_cycle_us,
+                spins=plan.delay_high,
+            )
+        else:
+            _program_bitstream(
+                bitstream,
+                self.pin_en,
+                self.pin_clk,
+                self.pin_data,
+                t_clk_half_cycle_us=self.t_clk_half_cycle_us,
+                plan=plan,
+            )
+        elapsed_us = time.ticks_diff(time.ticks_us(), start_us)
+        shift_us = self._end("shift", t)
+        self._finish_program(bitstream, engine, plan, fingerprint, elapsed_us, shift_us)
+        return True
+
+    def _begin_program(self, bitstream, engine, force):
+        """
+        Return the fingerprint to store after shifting, or None to skip.
+        """
+        fingerprint = _bitstream_fingerprint(bitstream, self.clock_settings(engine))
+        if not force and fingerprint == self.last_fingerprint():
+            if self.stats is not None:
+                self.stats.set("skipped", True)
+            print("Bitstream unchanged since last programming; skipping (use force=True to reprogram)")
+            return None
+
+        # Drop the old fingerprint first so an interrupted shift never looks up to date.
+        if self.fingerprint_path:
+            remove_file(self.fingerprint_path)
+        return fingerprint
+
+    def _finish_program(self, bitstream, engine, plan, fingerprint, elapsed_us, shift_us):
+        # elapsed_us is time spent clocking, shift_us the phase's wall time (longer for async bursts).
+        self.achieved_clock_hz = bitstream.nbits * 1000000 / elapsed_us if elapsed_us > 0 else None
+        print(
+            "Programming completed ({} clock: {} Hz achieved, {} Hz planned)".format(
+                engine, _round_hz(self.achieved_clock_hz), _round_hz(plan.clock_hz())
+            )
+        )
+        if self.stats is not None:
+            self.stats.set("skipped", False)
+            self.stats.set("shift_engine", engine)
+            self.stats.set("clock_mode", self.clock_mode)
+            self.stats.set("clock_hz_planned", _round_hz(plan.clock_hz()))
+            self.stats.record_shift(elapsed_us, bitstream.nbits, plan.target_ns / 1000)
+
+        if self.fingerprint_path:
+            with open(self.fingerprint_path, "w") as f:
+                f.write(fingerprint + "\n")
+
+    async def build_async(self):
+        """
+        build_bitstream_from_config that awaits between phases and builder chunks.
+        """
+        from async_program import run_steps_async
+
+        if self.stats is not None:
+            self.stats.reset()
+        return await run_steps_async(self._build_steps(self.config_paths))
+
+    async def program_bitstream_async(self, bitstream, force=False, max_burst_us=DEFAULT_MAX_BURST_US):
+        """
+        program_bitstream for asyncio applications.
+
+        The generic and viper engines shift in bursts predicted (from the
+        clock plan) to last at most max_burst_us and yield between bursts;
+        the pio engine tops up its FIFO and yields while the state machine
+        clocks. EN stays low from the first bit to the final latch and CLK
+        idles low between bursts, so a pause only stretches one low
+        half-period. A cancelled task leaves EN low and nothing latched.
+        """
+        from async_program import burst_bits, feed_pio_async, shift_bursts_async
+
+        if self.pin_en is None or self.pin_clk is None or self.pin_data is None:
+            print("Generated {} bits (desktop mode, no GPIO programming)".format(len(bitstream)))
+            return False
+        if not bitstream.nbits:
+            raise ValueError("Bitstream is empty")
+        engine = self._resolve_engine()
+        fingerprint = self._begin_program(bitstream, engine, force)
+        if fingerprint is None:
+            return False
+
+        plan = self.clock_plan(engine)
+        print("Programming bitstream (async)")
+        t = self._begin()
+        start_us = time.ticks_us()
+        if engine == "pio":
+            from pio_shift import done_timeout_ms, pack_words, start_state_machine, stop_state_machine
+
+            freq = plan.sm_freq_hz
+            sm = start_state_machine(
+                self.pin_en, self.pin_clk, self.pin_data, self.pin_numbers, freq, self.pio_state_machine
+            )
+            try:
+                bursts = await feed_pio_async(sm, pack_words(bitstream), done_timeout_ms(bitstream.nbits, freq))
+            finally:
+                stop_state_machine(sm, self.pin_clk, self.pin_data)
+            elapsed_us = time.ticks_diff(time.ticks_us(), start_us)
+        else:
+            if engine == "viper":
+                from fast_shift import shift_range_viper
+
+                pin_numbers = self.pin_numbers
+
+                def shift_range(high, low):
+                    shift_range_viper(bitstream, high, low, pin_numbers, plan.delay_high)
+
+            else:
+                data = bitstream.data
+                pin_clk = self.pin_clk
+                pin_data = self.pin_data
+
+                def shift_range(high, low):
+                    _shift_bits(data, high, pin_clk, pin_data, plan, low)
+
+            self.pin_data.value(0)
+            self.pin_clk.value(0)
+            self.pin_en.value(0)
+            elapsed_us, bursts = await shift_bursts_async(
+                shift_range, bitstream.nbits, burst_bits(plan, max_burst_us)
+            )
+        self.pin_en.value(1)
+        shift_us = self._end("shift", t)
+        if self.stats is not None:
+            self.stats.set("bursts", bursts)
+        self._finish_program(bitstream, engine, plan, fingerprint, elapsed_us, shift_us)
+        return True
+
+    def build_parallel_bitstreams(self, targets):
+        """
+        Build one bitstream per (data_gpio, config_file) target.
+
+        config_file may be a list for a daisy chain on that DATA line; relative
+        paths resolve like config_file. Returns (data_gpios, bitstreams).
+        """
+        if self.stats is not None:
+            self.stats.reset()
+        data_gpios = []
+        bitstreams = []
+        for data_gpio, config_file in targets:
+            config_files = config_file if isinstance(config_file, (list, tuple)) else (config_file,)
+            paths = [self._resolve_local_path(path) for path in config_files]
+            try:
+                bitstreams.append(self._build_from_paths(paths))
+            except ValueError as e:
+                raise ValueError("DATA GPIO{}: {}".format(data_gpio, e))
+            data_gpios.append(int(data_gpio))
+        return data_gpios, bitstreams
+
+    def program_parallel(self, targets, force=False):
+        """
+        Program chips that share EN/CLK but each have their own DATA pin.
+
+        targets is a list of (data_gpio, config_file) pairs. All chips are
+        clocked together, one GPIO port write per clock edge (see
+        parallel_shift). Returns True if programmed, False if skipped.
+        """
+        data_gpios, bitstreams = self.build_parallel_bitstreams(targets)
+        return self.program_parallel_bitstreams(data_gpios, bitstreams, force=force)
+
+    def program_parallel_bitstreams(self, data_gpios, bitstreams, force=False):
+        if self.pin_en is None or self.pin_clk is None:
+            print("Generated {} x {} bits (desktop mode, no GPIO programming)".format(len(bitstreams), bitstreams[0].nbits))
+            return False
+        if self.pin_numbers is None:
+            raise ValueError("parallel programming needs pin_numbers=(en, clk, data) GPIO numbers")
+        from parallel_shift import prepare_parallel, shift_parallel
+
+        words, data_mask = prepare_parallel(bitstreams, data_gpios, self.pin_numbers[1])
+
+        fingerprint = "{} parallel {} {}".format(
+            FINGERPRINT_VERSION,
+            ",".join(str(gpio) for gpio in data_gpios),
+            _bitstream_fingerprint(concat_bitstreams(bitstreams), self.clock_settings("parallel")),
         )
-        print("Programming completed")
+        if not force and fingerprint == self.last_fingerprint():
+            if self.stats is not None:
+                self.stats.set("skipped", True)
+            print("Bitstreams unchanged since last programming; skipping (use force=True to reprogram)")
+            return False
+        if self.fingerprint_path:
+            remove_file(self.fingerprint_path)
+
+        plan = self.clock_plan("parallel")
+        print("Programming {} chips in parallel on DATA GPIOs {}".format(len(bitstreams), data_gpios))
+        t = self._begin()
+        start_us = time.ticks_us()
+        shift_parallel(words, data_mask, data_gpios, self.pin_en, self.pin_numbers[1], plan)
+        elapsed_us = time.ticks_diff(time.ticks_us(), start_us)
+        shift_us = self._end("shift", t)
+        self._finish_program(bitstreams[0], "parallel", plan, fingerprint, elapsed_us, shift_us)
+        return True
+
+    def pin_map(self):
+        """
+        Return the parsed pin map, loading it on first use and keeping it resident.
+        """
+        if self._pin_map is None:
+            import json
+
+            t = self._begin()
+            self._pin_map = json.loads(_read_bytes(self.pin_map_path))
+            self._end("pin_map_load", t)
+        return self._pin_map
+
+    def bitstream_from_config_bytes(self, config_bytes):
+        """
+        Validate and build one chip's config from raw JSON bytes.
+
+        Uses the resident pin map and skips the build cache, so a long-running
+        caller (e.g. command_server) pays only for parsing and building.
+        """
+        import json
+        from bitstream_builder import compile_config
+
+        if self.stats is not None:
+            self.stats.reset()
+        t = self._begin()
+        config = json.loads(config_bytes)
+        self._end("json_load", t)
+        pin_to_sw_matrix = self.pin_map()
+        t = self._begin()
+        bitstream = compile_config(config, pin_to_sw_matrix, track_sources=self.check_conflicts)
+        self._end("compile", t)
+        return bitstream
+
+    def save_config(self, config_bytes):
+        """
+        Replace CONFIG_FILE with config_bytes (written to a temp file, then renamed).
+        """
+        if len(self.config_paths) != 1:
+            raise ValueError("save_config needs a single config file, driver has {}".format(len(self.config_paths)))
+        tmp_path = self.config_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(config_bytes)
+        remove_file(self.config_path)
+        os.rename(tmp_path, self.config_path)
+
+    def _write_debug(self, bitstream):
+        if self.write_debug_bitstream:
+            t = self._begin()
+            debug_path = join_path(self._base_dir(), DEBUG_BITSTREAM_FILENAME)
+            write_bitstream_text(debug_path, bitstream, order="asc", m2k=False)
+            self._end("debug_write", t)
+
+    def program_from_config(self, force=False):
+        bitstream = self.build_bitstream_from_config()
+        self._write_debug(bitstream)
+        return self.program_bitstream(bitstream, force=force)
+
+    async def program_async(self, force=False, max_burst_us=DEFAULT_MAX_BURST_US):
+        """
+        program_from_config without blocking other asyncio/uasyncio tasks.
+
+        Builds with build_async, then shifts with program_bitstream_async
+        (bursts of at most max_burst_us). Returns like program_bitstream.
+        """
+        bitstream = await self.build_async()
+        self._write_debug(bitstream)
+        return await self.program_bitstream_async(bitstream, force=force, max_burst_us=max_burst_us)
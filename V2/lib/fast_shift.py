@@ -0,0 +1,165 @@
+"""
+Fast shift engine selection for MOSbiusV2Driver.
+
+The "viper" engine clocks the packed bitstream with a viper loop that writes
+the RP2040 SIO set/clear registers and waits with a calibrated spin count,
+so the clock follows t_clk_half_cycle_us instead of interpreter overhead.
+The "pio" engine (pio_shift) hands the bits to an rp2 state machine.
+Both need GPIO numbers (not just Pin objects) and fall back to the generic
+Pin.value() loop wherever they are unavailable.
+"""
+
+import sys
+import time
+
+from clock_timing import CALIBRATION_BITS, SHIFT_ENGINES, plan_viper
+
+CALIBRATION_SPINS = 20000
+
+_viper = None
+_viper_checked = False
+_spins_per_us = None
+_half_overhead_ns = None
+
+
+def viper_module():
+    """
+    Return the viper_shift module, or None if it cannot be used here.
+    """
+    global _viper, _viper_checked
+    if not _viper_checked:
+        _viper_checked = True
+        if sys.platform == "rp2":
+            try:
+                import viper_shift
+
+                _viper = viper_shift
+            except (ImportError, SyntaxError):
+                _viper = None
+    return _viper
+
+
+def viper_available():
+    return viper_module() is not None
+
+
+def calibrate_spins_per_us():
+    """
+    Measure (once) how many viper spin iterations take one microsecond.
+    """
+    global _spins_per_us
+    if _spins_per_us is None:
+        viper = viper_module()
+        if viper is None:
+            raise ValueError("viper shift engine is not available on this port")
+        viper.spin(1000)
+        start = time.ticks_us()
+        viper.spin(CALIBRATION_SPINS)
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        _spins_per_us = CALIBRATION_SPINS / max(elapsed, 1)
+    return _spins_per_us
+
+
+def spins_for_half_cycle(t_clk_half_cycle_us):
+    return max(0, int(t_clk_half_cycle_us * calibrate_spins_per_us() + 0.5))
+
+
+def viper_half_overhead_ns():
+    """
+    Measure the viper loop's cost per half-cycle with zero spins.
+
+    Zero SET/CLR masks make every SIO write a no-op, so no pin moves.
+    """
+    global _half_overhead_ns
+    if _half_overhead_ns is None:
+        viper = viper_module()
+        if viper is None:
+            raise ValueError("viper shift engine is not available on this port")
+        scratch = bytearray(CALIBRATION_BITS >> 3)
+        start = time.ticks_us()
+        viper.shift_packed(scratch, CALIBRATION_BITS, 0, 0, 0)
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        _half_overhead_ns = elapsed * 1000 / (2 * CALIBRATION_BITS)
+    return _half_overhead_ns
+
+
+def viper_clock_plan(target_ns):
+    return plan_viper(target_ns, viper_half_overhead_ns(), 1000 / calibrate_spins_per_us())
+
+
+def resolve_engine(requested, pin_numbers):
+    """
+    Map a requested engine name to the one that will actually run.
+    """
+    if requested not in SHIFT_ENGINES:
+        raise ValueError("shift_engine must be one of {}, got '{}'".format(", ".join(SHIFT_ENGINES), requested))
+    if requested == "generic":
+        return "generic"
+    if pin_numbers is None:
+        reason = "no pin_numbers given"
+    elif requested == "pio":
+        from pio_shift import pio_available
+
+        if pio_available():
+            return "pio"
+        reason = "rp2 PIO not available on this port"
+    elif viper_available():
+        return "viper"
+    else:
+        reason = "viper/SIO not available on this port"
+    if requested != "auto":
+        print("Warning: {} shift engine unavailable ({}); using generic loop".format(requested, reason))
+    return "generic"
+
+
+def program_bitstream_viper(bitstream, pin_en, pin_clk, pin_data, pin_numbers, t_clk_half_cycle_us, spins=None):
+    """
+    Shift with the viper loop; spins (from viper_clock_plan) overrides the
+    uncompensated spin count derived from t_clk_half_cycle_us.
+    """
+    if pin_en is None or pin_clk is None or pin_data is None:
+        raise ValueError("GPIO pins are not initialized")
+    if not bitstream.nbits:
+        raise ValueError("Bitstream is empty")
+    viper = viper_module()
+    _, clk_num, data_num = pin_numbers
+    if spins is None:
+        spins = spins_for_half_cycle(t_clk_half_cycle_us)
+
+    pin_data.value(0)
+    pin_clk.value(0)
+    pin_en.value(0)
+    viper.shift_packed(bitstream.data, bitstream.nbits, 1 << clk_num, 1 << data_num, spins)
+    pin_en.value(1)
+
+
+def shift_range_viper(bitstream, high, low, pin_numbers, spins):
+    """
+    Shift bits high-1 down to low with the viper loop, EN untouched.
+
+    low must be a multiple of 8: the loop is handed the bytes from low >> 3
+    on, so its bit 0 is bit low of the stream.
+    """
+    if low & 7:
+        raise ValueError("viper burst must start on a byte boundary, got bit {}".format(low))
+    _, clk_num, data_num = pin_numbers
+    viper_module().shift_packed(memoryview(bitstream.data)[low >> 3 :], high - low, 1 << clk_num, 1 << data_num, spins)
+
+
+def shift_packed_reference(write_masks, bitstream, clk_mask, data_mask):
+    """
+    Pure-Python mirror of viper_shift.shift_packed's port-write sequence
+    (spins omitted: each DATA write follows the previous falling edge and
+    precedes a full low-phase spin).
+
+    write_masks(set_mask, clear_mask) stands in for the SIO registers, e.g.
+    EmulatedBoard.write_masks, so the sequence can be checked on a host.
+    """
+    data = bitstream.data
+    for i in range(bitstream.nbits - 1, -1, -1):
+        if (data[i >> 3] >> (i & 7)) & 1:
+            write_masks(data_mask, 0)
+        else:
+            write_masks(0, data_mask)
+        write_masks(clk_mask, 0)
+        write_masks(0, clk_mask)
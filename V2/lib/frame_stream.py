@@ -0,0 +1,162 @@
+"""
+Framed binary transfer of packed bitstreams over a byte stream (USB serial).
+
+Frame layout (little-endian):
+  magic "MF" | seq u8 | flags u8 (bit 0 = last frame) | length u16 |
+  crc32 u32 | payload (length bytes)
+
+The CRC covers the first 6 header bytes and the payload; seq counts frames
+from 0, modulo 256. The receiver answers every frame with 4 ASCII bytes:
+"+" (ACK) or "-" (NACK), a reason code and the frame's seq as two hex
+digits, e.g. "+.03" or "-C03". A CRC NACK asks for the same frame again;
+any other NACK ends the transfer.
+
+Payloads are read with readinto straight into the caller's buffer (the
+driver's shift buffer), so no data buffers are allocated per frame.
+"""
+
+import struct
+
+from packed_bitstream import crc32
+
+FRAME_MAGIC = b"MF"
+FRAME_HEADER_FORMAT = "<2sBBHI"
+FRAME_HEADER_SIZE = 10
+FLAG_LAST = 0x01
+MAX_FRAME_PAYLOAD = 256
+MAX_CRC_RETRIES = 8
+DEFAULT_TIMEOUT_MS = 2000
+
+ACK = ord("+")
+NACK = ord("-")
+REASON_OK = "."
+REASON_DUPLICATE = "D"
+REASON_CRC = "C"
+REASON_LENGTH = "L"
+REASON_MAGIC = "M"
+REASON_SEQUENCE = "S"
+_HEX = b"0123456789abcdef"
+
+
+def encode_frame(seq, payload, last=False):
+    """
+    Return header + payload for one frame (host side).
+    """
+    if len(payload) > MAX_FRAME_PAYLOAD:
+        raise ValueError("frame payload is {} bytes, max {}".format(len(payload), MAX_FRAME_PAYLOAD))
+    header = struct.pack(FRAME_HEADER_FORMAT, FRAME_MAGIC, seq & 0xFF, FLAG_LAST if last else 0, len(payload), 0)
+    crc = crc32(payload, crc32(header[:6]))
+    return header[:6] + struct.pack("<I", crc) + bytes(payload)
+
+
+def parse_response(response):
+    """
+    Return (ack, reason, seq) for a 4-byte receiver response.
+    """
+    if len(response) != 4 or response[0] not in (ACK, NACK):
+        raise ValueError("bad frame response {!r}".format(bytes(response)))
+    return response[0] == ACK, chr(response[1]), int(bytes(response[2:4]), 16)
+
+
+def _make_poll(stream):
+    try:
+        import select
+
+        poll = select.poll()
+        poll.register(stream, select.POLLIN)
+        return poll
+    except (ImportError, AttributeError, OSError, ValueError):
+        return None
+
+
+class FrameReceiver:
+    """
+    Receives one bitstream per receive_into() call; all buffers are allocated here.
+    """
+
+    def __init__(self, stream_in, stream_out, timeout_ms=DEFAULT_TIMEOUT_MS):
+        self.stream_in = stream_in
+        self.stream_out = stream_out
+        self.timeout_ms = timeout_ms
+        self.header = bytearray(FRAME_HEADER_SIZE)
+        self._header_view = memoryview(self.header)
+        self._crc_view = self._header_view[:6]
+        # Retransmitted frames that were already stored are read here and dropped.
+        self._scratch_view = memoryview(bytearray(MAX_FRAME_PAYLOAD))
+        self.response = bytearray(4)
+        self._poll = _make_poll(stream_in)
+        self.frames = 0
+        self.naks = 0
+
+    def _read(self, view):
+        pos = 0
+        nbytes = len(view)
+        while pos < nbytes:
+            if self._poll is not None and not self._poll.poll(self.timeout_ms):
+                raise OSError("frame timed out after {} ms ({} of {} bytes)".format(self.timeout_ms, pos, nbytes))
+            n = self.stream_in.readinto(view[pos:])
+            if not n:
+                raise OSError("stream closed inside a frame")
+            pos += n
+
+    def _respond(self, code, reason, seq):
+        response = self.response
+        response[0] = code
+        response[1] = ord(reason)
+        response[2] = _HEX[seq >> 4]
+        response[3] = _HEX[seq & 15]
+        self.stream_out.write(response)
+        if hasattr(self.stream_out, "flush"):
+            self.stream_out.flush()
+
+    def _fail(self, reason, seq, message):
+        self._respond(NACK, reason, seq)
+        raise ValueError(message)
+
+    def receive_into(self, buf, nbytes):
+        """
+        Fill buf[0:nbytes] from consecutive frames; the last one has FLAG_LAST.
+        """
+        view = memoryview(buf)
+        header = self.header
+        offset = 0
+        expected = 0
+        self.frames = 0
+        self.naks = 0
+        while True:
+            self._read(self._header_view)
+            seq = header[2]
+            if header[0] != FRAME_MAGIC[0] or header[1] != FRAME_MAGIC[1]:
+                self._fail(REASON_MAGIC, seq, "bad frame magic")
+            length = header[4] | (header[5] << 8)
+            crc = header[6] | (header[7] << 8) | (header[8] << 16) | (header[9] << 24)
+            if length > MAX_FRAME_PAYLOAD:
+                self._fail(REASON_LENGTH, seq, "frame of {} bytes exceeds {}".format(length, MAX_FRAME_PAYLOAD))
+            if seq == expected:
+                if offset + length > nbytes:
+                    self._fail(REASON_LENGTH, seq, "frames overrun the {}-byte bitstream".format(nbytes))
+                target = view[offset : offset + length]
+            elif self.frames and seq == (expected - 1) & 0xFF:
+                target = self._scratch_view[:length]
+            else:
+                self._fail(REASON_SEQUENCE, seq, "expected frame {}, got {}".format(expected, seq))
+            self._read(target)
+            if crc32(target, crc32(self._crc_view)) != crc:
+                self.naks += 1
+                self._respond(NACK, REASON_CRC, seq)
+                if self.naks > MAX_CRC_RETRIES:
+                    raise OSError("too many CRC errors ({})".format(self.naks))
+                continue
+            if seq != expected:
+                # Our ACK for this frame was lost; acknowledge it again.
+                self._respond(ACK, REASON_DUPLICATE, seq)
+                continue
+            self._respond(ACK, REASON_OK, seq)
+            offset += length
+            expected = (expected + 1) & 0xFF
+            self.frames += 1
+            if header[3] & FLAG_LAST:
+                break
+        if offset != nbytes:
+            raise ValueError("transfer ended after {} of {} bytes".format(offset, nbytes))
+        return self.frames
@@ -0,0 +1,299 @@
+"""
+Packed bitstream container for MOSbius V2.
+
+Bits are stored eight per byte, LSB first: bit index i (0-based) lives in
+byte i >> 3 at mask 1 << (i & 7) and holds register i + 1. Ascending
+iteration therefore matches ascending register order, and shift order
+(last register first) is the reverse.
+
+Binary file layout (all fields little-endian):
+  magic "MBBS" | version u8 | order u8 (0=asc, 1=desc) | reserved u16 |
+  nbits u32 | crc32(payload) u32 | payload (ceil(nbits / 8) packed bytes)
+"""
+
+import struct
+
+try:
+    from binascii import crc32 as _crc32
+except ImportError:
+    _crc32 = None
+
+EXPECTED_BITS = 2008
+
+BINARY_MAGIC = b"MBBS"
+BINARY_VERSION = 1
+BINARY_HEADER_FORMAT = "<4sBBHII"
+BINARY_HEADER_SIZE = 16
+ORDER_CODES = {"asc": 0, "desc": 1}
+
+
+class PackedBitstream:
+    __slots__ = ("nbits", "data")
+
+    def __init__(self, nbits=EXPECTED_BITS, data=None):
+        nbits = int(nbits)
+        if nbits < 0:
+            raise ValueError("nbits must be >= 0, got {}".format(nbits))
+        nbytes = (nbits + 7) >> 3
+        if data is None:
+            data = bytearray(nbytes)
+        else:
+            if len(data) != nbytes:
+                raise ValueError(
+                    "packed data must be {} bytes for {} bits, got {}".format(nbytes, nbits, len(data))
+                )
+            # bytes are kept as-is (read-only, e.g. frozen in flash); set() then fails.
+            if not isinstance(data, (bytes, bytearray)):
+                data = bytearray(data)
+        self.nbits = nbits
+        self.data = data
+
+    @classmethod
+    def from_bits(cls, bits):
+        """
+        Pack an ascending sequence of 0/1 values.
+        """
+        bitstream = cls(len(bits))
+        data = bitstream.data
+        for i, bit in enumerate(bits):
+            if bit:
+                data[i >> 3] |= 1 << (i & 7)
+        return bitstream
+
+    def __len__(self):
+        return self.nbits
+
+    def _check_index(self, index):
+        if index < 0 or index >= self.nbits:
+            raise IndexError("bit index {} out of range 0..{}".format(index, self.nbits - 1))
+
+    def get(self, index):
+        self._check_index(index)
+        return (self.data[index >> 3] >> (index & 7)) & 1
+
+    def set(self, index, value):
+        self._check_index(index)
+        mask = 1 << (index & 7)
+        if value:
+            self.data[index >> 3] |= mask
+        else:
+            self.data[index >> 3] &= ~mask & 0xFF
+
+    def __getitem__(self, index):
+        return self.get(index)
+
+    def __iter__(self):
+        data = self.data
+        for i in range(self.nbits):
+            yield (data[i >> 3] >> (i & 7)) & 1
+
+    def iter_shift_order(self):
+        """
+        Yield bits last register first, i.e. in the order they are clocked in.
+        """
+        data = self.data
+        for i in range(self.nbits - 1, -1, -1):
+            yield (data[i >> 3] >> (i & 7)) & 1
+
+    def __reversed__(self):
+        return self.iter_shift_order()
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedBitstream):
+            return NotImplemented
+        return self.nbits == other.nbits and self.data == other.data
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def count(self):
+        """
+        Return the number of bits set to 1.
+        """
+        total = 0
+        for byte in self.data:
+            while byte:
+                byte &= byte - 1
+                total += 1
+        return total
+
+    def copy(self):
+        return PackedBitstream(self.nbits, bytearray(self.data))
+
+    def to_bytes(self):
+        return bytes(self.data)
+
+
+def concat_bitstreams(parts):
+    """
+    Concatenate bitstreams in ascending order (parts[0] gets bit index 0).
+
+    For a daisy chain, parts[0] is the chip nearest DATA: its bits are
+    shifted last, after the bits of every chip further down the chain.
+    """
+    nbits = 0
+    for part in parts:
+        nbits += part.nbits
+    out = PackedBitstream(nbits)
+    data = out.data
+    offset = 0
+    for part in parts:
+        if not (offset & 7):
+            start = offset >> 3
+            data[start : start + len(part.data)] = part.data
+            # Clear padding bits of a non-byte-aligned part before the next one lands.
+            if part.nbits & 7:
+                data[start + len(part.data) - 1] &= (1 << (part.nbits & 7)) - 1
+        else:
+            src = part.data
+            for i in range(part.nbits):
+                if (src[i >> 3] >> (i & 7)) & 1:
+                    j = offset + i
+                    data[j >> 3] |= 1 << (j & 7)
+        offset += part.nbits
+    return out
+
+
+def write_bitstream_text(path, bitstream, order="asc", m2k=False):
+    """
+    Write one ASCII bit per line ("0"/"1"), optionally M2K-prefixed.
+    """
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be 'asc' or 'desc'")
+    nbits = bitstream.nbits
+    data = bitstream.data
+    offset = 2 if m2k else 0
+    buf = bytearray(b"0\n" * (nbits + (1 if m2k else 0)))
+    for i in range(nbits):
+        if (data[i >> 3] >> (i & 7)) & 1:
+            pos = (nbits - 1 - i) if order == "desc" else i
+            buf[offset + 2 * pos] = 0x31
+    with open(path, "wb") as f:
+        f.write(buf)
+
+
+def load_bitstream_text(path):
+    """
+    Read a one-bit-per-line text file (ascending order) into a PackedBitstream.
+    """
+    data = bytearray()
+    acc = 0
+    nbits = 0
+    with open(path, "r") as f:
+        for line_no, raw_line in enumerate(f, 1):
+            line = raw_line.strip()
+            if not line:
+                continue
+            if line == "1":
+                acc |= 1 << (nbits & 7)
+            elif line != "0":
+                raise ValueError(
+                    "Invalid bitstream value '{}' at line {} in {}".format(
+                        line, line_no, path
+                    )
+                )
+            nbits += 1
+            if not (nbits & 7):
+                data.append(acc)
+                acc = 0
+    if not nbits:
+        raise ValueError("Bitstream file is empty: {}".format(path))
+    if nbits & 7:
+        data.append(acc)
+    return PackedBitstream(nbits, data)
+
+
+def crc32(data, value=0):
+    """
+    CRC-32 of data; pass a previous result as value to continue it.
+    """
+    if _crc32 is not None:
+        return _crc32(data, value) & 0xFFFFFFFF
+    crc = value ^ 0xFFFFFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ (0xEDB88320 if crc & 1 else 0)
+    return crc ^ 0xFFFFFFFF
+
+
+def _reversed_bits(bitstream):
+    nbits = bitstream.nbits
+    data = bitstream.data
+    out = PackedBitstream(nbits)
+    out_data = out.data
+    for i in range(nbits):
+        if (data[i >> 3] >> (i & 7)) & 1:
+            j = nbits - 1 - i
+            out_data[j >> 3] |= 1 << (j & 7)
+    return out
+
+
+def write_bitstream_binary(path, bitstream, order="asc"):
+    """
+    Write a packed bitstream with a header and CRC32 (see module docstring).
+    """
+    if order not in ORDER_CODES:
+        raise ValueError("order must be 'asc' or 'desc'")
+    payload = bitstream if order == "asc" else _reversed_bits(bitstream)
+    header = struct.pack(
+        BINARY_HEADER_FORMAT,
+        BINARY_MAGIC,
+        BINARY_VERSION,
+        ORDER_CODES[order],
+        0,
+        payload.nbits,
+        crc32(payload.data),
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(payload.data)
+
+
+def load_bitstream_binary(path):
+    """
+    Read a binary bitstream file into a PackedBitstream in ascending order.
+    """
+    with open(path, "rb") as f:
+        header = f.read(BINARY_HEADER_SIZE)
+        if len(header) != BINARY_HEADER_SIZE:
+            raise ValueError("Truncated bitstream header in {}".format(path))
+        magic, version, order_code, _, nbits, expected_crc = struct.unpack(BINARY_HEADER_FORMAT, header)
+        if magic != BINARY_MAGIC:
+            raise ValueError("Not a binary bitstream file (bad magic): {}".format(path))
+        if version != BINARY_VERSION:
+            raise ValueError("Unsupported bitstream version {} in {}".format(version, path))
+        if order_code not in (0, 1):
+            raise ValueError("Invalid order code {} in {}".format(order_code, path))
+        if not nbits:
+            raise ValueError("Bitstream file is empty: {}".format(path))
+        bitstream = PackedBitstream(nbits)
+        n = f.readinto(bitstream.data)
+    if n != len(bitstream.data):
+        raise ValueError(
+            "Truncated bitstream payload in {}: expected {} bytes, got {}".format(
+                path, len(bitstream.data), n or 0
+            )
+        )
+    if crc32(bitstream.data) != expected_crc:
+        raise ValueError("CRC mismatch in {}".format(path))
+    if order_code == 1:
+        bitstream = _reversed_bits(bitstream)
+    return bitstream
+
+
+def is_binary_bitstream_file(path):
+    with open(path, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def load_bitstream(path):
+    """
+    Load a bitstream file, detecting binary vs text format from the magic.
+    """
+    if is_binary_bitstream_file(path):
+        return load_bitstream_binary(path)
+    return load_bitstream_text(path)
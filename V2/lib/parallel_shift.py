@@ -0,0 +1,154 @@
+"""
+Bit-parallel programming of several chips that share EN/CLK but each have
+their own DATA pin.
+
+The per-chip bitstreams are transposed into one GPIO mask per clock: bit
+`gpio` of step k is the k-th shifted bit (last register first) for the chip
+on that DATA pin. Each falling CLK edge is a single GPIO_OUT_XOR write that
+also moves every DATA line to its next level, and each rising edge is a
+single GPIO_OUT_SET write, so all chips are programmed in the time of one.
+"""
+
+import time
+from array import array
+
+SIO_BASE = 0xD0000000
+GPIO_OUT_SET = SIO_BASE + 0x014
+GPIO_OUT_CLR = SIO_BASE + 0x018
+GPIO_OUT_XOR = SIO_BASE + 0x01C
+
+
+def transpose_bitstreams(bitstreams, data_gpios):
+    """
+    Return (masks, data_mask): masks[k] holds the DATA levels of shift step k.
+    """
+    if len(bitstreams) != len(data_gpios):
+        raise ValueError("need one DATA pin per bitstream ({} vs {})".format(len(data_gpios), len(bitstreams)))
+    if not bitstreams:
+        raise ValueError("no bitstreams to program")
+    nbits = bitstreams[0].nbits
+    data_mask = 0
+    for bitstream, gpio in zip(bitstreams, data_gpios):
+        if bitstream.nbits != nbits:
+            raise ValueError(
+                "bitstreams must have equal length for a shared clock ({} vs {})".format(bitstream.nbits, nbits)
+            )
+        if gpio < 0 or gpio > 29:
+            raise ValueError("DATA pin GPIO{} out of range 0..29".format(gpio))
+        if data_mask & (1 << gpio):
+            raise ValueError("DATA pin GPIO{} used twice".format(gpio))
+        data_mask |= 1 << gpio
+
+    masks = array("I", bytes(4 * nbits))
+    for bitstream, gpio in zip(bitstreams, data_gpios):
+        bit = 1 << gpio
+        data = bitstream.data
+        k = 0
+        for i in range(nbits - 1, -1, -1):
+            if (data[i >> 3] >> (i & 7)) & 1:
+                masks[k] |= bit
+            k += 1
+    return masks, data_mask
+
+
+def falling_edge_words(masks, clk_mask):
+    """
+    Turn masks into XOR words in place: word k drops CLK and moves DATA to masks[k].
+
+    The first word carries no CLK bit since CLK starts low.
+    """
+    previous = 0
+    for k in range(len(masks)):
+        current = masks[k]
+        masks[k] = (current ^ previous) | (clk_mask if k else 0)
+        previous = current
+    return masks
+
+
+def program_masks(words, pin_en, clk_gpio, data_mask, plan):
+    """
+    Shift precomputed falling-edge words through the SIO port registers.
+
+    plan (see clock_timing.plan_parallel) gives the sleep_us after each
+    rising (delay_high) and falling (delay_low) edge.
+    """
+    from machine import mem32
+
+    clk_mask = 1 << clk_gpio
+    mem32[GPIO_OUT_CLR] = data_mask | clk_mask
+    pin_en.value(0)
+    _write_words(mem32, words, clk_mask, plan)
+    mem32[GPIO_OUT_CLR] = data_mask | clk_mask
+    pin_en.value(1)
+
+
+def _write_words(mem32, words, clk_mask, plan):
+    if not plan.sleeps:
+        for word in words:
+            mem32[GPIO_OUT_XOR] = word
+            mem32[GPIO_OUT_SET] = clk_mask
+        return
+    sleep_us = time.sleep_us
+    delay_high = plan.delay_high
+    delay_low = plan.delay_low
+    for word in words:
+        mem32[GPIO_OUT_XOR] = word
+        sleep_us(delay_low)
+        mem32[GPIO_OUT_SET] = clk_mask
+        sleep_us(delay_high)
+
+
+def _xor_once(mem32, words):
+    for word in words:
+        mem32[GPIO_OUT_XOR] = word
+
+
+def _xor_twice(mem32, words):
+    for word in words:
+        mem32[GPIO_OUT_XOR] = word
+        mem32[GPIO_OUT_XOR] = word
+
+
+def calibrate_parallel():
+    """
+    Time the port-write loop with all-zero words and masks (no pin moves).
+
+    Returns (bare_bit_ns, sleep_bit_ns, write_ns) like the driver's generic
+    calibration; write_ns is the time between back-to-back port writes.
+    """
+    from machine import mem32
+    from clock_timing import CALIBRATION_BITS, ClockPlan, fastest_us
+
+    words = array("I", bytes(4 * CALIBRATION_BITS))
+    bare_plan = ClockPlan("parallel", 0, 0, 0, 0, 0, None, sleeps=False)
+    sleep_plan = ClockPlan("parallel", 0, 1, 1, 0, 0, None)
+    bare_us, sleep_us, single_us, double_us = fastest_us(
+        (_write_words, (mem32, words, 0, bare_plan)),
+        (_write_words, (mem32, words, 0, sleep_plan)),
+        (_xor_once, (mem32, words)),
+        (_xor_twice, (mem32, words)),
+    )
+    bare_bit_ns = bare_us * 1000 // CALIBRATION_BITS
+    sleep_bit_ns = max(bare_bit_ns, sleep_us * 1000 // CALIBRATION_BITS - 2000)
+    write_ns = max(0, (double_us - single_us) * 1000 // CALIBRATION_BITS)
+    return bare_bit_ns, sleep_bit_ns, write_ns
+
+
+def prepare_parallel(bitstreams, data_gpios, clk_gpio):
+    """
+    Validate the targets and return (words, data_mask) for program_masks.
+    """
+    masks, data_mask = transpose_bitstreams(bitstreams, data_gpios)
+    if data_mask & (1 << clk_gpio):
+        raise ValueError("CLK pin GPIO{} is also used as a DATA pin".format(clk_gpio))
+    return falling_edge_words(masks, 1 << clk_gpio), data_mask
+
+
+def shift_parallel(words, data_mask, data_gpios, pin_en, clk_gpio, plan):
+    if pin_en is None:
+        raise ValueError("GPIO pins are not initialized")
+    from machine import Pin
+
+    for gpio in data_gpios:
+        Pin(gpio, Pin.OUT, value=0)
+    program_masks(words, pin_en, clk_gpio, data_mask, plan)
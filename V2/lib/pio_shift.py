@@ -0,0 +1,166 @@
+"""
+RP2040 PIO shift backend for MOSbiusV2Driver.
+
+A PIO state machine clocks DATA (out pin) and CLK (side-set pin) from its
+TX FIFO at a fixed PIO_CYCLES_PER_BIT cycles per bit, so the clock rate is
+exact and the CPU only feeds words and drives EN around the transfer.
+
+Word stream: [nbits - 1, w0, w1, ...]. Data words hold 32 bits each in
+shift order (last register first), MSB first; the final word is zero
+padded. The program pushes one word to the RX FIFO after the last bit.
+"""
+
+import time
+from array import array
+
+PIO_CYCLES_PER_BIT = 4
+DEFAULT_STATE_MACHINE = 0
+DONE_TIMEOUT_MARGIN_MS = 100
+
+_program = None
+
+
+def pio_available():
+    try:
+        import rp2
+    except ImportError:
+        return False
+    return hasattr(rp2, "StateMachine")
+
+
+def shift_program():
+    """
+    Return the assembled shift program (built once, needs the rp2 module).
+    """
+    global _program
+    if _program is None:
+        import rp2
+
+        @rp2.asm_pio(
+            out_init=rp2.PIO.OUT_LOW,
+            sideset_init=rp2.PIO.OUT_LOW,
+            out_shiftdir=rp2.PIO.SHIFT_LEFT,
+            autopull=True,
+            pull_thresh=32,
+        )
+        def mosbius_shift():
+            pull(block)  # x = bit count - 1
+            out(x, 32)
+            label("bit")
+            out(pins, 1).side(0)[1]  # DATA changes while CLK is low
+            jmp(x_dec, "bit").side(1)[1]  # CLK high: chip samples DATA
+            push(block).side(0)  # done word to the RX FIFO
+
+        _program = mosbius_shift
+    return _program
+
+
+def pack_words(bitstream):
+    """
+    Pack a PackedBitstream into the state machine's word stream.
+    """
+    nbits = bitstream.nbits
+    data = bitstream.data
+    words = array("I", [nbits - 1])
+    acc = 0
+    n = 0
+    for i in range(nbits - 1, -1, -1):
+        acc = (acc << 1) | ((data[i >> 3] >> (i & 7)) & 1)
+        n += 1
+        if n == 32:
+            words.append(acc)
+            acc = 0
+            n = 0
+    if n:
+        words.append(acc << (32 - n))
+    return words
+
+
+def state_machine_freq(t_clk_half_cycle_us, clock_hz=None):
+    """
+    PIO frequency for a CLK rate given as clock_hz, or else as a half-period.
+    """
+    if clock_hz is None:
+        if t_clk_half_cycle_us <= 0:
+            raise ValueError("t_clk_half_cycle_us must be > 0 for the PIO engine")
+        clock_hz = 1000000 / (2 * t_clk_half_cycle_us)
+    if clock_hz <= 0:
+        raise ValueError("pio_clock_hz must be > 0, got {}".format(clock_hz))
+    return int(clock_hz * PIO_CYCLES_PER_BIT + 0.5)
+
+
+def _wait_done(sm, timeout_ms):
+    start = time.ticks_ms()
+    while not sm.rx_fifo():
+        if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+            raise OSError("PIO shift did not finish within {} ms".format(timeout_ms))
+    sm.get()
+
+
+def start_state_machine(pin_en, pin_clk, pin_data, pin_numbers, freq, state_machine=DEFAULT_STATE_MACHINE):
+    """
+    Drive EN low and start the shift program on DATA/CLK; stop it with stop_state_machine.
+    """
+    import rp2
+    from machine import Pin
+
+    if state_machine is None:
+        state_machine = DEFAULT_STATE_MACHINE
+    _, clk_num, data_num = pin_numbers
+    pin_data.value(0)
+    pin_clk.value(0)
+    pin_en.value(0)
+    sm = rp2.StateMachine(
+        state_machine,
+        shift_program(),
+        freq=freq,
+        out_base=Pin(data_num),
+        sideset_base=Pin(clk_num),
+    )
+    sm.active(1)
+    return sm
+
+
+def stop_state_machine(sm, pin_clk, pin_data):
+    from machine import Pin
+
+    sm.active(0)
+    # Hand CLK/DATA back to SIO so the Pin.value()/viper engines keep working.
+    pin_clk.init(Pin.OUT, value=0)
+    pin_data.init(Pin.OUT, value=0)
+
+
+def done_timeout_ms(nbits, freq):
+    return nbits * PIO_CYCLES_PER_BIT * 1000 // freq + DONE_TIMEOUT_MARGIN_MS
+
+
+def program_bitstream_pio(
+    bitstream,
+    pin_en,
+    pin_clk,
+    pin_data,
+    pin_numbers,
+    t_clk_half_cycle_us,
+    clock_hz=None,
+    state_machine=DEFAULT_STATE_MACHINE,
+    freq=None,
+):
+    """
+    Shift through a PIO state machine; freq (a clock plan's sm_freq_hz)
+    overrides the frequency derived from clock_hz or t_clk_half_cycle_us.
+    """
+    if pin_en is None or pin_clk is None or pin_data is None:
+        raise ValueError("GPIO pins are not initialized")
+    if not bitstream.nbits:
+        raise ValueError("Bitstream is empty")
+
+    if freq is None:
+        freq = state_machine_freq(t_clk_half_cycle_us, clock_hz)
+    words = pack_words(bitstream)
+    sm = start_state_machine(pin_en, pin_clk, pin_data, pin_numbers, freq, state_machine)
+    try:
+        sm.put(words)
+        _wait_done(sm, done_timeout_ms(bitstream.nbits, freq))
+    finally:
+        stop_state_machine(sm, pin_clk, pin_data)
+    pin_en.value(1)
@@ -0,0 +1,95 @@
+"""
+Opt-in timing and heap instrumentation for MOSbiusV2Driver.
+
+Each phase records its duration (ticks_us) and heap delta (gc.mem_alloc,
+MicroPython only; None elsewhere). Values are exposed via as_dict() and as
+one compact log line.
+"""
+
+import gc
+import time
+
+
+def ticks_us():
+    """
+    time.ticks_us() on MicroPython, a perf_counter_ns() fallback elsewhere.
+    """
+    if hasattr(time, "ticks_us"):
+        return time.ticks_us()
+    return time.perf_counter_ns() // 1000
+
+
+def ticks_diff(end, start):
+    """
+    Wrap-safe end - start for values from ticks_us().
+    """
+    if hasattr(time, "ticks_diff"):
+        return time.ticks_diff(end, start)
+    return end - start
+
+
+def _mem_alloc():
+    if hasattr(gc, "mem_alloc"):
+        return gc.mem_alloc()
+    return None
+
+
+class ProgramStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.phases = []
+        self.values = {}
+
+    def begin(self):
+        return (ticks_us(), _mem_alloc())
+
+    def end(self, phase, token):
+        start_us, start_mem = token
+        duration_us = ticks_diff(ticks_us(), start_us)
+        end_mem = _mem_alloc()
+        heap_delta = end_mem - start_mem if (end_mem is not None and start_mem is not None) else None
+        self.phases.append((phase, duration_us, heap_delta))
+        return duration_us
+
+    def set(self, key, value):
+        self.values[key] = value
+
+    def phase_us(self, phase):
+        for name, duration_us, _ in self.phases:
+            if name == phase:
+                return duration_us
+        return None
+
+    def record_shift(self, duration_us, nbits, t_clk_half_cycle_us):
+        """
+        Derive achieved rate and effective half-period from a shift phase.
+        """
+        self.values["nbits"] = nbits
+        self.values["t_half_requested_us"] = t_clk_half_cycle_us
+        if duration_us > 0 and nbits:
+            self.values["bits_per_s"] = int(nbits * 1000000 // duration_us)
+            self.values["t_half_effective_us"] = round(duration_us / (2 * nbits), 2)
+
+    def as_dict(self):
+        out = {"phases": {}}
+        total_us = 0
+        for name, duration_us, heap_delta in self.phases:
+            out["phases"][name] = {"us": duration_us, "heap_delta": heap_delta}
+            total_us += duration_us
+        out["total_us"] = total_us
+        for key, value in self.values.items():
+            out[key] = value
+        return out
+
+    def log_line(self):
+        parts = []
+        for name, duration_us, heap_delta in self.phases:
+            if heap_delta is None:
+                parts.append("{}={}us".format(name, duration_us))
+            else:
+                parts.append("{}={}us/{:+d}B".format(name, duration_us, heap_delta))
+        for key in sorted(self.values):
+            parts.append("{}={}".format(key, self.values[key]))
+        return "stats " + " ".join(parts)
@@ -6,8 +6,18 @@ This module computes:
 - sizing register addresses
 
 It replaces large precomputed register map tables at runtime.
+
+The equations are the reference. When the generated `register_table`
+module (see `V2/tools/register_table_generator.py`) is present, switch
+registers are served from its compact table via
+`switch_register_by_index`; otherwise the equations are evaluated.
 """
 
+try:
+    from register_table import SWITCH_REGISTER_TABLE
+except ImportError:
+    SWITCH_REGISTER_TABLE = None
+
 INTERNAL_ROW_TO_INDEX = {
     "internal_A": 24,
     "internal_B": 48,
@@ -44,6 +54,38 @@ SIZING_DEVICE_ORDER = (
 
 _SIZING_INDEX_BY_DEVICE = {name: i for i, name in enumerate(SIZING_DEVICE_ORDER)}
 
+_WEIGHT_TO_BIT_INDEX = {1: 0, 2: 1, 4: 2, 8: 3, 16: 4}
+
+SWITCH_ROWS = 96
+
+# Column order of the switch register table: SBUS1a..SBUS6b, then RBUS1..RBUS8.
+SWITCH_BUS_COLUMNS = (
+    "SBUS1a",
+    "SBUS1b",
+    "SBUS2a",
+    "SBUS2b",
+    "SBUS3a",
+    "SBUS3b",
+    "SBUS4a",
+    "SBUS4b",
+    "SBUS5a",
+    "SBUS5b",
+    "SBUS6a",
+    "SBUS6b",
+    "RBUS1",
+    "RBUS2",
+    "RBUS3",
+    "RBUS4",
+    "RBUS5",
+    "RBUS6",
+    "RBUS7",
+    "RBUS8",
+)
+
+SWITCH_COLUMNS = len(SWITCH_BUS_COLUMNS)
+
+_COLUMN_BY_BUS = {name: i for i, name in enumerate(SWITCH_BUS_COLUMNS)}
+
 
 def _as_int(value, name):
     try:
@@ -140,6 +182,45 @@ def switch_register(sw_pin, bus_name):
     raise ValueError("unknown bus '{}'; expected SBUS* or RBUS*".format(bus_name))
 
 
+def switch_row_key(s):
+    """
+    Inverse of switch_equation_index: return the switch-row key for s (1..96).
+    """
+    s = _as_int(s, "switch index")
+    if not (1 <= s <= SWITCH_ROWS):
+        raise ValueError("switch index out of range 1..96: {}".format(s))
+    bank = (s - 1) // 24
+    slot = ((s - 1) % 24) + 1
+    if slot == 24:
+        return "internal_" + "ABCD"[bank]
+    return bank * 23 + slot
+
+
+def bus_column(bus_name):
+    """
+    Return the switch register table column for SBUS1a..SBUS6b / RBUS1..RBUS8.
+    """
+    if bus_name not in _COLUMN_BY_BUS:
+        raise ValueError("unknown bus '{}'; expected SBUS1a..SBUS6b or RBUS1..RBUS8".format(bus_name))
+    return _COLUMN_BY_BUS[bus_name]
+
+
+def switch_register_by_index(s, column):
+    """
+    Return register for switch index s (1..96) and table column.
+
+    Uses the precompiled table when available (two byte loads); falls back
+    to the equations otherwise. Raises ValueError for RBUS on internal rows.
+    """
+    if SWITCH_REGISTER_TABLE is not None:
+        k = 2 * ((s - 1) * SWITCH_COLUMNS + column)
+        register = SWITCH_REGISTER_TABLE[k] | (SWITCH_REGISTER_TABLE[k + 1] << 8)
+        if register:
+            return register
+        raise ValueError("RBUS is undefined for internal row '{}'".format(switch_row_key(s)))
+    return switch_register(switch_row_key(s), SWITCH_BUS_COLUMNS[column])
+
+
 def sizing_device_index(device_name):
     """
     Return canonical sizing device index (0..23).
@@ -172,10 +253,9 @@ def sizing_register(device_name, bit_weight):
     bit_weight must be one of: 1, 2, 4, 8, 16.
     """
     w = _as_int(bit_weight, "bit_weight")
-    weight_to_bit_index = {1: 0, 2: 1, 4: 2, 8: 3, 16: 4}
-    if w not in weight_to_bit_index:
+    if w not in _WEIGHT_TO_BIT_INDEX:
         raise ValueError("bit_weight must be one of 1,2,4,8,16 (got {})".format(w))
-    return sizing_register_by_index(sizing_device_index(device_name), weight_to_bit_index[w])
+    return sizing_register_by_index(sizing_device_index(device_name), _WEIGHT_TO_BIT_INDEX[w])
 
 
 def sizing_registers_for_device(device_name):
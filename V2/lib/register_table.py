@@ -0,0 +1,133 @@
+"""
+Precompiled switch register table for MOSbius V2.
+
+Generated by V2/tools/register_table_generator.py from the equations in
+register_map_equations.py. Do not edit by hand.
+
+Layout: little-endian uint16 per entry, row-major over switch index
+s = 1..96 and bus column 0..19 (SBUS1a..SBUS6b, RBUS1..RBUS8).
+Entry value 0 marks an undefined combination (RBUS on internal rows).
+"""
+
+SWITCH_REGISTER_TABLE = (
+    b"\x01\x00\x02\x00\x31\x00\x32\x00\x61\x00\x62\x00\x91\x00\x92\x00\xc1\x00\xc2\x00\xf1\x00\xf2\x00\x21\x01\x38\x01\x4f\x01\x66\x01"
+    b"\x7d\x01\x94\x01\xab\x01\xc2\x01\x03\x00\x04\x00\x33\x00\x34\x00\x63\x00\x64\x00\x93\x00\x94\x00\xc3\x00\xc4\x00\xf3\x00\xf4\x00"
+    b"\x22\x01\x39\x01\x50\x01\x67\x01\x7e\x01\x95\x01\xac\x01\xc3\x01\x05\x00\x06\x00\x35\x00\x36\x00\x65\x00\x66\x00\x95\x00\x96\x00"
+    b"\xc5\x00\xc6\x00\xf5\x00\xf6\x00\x23\x01\x3a\x01\x51\x01\x68\x01\x7f\x01\x96\x01\xad\x01\xc4\x01\x07\x00\x08\x00\x37\x00\x38\x00"
+    b"\x67\x00\x68\x00\x97\x00\x98\x00\xc7\x00\xc8\x00\xf7\x00\xf8\x00\x24\x01\x3b\x01\x52\x01\x69\x01\x80\x01\x97\x01\xae\x01\xc5\x01"
+    b"\x09\x00\x0a\x00\x39\x00\x3a\x00\x69\x00\x6a\x00\x99\x00\x9a\x00\xc9\x00\xca\x00\xf9\x00\xfa\x00\x25\x01\x3c\x01\x53\x01\x6a\x01"
+    b"\x81\x01\x98\x01\xaf\x01\xc6\x01\x0b\x00\x0c\x00\x3b\x00\x3c\x00\x6b\x00\x6c\x00\x9b\x00\x9c\x00\xcb\x00\xcc\x00\xfb\x00\xfc\x00"
+    b"\x26\x01\x3d\x01\x54\x01\x6b\x01\x82\x01\x99\x01\xb0\x01\xc7\x01\x0d\x00\x0e\x00\x3d\x00\x3e\x00\x6d\x00\x6e\x00\x9d\x00\x9e\x00"
+    b"\xcd\x00\xce\x00\xfd\x00\xfe\x00\x27\x01\x3e\x01\x55\x01\x6c\x01\x83\x01\x9a\x01\xb1\x01\xc8\x01\x0f\x00\x10\x00\x3f\x00\x40\x00"
+    b"\x6f\x00\x70\x00\x9f\x00\xa0\x00\xcf\x00\xd0\x00\xff\x00\x00\x01\x28\x01\x3f\x01\x56\x01\x6d\x01\x84\x01\x9b\x01\xb2\x01\xc9\x01"
+    b"\x11\x00\x12\x00\x41\x00\x42\x00\x71\x00\x72\x00\xa1\x00\xa2\x00\xd1\x00\xd2\x00\x01\x01\x02\x01\x29\x01\x40\x01\x57\x01\x6e\x01"
+    b"\x85\x01\x9c\x01\xb3\x01\xca\x01\x13\x00\x14\x00\x43\x00\x44\x00\x73\x00\x74\x00\xa3\x00\xa4\x00\xd3\x00\xd4\x00\x03\x01\x04\x01"
+    b"\x2a\x01\x41\x01\x58\x01\x6f\x01\x86\x01\x9d\x01\xb4\x01\xcb\x01\x15\x00\x16\x00\x45\x00\x46\x00\x75\x00\x76\x00\xa5\x00\xa6\x00"
+    b"\xd5\x00\xd6\x00\x05\x01\x06\x01\x2b\x01\x42\x01\x59\x01\x70\x01\x87\x01\x9e\x01\xb5\x01\xcc\x01\x17\x00\x18\x00\x47\x00\x48\x00"
+    b"\x77\x00\x78\x00\xa7\x00\xa8\x00\xd7\x00\xd8\x00\x07\x01\x08\x01\x2c\x01\x43\x01\x5a\x01\x71\x01\x88\x01\x9f\x01\xb6\x01\xcd\x01"
+    b"\x19\x00\x1a\x00\x49\x00\x4a\x00\x79\x00\x7a\x00\xa9\x00\xaa\x00\xd9\x00\xda\x00\x09\x01\x0a\x01\x2d\x01\x44\x01\x5b\x01\x72\x01"
+    b"\x89\x01\xa0\x01\xb7\x01\xce\x01\x1b\x00\x1c\x00\x4b\x00\x4c\x00\x7b\x00\x7c\x00\xab\x00\xac\x00\xdb\x00\xdc\x00\x0b\x01\x0c\x01"
+    b"\x2e\x01\x45\x01\x5c\x01\x73\x01\x8a\x01\xa1\x01\xb8\x01\xcf\x01\x1d\x00\x1e\x00\x4d\x00\x4e\x00\x7d\x00\x7e\x00\xad\x00\xae\x00"
+    b"\xdd\x00\xde\x00\x0d\x01\x0e\x01\x2f\x01\x46\x01\x5d\x01\x74\x01\x8b\x01\xa2\x01\xb9\x01\xd0\x01\x1f\x00\x20\x00\x4f\x00\x50\x00"
+    b"\x7f\x00\x80\x00\xaf\x00\xb0\x00\xdf\x00\xe0\x00\x0f\x01\x10\x01\x30\x01\x47\x01\x5e\x01\x75\x01\x8c\x01\xa3\x01\xba\x01\xd1\x01"
+    b"\x21\x00\x22\x00\x51\x00\x52\x00\x81\x00\x82\x00\xb1\x00\xb2\x00\xe1\x00\xe2\x00\x11\x01\x12\x01\x31\x01\x48\x01\x5f\x01\x76\x01"
+    b"\x8d\x01\xa4\x01\xbb\x01\xd2\x01\x23\x00\x24\x00\x53\x00\x54\x00\x83\x00\x84\x00\xb3\x00\xb4\x00\xe3\x00\xe4\x00\x13\x01\x14\x01"
+    b"\x32\x01\x49\x01\x60\x01\x77\x01\x8e\x01\xa5\x01\xbc\x01\xd3\x01\x25\x00\x26\x00\x55\x00\x56\x00\x85\x00\x86\x00\xb5\x00\xb6\x00"
+    b"\xe5\x00\xe6\x00\x15\x01\x16\x01\x33\x01\x4a\x01\x61\x01\x78\x01\x8f\x01\xa6\x01\xbd\x01\xd4\x01\x27\x00\x28\x00\x57\x00\x58\x00"
+    b"\x87\x00\x88\x00\xb7\x00\xb8\x00\xe7\x00\xe8\x00\x17\x01\x18\x01\x34\x01\x4b\x01\x62\x01\x79\x01\x90\x01\xa7\x01\xbe\x01\xd5\x01"
+    b"\x29\x00\x2a\x00\x59\x00\x5a\x00\x89\x00\x8a\x00\xb9\x00\xba\x00\xe9\x00\xea\x00\x19\x01\x1a\x01\x35\x01\x4c\x01\x63\x01\x7a\x01"
+    b"\x91\x01\xa8\x01\xbf\x01\xd6\x01\x2b\x00\x2c\x00\x5b\x00\x5c\x00\x8b\x00\x8c\x00\xbb\x00\xbc\x00\xeb\x00\xec\x00\x1b\x01\x1c\x01"
+    b"\x36\x01\x4d\x01\x64\x01\x7b\x01\x92\x01\xa9\x01\xc0\x01\xd7\x01\x2d\x00\x2e\x00\x5d\x00\x5e\x00\x8d\x00\x8e\x00\xbd\x00\xbe\x00"
+    b"\xed\x00\xee\x00\x1d\x01\x1e\x01\x37\x01\x4e\x01\x65\x01\x7c\x01\x93\x01\xaa\x01\xc1\x01\xd8\x01\x2f\x00\x30\x00\x5f\x00\x60\x00"
+    b"\x8f\x00\x90\x00\xbf\x00\xc0\x00\xef\x00\xf0\x00\x1f\x01\x20\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\xd9\x01\xda\x01\x09\x02\x0a\x02\x39\x02\x3a\x02\x69\x02\x6a\x02\x99\x02\x9a\x02\xc9\x02\xca\x02\xf9\x02\x10\x03\x27\x03\x3e\x03"
+    b"\x55\x03\x6c\x03\x83\x03\x9a\x03\xdb\x01\xdc\x01\x0b\x02\x0c\x02\x3b\x02\x3c\x02\x6b\x02\x6c\x02\x9b\x02\x9c\x02\xcb\x02\xcc\x02"
+    b"\xfa\x02\x11\x03\x28\x03\x3f\x03\x56\x03\x6d\x03\x84\x03\x9b\x03\xdd\x01\xde\x01\x0d\x02\x0e\x02\x3d\x02\x3e\x02\x6d\x02\x6e\x02"
+    b"\x9d\x02\x9e\x02\xcd\x02\xce\x02\xfb\x02\x12\x03\x29\x03\x40\x03\x57\x03\x6e\x03\x85\x03\x9c\x03\xdf\x01\xe0\x01\x0f\x02\x10\x02"
+    b"\x3f\x02\x40\x02\x6f\x02\x70\x02\x9f\x02\xa0\x02\xcf\x02\xd0\x02\xfc\x02\x13\x03\x2a\x03\x41\x03\x58\x03\x6f\x03\x86\x03\x9d\x03"
+    b"\xe1\x01\xe2\x01\x11\x02\x12\x02\x41\x02\x42\x02\x71\x02\x72\x02\xa1\x02\xa2\x02\xd1\x02\xd2\x02\xfd\x02\x14\x03\x2b\x03\x42\x03"
+    b"\x59\x03\x70\x03\x87\x03\x9e\x03\xe3\x01\xe4\x01\x13\x02\x14\x02\x43\x02\x44\x02\x73\x02\x74\x02\xa3\x02\xa4\x02\xd3\x02\xd4\x02"
+    b"\xfe\x02\x15\x03\x2c\x03\x43\x03\x5a\x03\x71\x03\x88\x03\x9f\x03\xe5\x01\xe6\x01\x15\x02\x16\x02\x45\x02\x46\x02\x75\x02\x76\x02"
+    b"\xa5\x02\xa6\x02\xd5\x02\xd6\x02\xff\x02\x16\x03\x2d\x03\x44\x03\x5b\x03\x72\x03\x89\x03\xa0\x03\xe7\x01\xe8\x01\x17\x02\x18\x02"
+    b"\x47\x02\x48\x02\x77\x02\x78\x02\xa7\x02\xa8\x02\xd7\x02\xd8\x02\x00\x03\x17\x03\x2e\x03\x45\x03\x5c\x03\x73\x03\x8a\x03\xa1\x03"
+    b"\xe9\x01\xea\x01\x19\x02\x1a\x02\x49\x02\x4a\x02\x79\x02\x7a\x02\xa9\x02\xaa\x02\xd9\x02\xda\x02\x01\x03\x18\x03\x2f\x03\x46\x03"
+    b"\x5d\x03\x74\x03\x8b\x03\xa2\x03\xeb\x01\xec\x01\x1b\x02\x1c\x02\x4b\x02\x4c\x02\x7b\x02\x7c\x02\xab\x02\xac\x02\xdb\x02\xdc\x02"
+    b"\x02\x03\x19\x03\x30\x03\x47\x03\x5e\x03\x75\x03\x8c\x03\xa3\x03\xed\x01\xee\x01\x1d\x02\x1e\x02\x4d\x02\x4e\x02\x7d\x02\x7e\x02"
+    b"\xad\x02\xae\x02\xdd\x02\xde\x02\x03\x03\x1a\x03\x31\x03\x48\x03\x5f\x03\x76\x03\x8d\x03\xa4\x03\xef\x01\xf0\x01\x1f\x02\x20\x02"
+    b"\x4f\x02\x50\x02\x7f\x02\x80\x02\xaf\x02\xb0\x02\xdf\x02\xe0\x02\x04\x03\x1b\x03\x32\x03\x49\x03\x60\x03\x77\x03\x8e\x03\xa5\x03"
+    b"\xf1\x01\xf2\x01\x21\x02\x22\x02\x51\x02\x52\x02\x81\x02\x82\x02\xb1\x02\xb2\x02\xe1\x02\xe2\x02\x05\x03\x1c\x03\x33\x03\x4a\x03"
+    b"\x61\x03\x78\x03\x8f\x03\xa6\x03\xf3\x01\xf4\x01\x23\x02\x24\x02\x53\x02\x54\x02\x83\x02\x84\x02\xb3\x02\xb4\x02\xe3\x02\xe4\x02"
+    b"\x06\x03\x1d\x03\x34\x03\x4b\x03\x62\x03\x79\x03\x90\x03\xa7\x03\xf5\x01\xf6\x01\x25\x02\x26\x02\x55\x02\x56\x02\x85\x02\x86\x02"
+    b"\xb5\x02\xb6\x02\xe5\x02\xe6\x02\x07\x03\x1e\x03\x35\x03\x4c\x03\x63\x03\x7a\x03\x91\x03\xa8\x03\xf7\x01\xf8\x01\x27\x02\x28\x02"
+    b"\x57\x02\x58\x02\x87\x02\x88\x02\xb7\x02\xb8\x02\xe7\x02\xe8\x02\x08\x03\x1f\x03\x36\x03\x4d\x03\x64\x03\x7b\x03\x92\x03\xa9\x03"
+    b"\xf9\x01\xfa\x01\x29\x02\x2a\x02\x59\x02\x5a\x02\x89\x02\x8a\x02\xb9\x02\xba\x02\xe9\x02\xea\x02\x09\x03\x20\x03\x37\x03\x4e\x03"
+    b"\x65\x03\x7c\x03\x93\x03\xaa\x03\xfb\x01\xfc\x01\x2b\x02\x2c\x02\x5b\x02\x5c\x02\x8b\x02\x8c\x02\xbb\x02\xbc\x02\xeb\x02\xec\x02"
+    b"\x0a\x03\x21\x03\x38\x03\x4f\x03\x66\x03\x7d\x03\x94\x03\xab\x03\xfd\x01\xfe\x01\x2d\x02\x2e\x02\x5d\x02\x5e\x02\x8d\x02\x8e\x02"
+    b"\xbd\x02\xbe\x02\xed\x02\xee\x02\x0b\x03\x22\x03\x39\x03\x50\x03\x67\x03\x7e\x03\x95\x03\xac\x03\xff\x01\x00\x02\x2f\x02\x30\x02"
+    b"\x5f\x02\x60\x02\x8f\x02\x90\x02\xbf\x02\xc0\x02\xef\x02\xf0\x02\x0c\x03\x23\x03\x3a\x03\x51\x03\x68\x03\x7f\x03\x96\x03\xad\x03"
+    b"\x01\x02\x02\x02\x31\x02\x32\x02\x61\x02\x62\x02\x91\x02\x92\x02\xc1\x02\xc2\x02\xf1\x02\xf2\x02\x0d\x03\x24\x03\x3b\x03\x52\x03"
+    b"\x69\x03\x80\x03\x97\x03\xae\x03\x03\x02\x04\x02\x33\x02\x34\x02\x63\x02\x64\x02\x93\x02\x94\x02\xc3\x02\xc4\x02\xf3\x02\xf4\x02"
+    b"\x0e\x03\x25\x03\x3c\x03\x53\x03\x6a\x03\x81\x03\x98\x03\xaf\x03\x05\x02\x06\x02\x35\x02\x36\x02\x65\x02\x66\x02\x95\x02\x96\x02"
+    b"\xc5\x02\xc6\x02\xf5\x02\xf6\x02\x0f\x03\x26\x03\x3d\x03\x54\x03\x6b\x03\x82\x03\x99\x03\xb0\x03\x07\x02\x08\x02\x37\x02\x38\x02"
+    b"\x67\x02\x68\x02\x97\x02\x98\x02\xc7\x02\xc8\x02\xf7\x02\xf8\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\xb1\x03\xb2\x03\xe1\x03\xe2\x03\x11\x04\x12\x04\x41\x04\x42\x04\x71\x04\x72\x04\xa1\x04\xa2\x04\xd1\x04\xe8\x04\xff\x04\x16\x05"
+    b"\x2d\x05\x44\x05\x5b\x05\x72\x05\xb3\x03\xb4\x03\xe3\x03\xe4\x03\x13\x04\x14\x04\x43\x04\x44\x04\x73\x04\x74\x04\xa3\x04\xa4\x04"
+    b"\xd2\x04\xe9\x04\x00\x05\x17\x05\x2e\x05\x45\x05\x5c\x05\x73\x05\xb5\x03\xb6\x03\xe5\x03\xe6\x03\x15\x04\x16\x04\x45\x04\x46\x04"
+    b"\x75\x04\x76\x04\xa5\x04\xa6\x04\xd3\x04\xea\x04\x01\x05\x18\x05\x2f\x05\x46\x05\x5d\x05\x74\x05\xb7\x03\xb8\x03\xe7\x03\xe8\x03"
+    b"\x17\x04\x18\x04\x47\x04\x48\x04\x77\x04\x78\x04\xa7\x04\xa8\x04\xd4\x04\xeb\x04\x02\x05\x19\x05\x30\x05\x47\x05\x5e\x05\x75\x05"
+    b"\xb9\x03\xba\x03\xe9\x03\xea\x03\x19\x04\x1a\x04\x49\x04\x4a\x04\x79\x04\x7a\x04\xa9\x04\xaa\x04\xd5\x04\xec\x04\x03\x05\x1a\x05"
+    b"\x31\x05\x48\x05\x5f\x05\x76\x05\xbb\x03\xbc\x03\xeb\x03\xec\x03\x1b\x04\x1c\x04\x4b\x04\x4c\x04\x7b\x04\x7c\x04\xab\x04\xac\x04"
+    b"\xd6\x04\xed\x04\x04\x05\x1b\x05\x32\x05\x49\x05\x60\x05\x77\x05\xbd\x03\xbe\x03\xed\x03\xee\x03\x1d\x04\x1e\x04\x4d\x04\x4e\x04"
+    b"\x7d\x04\x7e\x04\xad\x04\xae\x04\xd7\x04\xee\x04\x05\x05\x1c\x05\x33\x05\x4a\x05\x61\x05\x78\x05\xbf\x03\xc0\x03\xef\x03\xf0\x03"
+    b"\x1f\x04\x20\x04\x4f\x04\x50\x04\x7f\x04\x80\x04\xaf\x04\xb0\x04\xd8\x04\xef\x04\x06\x05\x1d\x05\x34\x05\x4b\x05\x62\x05\x79\x05"
+    b"\xc1\x03\xc2\x03\xf1\x03\xf2\x03\x21\x04\x22\x04\x51\x04\x52\x04\x81\x04\x82\x04\xb1\x04\xb2\x04\xd9\x04\xf0\x04\x07\x05\x1e\x05"
+    b"\x35\x05\x4c\x05\x63\x05\x7a\x05\xc3\x03\xc4\x03\xf3\x03\xf4\x03\x23\x04\x24\x04\x53\x04\x54\x04\x83\x04\x84\x04\xb3\x04\xb4\x04"
+    b"\xda\x04\xf1\x04\x08\x05\x1f\x05\x36\x05\x4d\x05\x64\x05\x7b\x05\xc5\x03\xc6\x03\xf5\x03\xf6\x03\x25\x04\x26\x04\x55\x04\x56\x04"
+    b"\x85\x04\x86\x04\xb5\x04\xb6\x04\xdb\x04\xf2\x04\x09\x05\x20\x05\x37\x05\x4e\x05\x65\x05\x7c\x05\xc7\x03\xc8\x03\xf7\x03\xf8\x03"
+    b"\x27\x04\x28\x04\x57\x04\x58\x04\x87\x04\x88\x04\xb7\x04\xb8\x04\xdc\x04\xf3\x04\x0a\x05\x21\x05\x38\x05\x4f\x05\x66\x05\x7d\x05"
+    b"\xc9\x03\xca\x03\xf9\x03\xfa\x03\x29\x04\x2a\x04\x59\x04\x5a\x04\x89\x04\x8a\x04\xb9\x04\xba\x04\xdd\x04\xf4\x04\x0b\x05\x22\x05"
+    b"\x39\x05\x50\x05\x67\x05\x7e\x05\xcb\x03\xcc\x03\xfb\x03\xfc\x03\x2b\x04\x2c\x04\x5b\x04\x5c\x04\x8b\x04\x8c\x04\xbb\x04\xbc\x04"
+    b"\xde\x04\xf5\x04\x0c\x05\x23\x05\x3a\x05\x51\x05\x68\x05\x7f\x05\xcd\x03\xce\x03\xfd\x03\xfe\x03\x2d\x04\x2e\x04\x5d\x04\x5e\x04"
+    b"\x8d\x04\x8e\x04\xbd\x04\xbe\x04\xdf\x04\xf6\x04\x0d\x05\x24\x05\x3b\x05\x52\x05\x69\x05\x80\x05\xcf\x03\xd0\x03\xff\x03\x00\x04"
+    b"\x2f\x04\x30\x04\x5f\x04\x60\x04\x8f\x04\x90\x04\xbf\x04\xc0\x04\xe0\x04\xf7\x04\x0e\x05\x25\x05\x3c\x05\x53\x05\x6a\x05\x81\x05"
+    b"\xd1\x03\xd2\x03\x01\x04\x02\x04\x31\x04\x32\x04\x61\x04\x62\x04\x91\x04\x92\x04\xc1\x04\xc2\x04\xe1\x04\xf8\x04\x0f\x05\x26\x05"
+    b"\x3d\x05\x54\x05\x6b\x05\x82\x05\xd3\x03\xd4\x03\x03\x04\x04\x04\x33\x04\x34\x04\x63\x04\x64\x04\x93\x04\x94\x04\xc3\x04\xc4\x04"
+    b"\xe2\x04\xf9\x04\x10\x05\x27\x05\x3e\x05\x55\x05\x6c\x05\x83\x05\xd5\x03\xd6\x03\x05\x04\x06\x04\x35\x04\x36\x04\x65\x04\x66\x04"
+    b"\x95\x04\x96\x04\xc5\x04\xc6\x04\xe3\x04\xfa\x04\x11\x05\x28\x05\x3f\x05\x56\x05\x6d\x05\x84\x05\xd7\x03\xd8\x03\x07\x04\x08\x04"
+    b"\x37\x04\x38\x04\x67\x04\x68\x04\x97\x04\x98\x04\xc7\x04\xc8\x04\xe4\x04\xfb\x04\x12\x05\x29\x05\x40\x05\x57\x05\x6e\x05\x85\x05"
+    b"\xd9\x03\xda\x03\x09\x04\x0a\x04\x39\x04\x3a\x04\x69\x04\x6a\x04\x99\x04\x9a\x04\xc9\x04\xca\x04\xe5\x04\xfc\x04\x13\x05\x2a\x05"
+    b"\x41\x05\x58\x05\x6f\x05\x86\x05\xdb\x03\xdc\x03\x0b\x04\x0c\x04\x3b\x04\x3c\x04\x6b\x04\x6c\x04\x9b\x04\x9c\x04\xcb\x04\xcc\x04"
+    b"\xe6\x04\xfd\x04\x14\x05\x2b\x05\x42\x05\x59\x05\x70\x05\x87\x05\xdd\x03\xde\x03\x0d\x04\x0e\x04\x3d\x04\x3e\x04\x6d\x04\x6e\x04"
+    b"\x9d\x04\x9e\x04\xcd\x04\xce\x04\xe7\x04\xfe\x04\x15\x05\x2c\x05\x43\x05\x5a\x05\x71\x05\x88\x05\xdf\x03\xe0\x03\x0f\x04\x10\x04"
+    b"\x3f\x04\x40\x04\x6f\x04\x70\x04\x9f\x04\xa0\x04\xcf\x04\xd0\x04\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x89\x05\x8a\x05\xb9\x05\xba\x05\xe9\x05\xea\x05\x19\x06\x1a\x06\x49\x06\x4a\x06\x79\x06\x7a\x06\xa9\x06\xc0\x06\xd7\x06\xee\x06"
+    b"\x05\x07\x1c\x07\x33\x07\x4a\x07\x8b\x05\x8c\x05\xbb\x05\xbc\x05\xeb\x05\xec\x05\x1b\x06\x1c\x06\x4b\x06\x4c\x06\x7b\x06\x7c\x06"
+    b"\xaa\x06\xc1\x06\xd8\x06\xef\x06\x06\x07\x1d\x07\x34\x07\x4b\x07\x8d\x05\x8e\x05\xbd\x05\xbe\x05\xed\x05\xee\x05\x1d\x06\x1e\x06"
+    b"\x4d\x06\x4e\x06\x7d\x06\x7e\x06\xab\x06\xc2\x06\xd9\x06\xf0\x06\x07\x07\x1e\x07\x35\x07\x4c\x07\x8f\x05\x90\x05\xbf\x05\xc0\x05"
+    b"\xef\x05\xf0\x05\x1f\x06\x20\x06\x4f\x06\x50\x06\x7f\x06\x80\x06\xac\x06\xc3\x06\xda\x06\xf1\x06\x08\x07\x1f\x07\x36\x07\x4d\x07"
+    b"\x91\x05\x92\x05\xc1\x05\xc2\x05\xf1\x05\xf2\x05\x21\x06\x22\x06\x51\x06\x52\x06\x81\x06\x82\x06\xad\x06\xc4\x06\xdb\x06\xf2\x06"
+    b"\x09\x07\x20\x07\x37\x07\x4e\x07\x93\x05\x94\x05\xc3\x05\xc4\x05\xf3\x05\xf4\x05\x23\x06\x24\x06\x53\x06\x54\x06\x83\x06\x84\x06"
+    b"\xae\x06\xc5\x06\xdc\x06\xf3\x06\x0a\x07\x21\x07\x38\x07\x4f\x07\x95\x05\x96\x05\xc5\x05\xc6\x05\xf5\x05\xf6\x05\x25\x06\x26\x06"
+    b"\x55\x06\x56\x06\x85\x06\x86\x06\xaf\x06\xc6\x06\xdd\x06\xf4\x06\x0b\x07\x22\x07\x39\x07\x50\x07\x97\x05\x98\x05\xc7\x05\xc8\x05"
+    b"\xf7\x05\xf8\x05\x27\x06\x28\x06\x57\x06\x58\x06\x87\x06\x88\x06\xb0\x06\xc7\x06\xde\x06\xf5\x06\x0c\x07\x23\x07\x3a\x07\x51\x07"
+    b"\x99\x05\x9a\x05\xc9\x05\xca\x05\xf9\x05\xfa\x05\x29\x06\x2a\x06\x59\x06\x5a\x06\x89\x06\x8a\x06\xb1\x06\xc8\x06\xdf\x06\xf6\x06"
+    b"\x0d\x07\x24\x07\x3b\x07\x52\x07\x9b\x05\x9c\x05\xcb\x05\xcc\x05\xfb\x05\xfc\x05\x2b\x06\x2c\x06\x5b\x06\x5c\x06\x8b\x06\x8c\x06"
+    b"\xb2\x06\xc9\x06\xe0\x06\xf7\x06\x0e\x07\x25\x07\x3c\x07\x53\x07\x9d\x05\x9e\x05\xcd\x05\xce\x05\xfd\x05\xfe\x05\x2d\x06\x2e\x06"
+    b"\x5d\x06\x5e\x06\x8d\x06\x8e\x06\xb3\x06\xca\x06\xe1\x06\xf8\x06\x0f\x07\x26\x07\x3d\x07\x54\x07\x9f\x05\xa0\x05\xcf\x05\xd0\x05"
+    b"\xff\x05\x00\x06\x2f\x06\x30\x06\x5f\x06\x60\x06\x8f\x06\x90\x06\xb4\x06\xcb\x06\xe2\x06\xf9\x06\x10\x07\x27\x07\x3e\x07\x55\x07"
+    b"\xa1\x05\xa2\x05\xd1\x05\xd2\x05\x01\x06\x02\x06\x31\x06\x32\x06\x61\x06\x62\x06\x91\x06\x92\x06\xb5\x06\xcc\x06\xe3\x06\xfa\x06"
+    b"\x11\x07\x28\x07\x3f\x07\x56\x07\xa3\x05\xa4\x05\xd3\x05\xd4\x05\x03\x06\x04\x06\x33\x06\x34\x06\x63\x06\x64\x06\x93\x06\x94\x06"
+    b"\xb6\x06\xcd\x06\xe4\x06\xfb\x06\x12\x07\x29\x07\x40\x07\x57\x07\xa5\x05\xa6\x05\xd5\x05\xd6\x05\x05\x06\x06\x06\x35\x06\x36\x06"
+    b"\x65\x06\x66\x06\x95\x06\x96\x06\xb7\x06\xce\x06\xe5\x06\xfc\x06\x13\x07\x2a\x07\x41\x07\x58\x07\xa7\x05\xa8\x05\xd7\x05\xd8\x05"
+    b"\x07\x06\x08\x06\x37\x06\x38\x06\x67\x06\x68\x06\x97\x06\x98\x06\xb8\x06\xcf\x06\xe6\x06\xfd\x06\x14\x07\x2b\x07\x42\x07\x59\x07"
+    b"\xa9\x05\xaa\x05\xd9\x05\xda\x05\x09\x06\x0a\x06\x39\x06\x3a\x06\x69\x06\x6a\x06\x99\x06\x9a\x06\xb9\x06\xd0\x06\xe7\x06\xfe\x06"
+    b"\x15\x07\x2c\x07\x43\x07\x5a\x07\xab\x05\xac\x05\xdb\x05\xdc\x05\x0b\x06\x0c\x06\x3b\x06\x3c\x06\x6b\x06\x6c\x06\x9b\x06\x9c\x06"
+    b"\xba\x06\xd1\x06\xe8\x06\xff\x06\x16\x07\x2d\x07\x44\x07\x5b\x07\xad\x05\xae\x05\xdd\x05\xde\x05\x0d\x06\x0e\x06\x3d\x06\x3e\x06"
+    b"\x6d\x06\x6e\x06\x9d\x06\x9e\x06\xbb\x06\xd2\x06\xe9\x06\x00\x07\x17\x07\x2e\x07\x45\x07\x5c\x07\xaf\x05\xb0\x05\xdf\x05\xe0\x05"
+    b"\x0f\x06\x10\x06\x3f\x06\x40\x06\x6f\x06\x70\x06\x9f\x06\xa0\x06\xbc\x06\xd3\x06\xea\x06\x01\x07\x18\x07\x2f\x07\x46\x07\x5d\x07"
+    b"\xb1\x05\xb2\x05\xe1\x05\xe2\x05\x11\x06\x12\x06\x41\x06\x42\x06\x71\x06\x72\x06\xa1\x06\xa2\x06\xbd\x06\xd4\x06\xeb\x06\x02\x07"
+    b"\x19\x07\x30\x07\x47\x07\x5e\x07\xb3\x05\xb4\x05\xe3\x05\xe4\x05\x13\x06\x14\x06\x43\x06\x44\x06\x73\x06\x74\x06\xa3\x06\xa4\x06"
+    b"\xbe\x06\xd5\x06\xec\x06\x03\x07\x1a\x07\x31\x07\x48\x07\x5f\x07\xb5\x05\xb6\x05\xe5\x05\xe6\x05\x15\x06\x16\x06\x45\x06\x46\x06"
+    b"\x75\x06\x76\x06\xa5\x06\xa6\x06\xbf\x06\xd6\x06\xed\x06\x04\x07\x1b\x07\x32\x07\x49\x07\x60\x07\xb7\x05\xb8\x05\xe7\x05\xe8\x05"
+    b"\x17\x06\x18\x06\x47\x06\x48\x06\x77\x06\x78\x06\xa7\x06\xa8\x06\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+)
@@ -0,0 +1,156 @@
+"""
+Sizing sweeps over one base circuit.
+
+    grid = [("CC_N", range(32)), ("OTA_P", (4, 8, 16))]
+    for sizes, bitstream in sweep_bitstreams(config, pin_map, grid):
+        driver.program_bitstream(bitstream)
+
+The base (a config dict, or a PackedBitstream such as Circuit.bitstream())
+is compiled once. Sizes live in one contiguous block (registers 1889..2008,
+device d at bits 5d..5d+4 of it), so each grid point only rewrites the
+5-bit fields of the devices that changed since the previous point, in place;
+switch registers are never recomputed. Grid points follow the grid order
+with the last device varying fastest, so most steps patch one or two bytes.
+"""
+
+import register_map_equations as reg_eq
+from packed_bitstream import EXPECTED_BITS, PackedBitstream
+
+SIZING_FIRST_BIT = reg_eq.sizing_register_by_index(0, 0) - 1
+SIZING_FIRST_BYTE = SIZING_FIRST_BIT >> 3
+SIZING_BYTES = (5 * len(reg_eq.SIZING_DEVICE_ORDER) + 7) >> 3
+NBYTES = (EXPECTED_BITS + 7) >> 3
+if SIZING_FIRST_BIT & 7 or SIZING_FIRST_BYTE + SIZING_BYTES != NBYTES:
+    raise ImportError("sizing registers are not the byte-aligned tail of the bitstream")
+
+
+def normalize_grid(grid):
+    """
+    Return [(device_index, device, values)] for a sweep grid.
+
+    grid is a list of (device, values) pairs or a dict (in its iteration
+    order); values is any iterable of sizes 0..31, e.g. range(0, 32, 4).
+    """
+    from config_validation import normalize_size_value
+
+    items = grid.items() if isinstance(grid, dict) else grid
+    out = []
+    seen = set()
+    for device, values in items:
+        device_index = reg_eq.sizing_device_index(device)
+        if device_index in seen:
+            raise ValueError("sizing sweep lists device '{}' twice".format(device))
+        seen.add(device_index)
+        values = tuple(normalize_size_value(device, value) for value in values)
+        if not values:
+            raise ValueError("sizing sweep for '{}' has no values".format(device))
+        out.append((device_index, device, values))
+    return out
+
+
+def sweep_count(grid):
+    count = 1
+    for _, _, values in normalize_grid(grid):
+        count *= len(values)
+    return count
+
+
+def patch_size(data, device_index, value):
+    """
+    Write one device's 5-bit size into packed bitstream bytes in place.
+    """
+    bit = SIZING_FIRST_BIT + 5 * device_index
+    byte = bit >> 3
+    shift = bit & 7
+    mask = 0x1F << shift
+    if shift <= 3:
+        data[byte] = (data[byte] & ~mask & 0xFF) | (value << shift)
+        return
+    window = (data[byte] | (data[byte + 1] << 8)) & ~mask
+    window |= value << shift
+    data[byte] = window & 0xFF
+    data[byte + 1] = window >> 8
+
+
+def base_bitstream(base, pin_to_sw_matrix=None):
+    """
+    Return a private PackedBitstream for a config dict or an existing bitstream.
+    """
+    if isinstance(base, PackedBitstream):
+        if base.nbits != EXPECTED_BITS:
+            raise ValueError("base bitstream has {} bits, expected {}".format(base.nbits, EXPECTED_BITS))
+        return base.copy()
+    if pin_to_sw_matrix is None:
+        raise ValueError("a pin map is required to compile a base config")
+    from bitstream_builder import compile_config
+
+    return compile_config(base, pin_to_sw_matrix, track_sources=True)
+
+
+def _sweep(data, grid):
+    # Patch data for each point and yield the point's values tuple.
+    # Only devices whose value changed since the previous point are rewritten.
+    devices = [device_index for device_index, _, _ in grid]
+    values = [v for _, _, v in grid]
+    n = len(grid)
+    position = [0] * n
+    point = [v[0] for v in values]
+    for i in range(n):
+        patch_size(data, devices[i], point[i])
+    while True:
+        yield tuple(point)
+        i = n - 1
+        while i >= 0:
+            position[i] += 1
+            if position[i] < len(values[i]):
+                break
+            position[i] = 0
+            point[i] = values[i][0]
+            patch_size(data, devices[i], point[i])
+            i -= 1
+        if i < 0:
+            return
+        point[i] = values[i][position[i]]
+        patch_size(data, devices[i], point[i])
+
+
+def sweep_bitstreams(base, pin_to_sw_matrix, grid, copy=False):
+    """
+    Yield (sizes, bitstream) for every grid point; sizes is a values tuple in grid order.
+
+    The same PackedBitstream is patched and yielded each time, so consume it
+    (program, hash, write) before advancing; copy=True yields copies instead.
+    """
+    grid = normalize_grid(grid)
+    bitstream = base_bitstream(base, pin_to_sw_matrix)
+    for sizes in _sweep(bitstream.data, grid):
+        yield sizes, bitstream.copy() if copy else bitstream
+
+
+def sweep_batches(base, pin_to_sw_matrix, grid, batch_size=256):
+    """
+    Yield (points, rows) with up to batch_size points per batch.
+
+    rows is a bytearray of len(points) * 251 bytes: each point's packed
+    bitstream back to back, in PackedBitstream byte order (the layout of
+    batch_builder --packed). The buffer is reused, so copy it to keep it.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1, got {}".format(batch_size))
+    grid = normalize_grid(grid)
+    data = base_bitstream(base, pin_to_sw_matrix).data
+    # The switch bytes are the same in every row: fill them once, then copy
+    # only the sizing bytes per point.
+    rows = bytearray(bytes(data) * batch_size)
+    view = memoryview(rows)
+    sizing = memoryview(data)[SIZING_FIRST_BYTE:]
+    points = []
+    for sizes in _sweep(data, grid):
+        offset = len(points) * NBYTES + SIZING_FIRST_BYTE
+        view[offset : offset + SIZING_BYTES] = sizing
+        points.append(sizes)
+        if len(points) == batch_size:
+            yield points, rows
+            points = []
+    if points:
+        yield points, rows[: len(points) * NBYTES]
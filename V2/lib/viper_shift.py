@@ -0,0 +1,45 @@
+"""
+RP2040 viper shift loops writing SIO GPIO_OUT_SET / GPIO_OUT_CLR directly.
+
+Kept in its own module: on ports without the native emitter the viper
+decorator is a compile-time error, and fast_shift imports this lazily so
+that failure only disables the fast engine.
+"""
+
+import micropython
+
+
+@micropython.viper
+def spin(count: int):
+    n = count
+    while n > 0:
+        n -= 1
+
+
+@micropython.viper
+def shift_packed(data: ptr8, nbits: int, clk_mask: int, data_mask: int, spins: int):
+    # SIO base 0xd0000000; word 5 = GPIO_OUT_SET (0x014), word 6 = GPIO_OUT_CLR (0x018).
+    sio = ptr32(0xD0000000)
+    # DATA changes right after CLK falls, so it has the whole low phase to settle
+    # before the next rising edge (as in pio_shift and parallel_shift).
+    i = nbits - 1
+    if i >= 0:
+        if (data[i >> 3] >> (i & 7)) & 1:
+            sio[5] = data_mask
+        else:
+            sio[6] = data_mask
+    while i >= 0:
+        n = spins
+        while n > 0:
+            n -= 1
+        sio[5] = clk_mask
+        n = spins
+        while n > 0:
+            n -= 1
+        sio[6] = clk_mask
+        i -= 1
+        if i >= 0:
+            if (data[i >> 3] >> (i & 7)) & 1:
+                sio[5] = data_mask
+            else:
+                sio[6] = data_mask
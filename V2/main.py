@@ -47,7 +47,27 @@ PIN_EN = 18
 PIN_CLK = 17
 PIN_DATA = 16
 T_CLK_HALF_CYCLE_US = 10
-CONFIG_FILE = "config.json"
+CLOCK_MODE = "fixed"  # "fixed" targets T_CLK_HALF_CYCLE_US; "fastest" runs as fast as MIN_HALF_CYCLE_NS allows.
+MIN_HALF_CYCLE_NS = 500  # Shortest CLK high/low phase the chip tolerates (used by "fastest").
+CONFIG_FILE = "config.json"  # Or a list for daisy-chained chips, first = chip nearest DATA.
+FORCE_PROGRAM = False  # True reshifts even if the bitstream and clock settings match the last programmed ones.
+# The skip check trusts /.mosbius_last_program, which survives a MOSbius power cycle while the
+# chip's scan chain does not: if the chip may have lost power since the Pico last programmed it,
+# set FORCE_PROGRAM = True (or delete that file) so the configuration is shifted again.
+PRINT_STATS = False  # True prints per-phase timing/heap as one line after programming.
+# Chips sharing EN/CLK on separate DATA pins, e.g. [(16, "chip_a.json"), (15, "chip_b.json")];
+# when set, all of them are programmed in parallel and CONFIG_FILE/PIN_DATA are not used.
+PARALLEL_TARGETS = None
+SHIFT_ENGINE = "auto"  # "auto" (viper SIO loop when available), "viper", "pio" (rp2 state machine) or "generic".
+COMMAND_SERVER = False  # True keeps running after programming and serves USB serial commands (tools/mosbius_client.py).
+
+
+def _resolve_configs(config):
+    """
+    Return the config path(s) as a list, each relative to BASE_DIR unless absolute.
+    """
+    config_files = config if isinstance(config, (list, tuple)) else [config]
+    return [path if _isabs(path) else _join(BASE_DIR, path) for path in config_files]
 
 
 def main():
@@ -62,7 +82,7 @@ def main():
         pin_clk = None
         pin_data = None
 
-    config_path = CONFIG_FILE if _isabs(CONFIG_FILE) else _join(BASE_DIR, CONFIG_FILE)
+    config_paths = _resolve_configs(CONFIG_FILE)
     pin_map_path = _join(BASE_DIR, "lib/pin_name_to_sw_matrix_pin_number.json")
 
     driver = MOSbiusV2Driver(
@@ -70,11 +90,45 @@ def main():
         pin_clk=pin_clk,
         pin_data=pin_data,
         t_clk_half_cycle_us=T_CLK_HALF_CYCLE_US,
-        config_file=config_path,
+        config_file=config_paths if len(config_paths) > 1 else config_paths[0],
         pin_map_path=pin_map_path,
+        collect_stats=PRINT_STATS,
+        shift_engine=SHIFT_ENGINE,
+        pin_numbers=(PIN_EN, PIN_CLK, PIN_DATA),
+        clock_mode=CLOCK_MODE,
+        min_half_cycle_ns=MIN_HALF_CYCLE_NS,
     )
-    print("Using config: {}".format(driver.config_path))
-    driver.program_from_config()
+    if PARALLEL_TARGETS:
+        # A list per DATA pin is a daisy chain, like CONFIG_FILE.
+        targets = [(gpio, _resolve_configs(config)) for gpio, config in PARALLEL_TARGETS]
+        driver.program_parallel(targets, force=FORCE_PROGRAM)
+        if driver.stats is not None:
+            print(driver.stats.log_line())
+        return _serve(driver)
+
+    print("Using config: {}".format(", ".join(driver.config_paths)))
+
+    # Prefer a compiled config module (no JSON at startup) when present and current.
+    try:
+        import compiled_config
+    except ImportError:
+        compiled_config = None
+    bitstream = driver.bitstream_from_compiled(compiled_config) if compiled_config else None
+    if bitstream is not None:
+        print("Using compiled config (source sha256 {})".format(compiled_config.SOURCE_SHA256[:12]))
+        driver.program_bitstream(bitstream, force=FORCE_PROGRAM)
+    else:
+        driver.program_from_config(force=FORCE_PROGRAM)
+    if driver.stats is not None:
+        print(driver.stats.log_line())
+    return _serve(driver)
+
+
+def _serve(driver):
+    if COMMAND_SERVER:
+        from command_server import CommandServer
+
+        CommandServer(driver).serve()
     return 0
 
 
@@ -0,0 +1,273 @@
+"""
+Vectorized batch builder for host-side design-space sweeps (needs NumPy).
+
+Turns many normalized configs into one (N, 2008) uint8 bit matrix, or a
+(N, 251) packed matrix in PackedBitstream byte layout, with one fancy-index
+scatter. Register addresses come from a precomputed (terminal, column)
+table, so the per-config Python work is only mapping names to indices.
+Conflicting writes are found for the whole batch at once by sorting write
+keys; the error for the first conflicting config is then produced by
+build_bitstream itself, so messages match the single-config builder.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+LIB_DIR = BASE_DIR.parent / "lib"
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(LIB_DIR))
+
+import numpy as np
+
+import register_map_equations as reg_eq
+from bitstream_builder import build_bitstream
+from config_validation import validate_and_normalize_config
+from packed_bitstream import EXPECTED_BITS, PackedBitstream
+
+NBYTES = EXPECTED_BITS >> 3
+SIZING_FIRST_REGISTER = reg_eq.sizing_register_by_index(0, 0)
+SIZING_BITS = 5 * len(reg_eq.SIZING_DEVICE_ORDER)
+# SBUS (a bit, b bit) per connection, as in bitstream_builder._sbus_mode_to_pair.
+CONNECTION_CODES = {"ON": 0, "OFF": 1, "PHI1": 2, "PHI2": 3}
+CONNECTION_BITS = np.array([[1, 1], [0, 0], [1, 0], [0, 1]], dtype=np.uint8)
+
+
+class BatchTables:
+    """
+    Register lookups for one pin map: table[terminal, column] (0 = undefined RBUS row).
+    """
+
+    def __init__(self, pin_to_sw_matrix):
+        self.terminals = sorted(pin_to_sw_matrix)
+        self.index = {name: i for i, name in enumerate(self.terminals)}
+        self.table = np.zeros((len(self.terminals), reg_eq.SWITCH_COLUMNS), dtype=np.int32)
+        for i, name in enumerate(self.terminals):
+            s = reg_eq.switch_equation_index(pin_to_sw_matrix[name])
+            for column in range(reg_eq.SWITCH_COLUMNS):
+                try:
+                    self.table[i, column] = reg_eq.switch_register_by_index(s, column)
+                except ValueError:
+                    pass
+        self.bus_columns = {}
+        for name in reg_eq.SWITCH_BUS_COLUMNS:
+            self.bus_columns[name] = reg_eq.bus_column(name)
+        for n in range(1, 7):
+            self.bus_columns["SBUS{}".format(n)] = reg_eq.bus_column("SBUS{}a".format(n))
+
+
+def _flatten(normalized_configs, tables):
+    """
+    Return (config, terminal, column, connection, pair) write arrays and the (N, 24) sizes.
+    """
+    configs = []
+    terminals = []
+    columns = []
+    connections = []
+    pairs = []
+    sizes = np.zeros((len(normalized_configs), len(reg_eq.SIZING_DEVICE_ORDER)), dtype=np.uint8)
+    index = tables.index
+    for n, normalized in enumerate(normalized_configs):
+        for bus, entries in normalized["connections"].items():
+            column = tables.bus_columns.get(bus)
+            if column is None:
+                raise ValueError("config {}: Unknown bus '{}'".format(n, bus))
+            count = len(entries)
+            if not count:
+                continue
+            configs.extend([n] * count)
+            columns.extend([column] * count)
+            if bus.startswith("RBUS"):
+                terminals.extend([index[t] for t in entries])
+                connections.extend([0] * count)
+                pairs.extend([False] * count)
+                continue
+            terminals.extend([index[e["terminal"]] for e in entries])
+            connections.extend([CONNECTION_CODES[e["connection"].upper()] for e in entries])
+            pairs.extend([bus[-1:] not in ("a", "b")] * count)
+        for device, size in normalized["sizes"].items():
+            sizes[n, reg_eq.sizing_device_index(device)] = size
+    return (
+        np.array(configs, dtype=np.int64),
+        np.array(terminals, dtype=np.int64),
+        np.array(columns, dtype=np.int64),
+        np.array(connections, dtype=np.int64),
+        np.array(pairs, dtype=bool),
+        sizes,
+    )
+
+
+def _writes(normalized_configs, tables):
+    """
+    Return (config, register, value) arrays for every switch write, plus the sizes matrix.
+    """
+    cfg, term, column, conn, pair, sizes = _flatten(normalized_configs, tables)
+    bits = CONNECTION_BITS[conn]
+    # RBUS entries write 1; single-half SBUS entries write the a or b bit of their column.
+    is_rbus = column >= reg_eq.bus_column("RBUS1")
+    first_value = np.where(is_rbus, 1, np.where(pair | (column % 2 == 0), bits[:, 0], bits[:, 1]))
+    # Suffix-less SBUS entries also write the b column right after the a column;
+    # sorting by write ordinal keeps build_bitstream's write order.
+    ordinal = np.arange(len(cfg), dtype=np.int64) * 2
+    order = np.argsort(np.concatenate((ordinal, ordinal[pair] + 1)), kind="stable")
+    configs = np.concatenate((cfg, cfg[pair]))[order]
+    registers = np.concatenate((tables.table[term, column], tables.table[term[pair], column[pair] + 1]))[order]
+    values = np.concatenate((first_value, bits[pair, 1])).astype(np.uint8)[order]
+    return configs, registers, values, sizes
+
+
+def find_conflicts(configs, registers, values):
+    """
+    Return the sorted config indices that write one register with two values.
+    """
+    key = configs * EXPECTED_BITS + registers
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    values = values[order]
+    clash = (key[1:] == key[:-1]) & (values[1:] != values[:-1])
+    return np.unique(configs[order][1:][clash])
+
+
+def last_writes(configs, registers, values):
+    """
+    Keep only the last write of each (config, register), in build order.
+
+    NumPy does not say which value lands when a scatter repeats an index, so
+    duplicates are dropped first; build_bitstream keeps the last write.
+    """
+    key = configs * EXPECTED_BITS + registers
+    _, first_reversed = np.unique(key[::-1], return_index=True)
+    keep = len(key) - 1 - first_reversed
+    return configs[keep], registers[keep], values[keep]
+
+
+def build_batch(normalized_configs, pin_to_sw_matrix, check_conflicts=True, packed=False, tables=None):
+    """
+    Build normalized configs into an (N, 2008) bit matrix, or (N, 251) packed bytes.
+
+    Row n, column i is register i + 1 of config n; packed rows use the
+    PackedBitstream layout (bit i in byte i >> 3, LSB first). With
+    check_conflicts the first conflicting config raises the ValueError that
+    build_bitstream(track_sources=True) raises for it, prefixed with its index.
+    """
+    tables = tables or BatchTables(pin_to_sw_matrix)
+    configs, registers, values, sizes = _writes(normalized_configs, tables)
+    undefined = registers == 0
+    if check_conflicts:
+        bad = find_conflicts(configs[~undefined], registers[~undefined], values[~undefined])
+        if undefined.any():
+            bad = np.union1d(bad, configs[undefined])
+    else:
+        bad = np.unique(configs[undefined])
+    if len(bad):
+        n = int(bad[0])
+        normalized = normalized_configs[n]
+        try:
+            build_bitstream(normalized["connections"], normalized["sizes"], pin_to_sw_matrix, track_sources=True)
+        except ValueError as e:
+            raise ValueError("config {}: {}".format(n, e))
+        raise ValueError("config {}: conflicting or undefined register write".format(n))
+
+    bits = np.zeros((len(normalized_configs), EXPECTED_BITS), dtype=np.uint8)
+    configs, registers, values = last_writes(configs, registers, values)
+    bits[configs, registers - 1] = values
+    shifts = np.arange(5, dtype=np.uint8)
+    sizing = (sizes[:, :, None] >> shifts) & 1
+    bits[:, SIZING_FIRST_REGISTER - 1 : SIZING_FIRST_REGISTER - 1 + SIZING_BITS] = sizing.reshape(len(sizes), SIZING_BITS)
+    if packed:
+        return np.packbits(bits, axis=1, bitorder="little")
+    return bits
+
+
+def to_bitstreams(packed_rows):
+    return [PackedBitstream(EXPECTED_BITS, bytearray(row.tobytes())) for row in packed_rows]
+
+
+def verify(matrix, normalized_configs, pin_to_sw_matrix):
+    """
+    Return the indices of rows that differ from build_bitstream (bit or packed matrix).
+    """
+    packed = matrix if matrix.shape[1] == NBYTES else np.packbits(matrix, axis=1, bitorder="little")
+    mismatches = []
+    for n, normalized in enumerate(normalized_configs):
+        expected = build_bitstream(normalized["connections"], normalized["sizes"], pin_to_sw_matrix)
+        if packed[n].tobytes() != bytes(expected.data):
+            mismatches.append(n)
+    return mismatches
+
+
+def _load_configs(paths):
+    configs = []
+    for path in paths:
+        path = Path(path)
+        if path.suffix == ".jsonl":
+            for line in path.read_text().splitlines():
+                if line.strip():
+                    configs.append(json.loads(line))
+        else:
+            configs.append(json.loads(path.read_text()))
+    return configs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build many configs at once into a NumPy bit matrix")
+    parser.add_argument("configs", nargs="*", help="Config JSON files or .jsonl files with one config per line")
+    parser.add_argument("--random", type=int, default=0, help="Also build N random configs (benchmark corpus generator)")
+    parser.add_argument("--density", type=float, default=0.05, help="Switch density of --random configs")
+    parser.add_argument("--output", help="Save the matrix with numpy.save (.npy)")
+    parser.add_argument("--packed", action="store_true", help="Output (N, 251) packed bytes instead of (N, 2008) bits")
+    parser.add_argument("--no-conflicts", action="store_true", help="Skip conflict detection")
+    parser.add_argument("--verify", action="store_true", help="Compare every row with build_bitstream and time both")
+    args = parser.parse_args()
+
+    pin_map = json.loads((LIB_DIR / "pin_name_to_sw_matrix_pin_number.json").read_text())
+    configs = _load_configs(args.configs)
+    if args.random:
+        from benchmark import make_config
+
+        configs += [make_config(pin_map, args.density, seed=seed + 1) for seed in range(args.random)]
+    if not configs:
+        parser.error("no configs given (pass files or --random N)")
+    normalized = []
+    for n, config in enumerate(configs):
+        try:
+            normalized.append(validate_and_normalize_config(config, pin_map))
+        except ValueError as e:
+            print("Error: config {}: {}".format(n, e))
+            return 1
+
+    start = time.perf_counter()
+    try:
+        matrix = build_batch(normalized, pin_map, check_conflicts=not args.no_conflicts, packed=args.packed)
+    except ValueError as e:
+        print("Error: {}".format(e))
+        return 1
+    batch_s = time.perf_counter() - start
+    print(
+        "Built {} configs into {} {} in {:.1f} ms ({:.1f} us/config)".format(
+            len(normalized), matrix.shape, matrix.dtype, batch_s * 1000, batch_s * 1e6 / len(normalized)
+        )
+    )
+    if args.output:
+        np.save(args.output, matrix)
+        print("Saved {}".format(args.output))
+    if args.verify:
+        start = time.perf_counter()
+        mismatches = verify(matrix, normalized, pin_map)
+        loop_s = time.perf_counter() - start
+        if mismatches:
+            print("FAIL: {} rows differ from build_bitstream (first: config {})".format(len(mismatches), mismatches[0]))
+            return 1
+        print(
+            "PASS: all {} rows match build_bitstream (builder loop {:.1f} ms, batch {:.0f}x faster)".format(
+                len(normalized), loop_s * 1000, loop_s / batch_s if batch_s > 0 else float("inf")
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
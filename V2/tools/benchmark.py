@@ -0,0 +1,306 @@
+"""
+Benchmark runner for the V2 build and program pipeline.
+
+Runs on CPython and the MicroPython unix port. Each benchmark is timed
+over a corpus of generated configs (empty, random densities, every switch
+set) and reported as JSON with ops/s, microseconds per op and heap use:
+tracemalloc peak on CPython, bytes allocated with GC disabled
+(gc.mem_alloc delta) on MicroPython.
+
+Usage: see _usage().
+"""
+
+import gc
+import sys
+import json
+import time
+
+
+def _dirname(path):
+    if "/" not in path:
+        return "."
+    head = path.rsplit("/", 1)[0]
+    return head if head else "/"
+
+
+TOOLS_DIR = _dirname(globals().get("__file__", "") or "./benchmark.py")
+V2_DIR = _dirname(TOOLS_DIR) if TOOLS_DIR != "." else ".."
+LIB_DIR = V2_DIR + "/lib"
+for _path in (TOOLS_DIR, LIB_DIR):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import register_map_equations as reg_eq
+from bitstream_builder import build_bitstream, compile_config
+from config_validation import validate_and_normalize_config
+from packed_bitstream import load_bitstream_text, write_bitstream_text
+from pio_shift import pack_words
+
+IS_MICROPYTHON = sys.implementation.name == "micropython"
+DEFAULT_ITERATIONS = 20
+DEFAULT_TOLERANCE = 0.2
+DENSITIES = (0.05, 0.25, 0.5)
+SBUS_MODES = ("ON", "OFF", "PHI1", "PHI2")
+
+if IS_MICROPYTHON:
+
+    def _now_us():
+        return time.ticks_us()
+
+    def _elapsed_us(start):
+        return time.ticks_diff(time.ticks_us(), start)
+
+else:
+
+    def _now_us():
+        return time.perf_counter_ns() // 1000
+
+    def _elapsed_us(start):
+        return time.perf_counter_ns() // 1000 - start
+
+
+class _Lcg:
+    """
+    Deterministic PRNG identical on CPython and MicroPython.
+    """
+
+    def __init__(self, seed):
+        self.state = seed & 0x7FFFFFFF
+
+    def random(self):
+        self.state = (1103515245 * self.state + 12345) & 0x7FFFFFFF
+        return self.state / 0x80000000
+
+
+def _tmp_dir():
+    try:
+        import os
+
+        os.stat("/tmp")
+        return "/tmp"
+    except (ImportError, OSError):
+        return "."
+
+
+def _load_pin_map():
+    with open(LIB_DIR + "/pin_name_to_sw_matrix_pin_number.json", "r") as f:
+        return json.load(f)
+
+
+def _rbus_terminals(pin_map):
+    return [t for t in sorted(pin_map) if not (isinstance(pin_map[t], str) and pin_map[t].startswith("internal_"))]
+
+
+def make_config(pin_map, density, seed=1):
+    """
+    Random config where each (bus, terminal) switch is used with `density`.
+
+    density=0 gives an empty config, density=1 sets every switch.
+    """
+    rng = _Lcg(seed)
+    terminals = sorted(pin_map)
+    rbus_terminals = _rbus_terminals(pin_map)
+    connections = {}
+    for n in range(1, 9):
+        connections["RBUS{}".format(n)] = [t for t in rbus_terminals if density >= 1 or rng.random() < density]
+    for n in range(1, 7):
+        entries = []
+        for t in terminals:
+            if density >= 1:
+                entries.append(t)
+            elif rng.random() < density:
+                mode = SBUS_MODES[int(rng.random() * len(SBUS_MODES))]
+                entries.append({"terminal": t, "connection": mode})
+        connections["SBUS{}".format(n)] = entries
+    sizes = {}
+    for device in reg_eq.SIZING_DEVICE_ORDER:
+        sizes[device] = 31 if density >= 1 else int(rng.random() * 32 * density)
+    return {"connections": connections, "sizes": sizes}
+
+
+def make_corpus(pin_map):
+    corpus = [("empty", {"connections": {}, "sizes": {}})]
+    for i, density in enumerate(DENSITIES):
+        corpus.append(("random_{}".format(int(density * 100)), make_config(pin_map, density, seed=i + 1)))
+    corpus.append(("full", make_config(pin_map, 1)))
+    return corpus
+
+
+def _measure_heap(fn):
+    if IS_MICROPYTHON:
+        gc.collect()
+        gc.disable()
+        try:
+            before = gc.mem_alloc()
+            fn()
+            return gc.mem_alloc() - before, "gc.mem_alloc"
+        finally:
+            gc.enable()
+    import tracemalloc
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1], "tracemalloc"
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(name, config_name, fn, iterations):
+    fn()
+    gc.collect()
+    start = _now_us()
+    for _ in range(iterations):
+        fn()
+    elapsed_us = _elapsed_us(start)
+    heap_bytes, heap_method = _measure_heap(fn)
+    us_per_op = elapsed_us / iterations
+    return {
+        "benchmark": name,
+        "config": config_name,
+        "iterations": iterations,
+        "us_per_op": round(us_per_op, 2),
+        "ops_per_s": round(1000000 / us_per_op, 2) if us_per_op else None,
+        "heap_bytes": heap_bytes,
+        "heap_method": heap_method,
+    }
+
+
+def _mock_program(bitstream):
+    import driver
+    from mosbius_emulator import EmulatedBoard
+
+    board = EmulatedBoard(record_edges=False)
+    # Virtual time: sleeps cost nothing, so this measures pure per-bit overhead.
+    driver.time = board.time
+    pins = (board.pin(18), board.pin(17), board.pin(16))
+
+    def program():
+        driver._program_bitstream(bitstream, pins[0], pins[1], pins[2], 10)
+
+    return program
+
+
+def benchmarks_for(config, pin_map, tmp_dir):
+    normalized = validate_and_normalize_config(config, pin_map)
+    bitstream = build_bitstream(normalized["connections"], normalized["sizes"], pin_map)
+    text_path = tmp_dir + "/mosbius_bench_bitstream.txt"
+    write_bitstream_text(text_path, bitstream)
+
+    return (
+        ("validate", lambda: validate_and_normalize_config(config, pin_map)),
+        ("build", lambda: build_bitstream(normalized["connections"], normalized["sizes"], pin_map)),
+        (
+            "build_track_sources",
+            lambda: build_bitstream(normalized["connections"], normalized["sizes"], pin_map, track_sources=True),
+        ),
+        ("compile", lambda: compile_config(config, pin_map, track_sources=True)),
+        ("write_text", lambda: write_bitstream_text(text_path, bitstream)),
+        ("load_text", lambda: load_bitstream_text(text_path)),
+        ("program_mock", _mock_program(bitstream)),
+        ("pack_pio_words", lambda: pack_words(bitstream)),
+    )
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return regressions where time or heap grew by more than `tolerance`.
+    """
+    base = {}
+    for entry in baseline.get("results", []):
+        base[(entry["benchmark"], entry["config"])] = entry
+    regressions = []
+    for entry in results:
+        ref = base.get((entry["benchmark"], entry["config"]))
+        if ref is None:
+            continue
+        for key in ("us_per_op", "heap_bytes"):
+            if ref.get(key) and entry[key] > ref[key] * (1 + tolerance):
+                regressions.append(
+                    "{} [{}] {}: {} -> {}".format(entry["benchmark"], entry["config"], key, ref[key], entry[key])
+                )
+    return regressions
+
+
+def _usage():
+    return (
+        "Usage: benchmark.py [--iterations N] [--output results.json]\n"
+        "                    [--compare baseline.json] [--tolerance 0.2] [--only name,...]\n"
+    )
+
+
+def _parse_args(argv):
+    opts = {
+        "iterations": DEFAULT_ITERATIONS,
+        "output": None,
+        "compare": None,
+        "tolerance": DEFAULT_TOLERANCE,
+        "only": None,
+    }
+    i = 1
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("-h", "--help"):
+            print(_usage())
+            raise SystemExit(0)
+        if arg not in ("--iterations", "--output", "--compare", "--tolerance", "--only"):
+            raise ValueError("Unknown argument '{}'".format(arg))
+        if i + 1 >= len(argv):
+            raise ValueError("Missing value for {}".format(arg))
+        value = argv[i + 1]
+        if arg == "--iterations":
+            opts["iterations"] = int(value)
+        elif arg == "--tolerance":
+            opts["tolerance"] = float(value)
+        elif arg == "--only":
+            opts["only"] = value.split(",")
+        else:
+            opts[arg[2:]] = value
+        i += 2
+    return opts
+
+
+def main():
+    opts = _parse_args(sys.argv)
+    pin_map = _load_pin_map()
+    tmp_dir = _tmp_dir()
+    results = []
+    for config_name, config in make_corpus(pin_map):
+        for name, fn in benchmarks_for(config, pin_map, tmp_dir):
+            if opts["only"] and name not in opts["only"]:
+                continue
+            result = run_benchmark(name, config_name, fn, opts["iterations"])
+            results.append(result)
+            print(
+                "{:<20} {:<10} {:>12.1f} us/op {:>10} heap B".format(
+                    name, config_name, result["us_per_op"], result["heap_bytes"]
+                )
+            )
+
+    report = {
+        "implementation": sys.implementation.name,
+        "version": sys.version,
+        "iterations": opts["iterations"],
+        "results": results,
+    }
+    if opts["output"]:
+        with open(opts["output"], "w") as f:
+            json.dump(report, f)
+        print("Results saved to {}".format(opts["output"]))
+
+    if opts["compare"]:
+        with open(opts["compare"], "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, opts["tolerance"])
+        if regressions:
+            raise ValueError("regressions vs {}:\n  {}".format(opts["compare"], "\n  ".join(regressions)))
+        print("PASS: no regressions vs {} (tolerance {})".format(opts["compare"], opts["tolerance"]))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ValueError as exc:
+        print("FAIL: {}".format(exc))
+        raise SystemExit(1)
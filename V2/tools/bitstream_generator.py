@@ -6,8 +6,9 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 LIB_DIR = os.path.join(os.path.dirname(BASE_DIR), "lib")
 sys.path.insert(0, LIB_DIR)
 
-from bitstream_builder import build_bitstream
+from bitstream_builder import build_bitstream, build_chain_bitstream
 from config_validation import validate_and_normalize_config
+from packed_bitstream import write_bitstream_binary, write_bitstream_text
 
 
 def _load_json(path):
@@ -15,17 +16,6 @@ def _load_json(path):
         return json.load(f)
 
 
-def _write_bitstream_text(path, bitstream, order="asc", m2k=False):
-    if order not in ("asc", "desc"):
-        raise ValueError("order must be 'asc' or 'desc'")
-    iterable = reversed(bitstream) if order == "desc" else bitstream
-    with open(path, "w") as f:
-        if m2k:
-            f.write("0\n")
-        for bit in iterable:
-            f.write("{}\n".format(int(bit)))
-
-
 def _normalize_sbus_mode_for_csv(mode):
     mode = (mode or "OFF").upper()
     if mode == "PHI1":
@@ -117,8 +107,10 @@ def _write_csv(output_path, header, rows):
 def _usage():
     script = os.path.basename(sys.argv[0])
     return (
-        "Usage: {} [config.json] [output.txt] [--order asc|desc] [--csv path] [--m2k]\\n".format(script)
-        + "Defaults: config.json in script folder, output=bitstream.txt, order=asc\\n"
+        "Usage: {} [config.json] [output.txt|output.bin] [--order asc|desc] [--format text|bin] [--csv path] [--m2k]\\n".format(script)
+        + "       {} --chain chip0.json,chip1.json,... [output.txt|output.bin] [options]\\n".format(script)
+        + "Defaults: config.json in script folder, output=bitstream.txt, order=asc, format from output extension\\n"
+        + "--chain: daisy-chained chips, chip0 nearest DATA; one concatenated bitstream\\n"
     )
 
 
@@ -128,6 +120,8 @@ def _parse_args(argv, default_config, default_output):
     order = "asc"
     csv_path = None
     m2k = False
+    fmt = None
+    chain = None
     positionals = []
     i = 1
     while i < len(argv):
@@ -149,49 +143,93 @@ def _parse_args(argv, default_config, default_output):
                 raise ValueError("Missing value for --csv")
             csv_path = argv[i + 1].strip()
             i += 1
+        elif arg.startswith("--format="):
+            fmt = arg.split("=", 1)[1].strip().lower()
+        elif arg == "--format":
+            if i + 1 >= len(argv):
+                raise ValueError("Missing value for --format")
+            fmt = argv[i + 1].strip().lower()
+            i += 1
+        elif arg.startswith("--chain="):
+            chain = [p.strip() for p in arg.split("=", 1)[1].split(",") if p.strip()]
+        elif arg == "--chain":
+            if i + 1 >= len(argv):
+                raise ValueError("Missing value for --chain")
+            chain = [p.strip() for p in argv[i + 1].split(",") if p.strip()]
+            i += 1
         elif arg == "--m2k":
             m2k = True
         else:
             positionals.append(arg)
         i += 1
 
-    if len(positionals) >= 1:
-        config_path = positionals[0]
-    if len(positionals) >= 2:
-        output_path = positionals[1]
-    if len(positionals) > 2:
-        raise ValueError("Too many positional arguments")
+    if chain is not None:
+        if not chain:
+            raise ValueError("--chain needs at least one config")
+        if len(positionals) > 1:
+            raise ValueError("Too many positional arguments (configs come from --chain)")
+        if positionals:
+            output_path = positionals[0]
+        config_paths = chain
+    else:
+        if len(positionals) >= 1:
+            config_path = positionals[0]
+        if len(positionals) >= 2:
+            output_path = positionals[1]
+        if len(positionals) > 2:
+            raise ValueError("Too many positional arguments")
+        config_paths = [config_path]
     if order not in ("asc", "desc"):
         raise ValueError("Order must be 'asc' or 'desc'")
+    if fmt is None:
+        fmt = "bin" if output_path.lower().endswith(".bin") else "text"
+    if fmt not in ("text", "bin"):
+        raise ValueError("Format must be 'text' or 'bin'")
     if m2k:
+        if fmt == "bin":
+            raise ValueError("--m2k is only supported for text output")
         order = "desc"
-    return config_path, output_path, order, csv_path, m2k
+    if csv_path and len(config_paths) > 1:
+        raise ValueError("--csv is only supported for a single config")
+    return config_paths, output_path, order, csv_path, m2k, fmt
 
 
 def main():
     base_dir = BASE_DIR
     default_config = os.path.join(os.path.dirname(base_dir), "config.json")
     default_output = os.path.join(base_dir, "bitstream.txt")
-    config_path, output_path, order, csv_path, m2k = _parse_args(sys.argv, default_config, default_output)
+    config_paths, output_path, order, csv_path, m2k, fmt = _parse_args(sys.argv, default_config, default_output)
 
     mapping_dir = os.path.join(base_dir, "chip_config_data")
     pin_map_path = os.path.join(LIB_DIR, "pin_name_to_sw_matrix_pin_number.json")
     pin_name_to_number_path = os.path.join(mapping_dir, "pin_name_to_number.json")
 
-    config = _load_json(config_path)
     pin_to_sw_matrix = _load_json(pin_map_path)
-    normalized = validate_and_normalize_config(config, pin_to_sw_matrix)
-
-    bitstream = build_bitstream(
-        normalized["connections"],
-        normalized["sizes"],
-        pin_to_sw_matrix,
-        track_sources=True,
-    )
-
-    _write_bitstream_text(output_path, bitstream, order=order, m2k=m2k)
-    extra_rows = 1 if m2k else 0
-    print("Bitstream saved to {} ({} bits, order={})".format(output_path, len(bitstream) + extra_rows, order))
+    if len(config_paths) == 1:
+        normalized = validate_and_normalize_config(_load_json(config_paths[0]), pin_to_sw_matrix)
+        bitstream = build_bitstream(
+            normalized["connections"],
+            normalized["sizes"],
+            pin_to_sw_matrix,
+            track_sources=True,
+        )
+    else:
+        chain = []
+        for chip, path in enumerate(config_paths):
+            try:
+                chain.append(validate_and_normalize_config(_load_json(path), pin_to_sw_matrix))
+            except ValueError as e:
+                raise ValueError("chip {} ({}): {}".format(chip, path, e))
+        bitstream = build_chain_bitstream(chain, pin_to_sw_matrix, track_sources=True)
+        print("Chained {} chips ({} bits each), chip 0 nearest DATA".format(len(chain), len(bitstream) // len(chain)))
+
+    if fmt == "bin":
+        write_bitstream_binary(output_path, bitstream, order=order)
+        print("Bitstream saved to {} ({} bits, order={}, format=bin)".format(output_path, len(bitstream), order))
+    else:
+        write_bitstream_text(output_path, bitstream, order=order, m2k=m2k)
+        extra_rows = 1 if m2k else 0
+        print("Bitstream saved to {} ({} bits, order={})".format(output_path, len(bitstream) + extra_rows, order))
 
     if csv_path:
         pin_name_to_number = _load_json(pin_name_to_number_path)
@@ -1,56 +1,20 @@
 import os
 import sys
-import time
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 LIB_DIR = os.path.join(os.path.dirname(BASE_DIR), "lib")
 sys.path.insert(0, LIB_DIR)
 
-from bitstream_builder import EXPECTED_BITS
+from driver import _program_bitstream
+from fast_shift import program_bitstream_viper, resolve_engine
+from pio_shift import program_bitstream_pio
+from packed_bitstream import EXPECTED_BITS, load_bitstream
 
 DEFAULT_PIN_EN = 18
 DEFAULT_PIN_CLK = 17
 DEFAULT_PIN_DATA = 16
 DEFAULT_T_CLK_HALF_CYCLE_US = 10
-
-
-def _load_bitstream_text(path):
-    bits = []
-    with open(path, "r") as f:
-        for line_no, raw_line in enumerate(f, 1):
-            line = raw_line.strip()
-            if not line:
-                continue
-            if line not in ("0", "1"):
-                raise ValueError(
-                    "Invalid bitstream value '{}' at line {} in {}".format(
-                        line, line_no, path
-                    )
-                )
-            bits.append(1 if line == "1" else 0)
-    if not bits:
-        raise ValueError("Bitstream file is empty: {}".format(path))
-    return bits
-
-
-def _program_bitstream(bitstream, pin_en, pin_clk, pin_data, t_clk_half_cycle_us):
-    if pin_en is None or pin_clk is None or pin_data is None:
-        raise ValueError("GPIO pins are not initialized")
-    if not bitstream:
-        raise ValueError("Bitstream is empty")
-
-    pin_data.value(0)
-    pin_clk.value(0)
-    pin_en.value(0)
-
-    for bit in reversed(bitstream):
-        pin_data.value(bit)
-        pin_clk.value(1)
-        time.sleep_us(t_clk_half_cycle_us)
-        pin_clk.value(0)
-        time.sleep_us(t_clk_half_cycle_us)
-
-    pin_en.value(1)
+DEFAULT_SHIFT_ENGINE = "auto"
 
 
 def _default_bitstream_path():
@@ -60,7 +24,7 @@ def _default_bitstream_path():
 def _usage():
     script = os.path.basename(sys.argv[0])
     return (
-        "Usage: {} [bitstream.txt] [--pin-en N] [--pin-clk N] [--pin-data N] [--t-half-us N]\\n".format(script)
+        "Usage: {} [bitstream.txt|bitstream.bin] [--pin-en N] [--pin-clk N] [--pin-data N] [--t-half-us N] [--engine auto|generic|viper|pio]\\n".format(script)
     )
 
 
@@ -70,6 +34,7 @@ def _parse_args(argv):
     pin_clk = DEFAULT_PIN_CLK
     pin_data = DEFAULT_PIN_DATA
     t_half_us = DEFAULT_T_CLK_HALF_CYCLE_US
+    engine = DEFAULT_SHIFT_ENGINE
 
     positionals = []
     i = 1
@@ -99,6 +64,13 @@ def _parse_args(argv):
             pin_data = int(arg.split("=", 1)[1].strip())
         elif arg.startswith("--t-half-us="):
             t_half_us = int(arg.split("=", 1)[1].strip())
+        elif arg == "--engine":
+            if i + 1 >= len(argv):
+                raise ValueError("Missing value for --engine")
+            engine = argv[i + 1].strip().lower()
+            i += 1
+        elif arg.startswith("--engine="):
+            engine = arg.split("=", 1)[1].strip().lower()
         else:
             positionals.append(arg)
         i += 1
@@ -107,15 +79,15 @@ def _parse_args(argv):
         raise ValueError("Too many positional arguments")
     if positionals:
         filename = positionals[0]
-    return filename, pin_en, pin_clk, pin_data, t_half_us
+    return filename, pin_en, pin_clk, pin_data, t_half_us, engine
 
 
 def main():
-    filename, pin_en_num, pin_clk_num, pin_data_num, t_half_us = _parse_args(sys.argv)
+    filename, pin_en_num, pin_clk_num, pin_data_num, t_half_us, engine = _parse_args(sys.argv)
     if filename is None:
         filename = _default_bitstream_path()
 
-    bitstream = _load_bitstream_text(filename)
+    bitstream = load_bitstream(filename)
     if len(bitstream) != EXPECTED_BITS:
         print(
             "Warning: expected {} bits, loaded {} bits from {}".format(
@@ -134,13 +106,20 @@ def main():
     pin_en = Pin(pin_en_num, Pin.OUT)
     pin_clk = Pin(pin_clk_num, Pin.OUT)
     pin_data = Pin(pin_data_num, Pin.OUT)
-    _program_bitstream(
-        bitstream,
-        pin_en,
-        pin_clk,
-        pin_data,
-        t_clk_half_cycle_us=t_half_us,
-    )
+    pin_numbers = (pin_en_num, pin_clk_num, pin_data_num)
+    engine = resolve_engine(engine, pin_numbers)
+    if engine == "pio":
+        program_bitstream_pio(bitstream, pin_en, pin_clk, pin_data, pin_numbers, t_clk_half_cycle_us=t_half_us)
+    elif engine == "viper":
+        program_bitstream_viper(bitstream, pin_en, pin_clk, pin_data, pin_numbers, t_clk_half_cycle_us=t_half_us)
+    else:
+        _program_bitstream(
+            bitstream,
+            pin_en,
+            pin_clk,
+            pin_data,
+            t_clk_half_cycle_us=t_half_us,
+        )
     print("Programming completed")
 
 
@@ -0,0 +1,116 @@
+import argparse
+import hashlib
+import shutil
+import subprocess
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+V2_DIR = BASE_DIR.parent
+LIB_DIR = V2_DIR / "lib"
+ROOT_DIR = V2_DIR.parent
+DEFAULT_OUTPUT_DIR = V2_DIR / "build" / "mpy"
+DEFAULT_CACHE_DIR = ROOT_DIR / ".mpy_cache"
+DEFAULT_MARCH = "armv6m"  # RP2040; needed for @micropython.viper/native code.
+
+MANIFEST_HEADER = """# Frozen-module manifest for the MOSbius V2 runtime.
+# Generated by V2/tools/build_mpy.py; regenerate after adding modules.
+# Build: make -C ports/rp2 BOARD=RPI_PICO FROZEN_MANIFEST={path}
+# Frozen modules shadow /lib, so remove lib/*.py (and .mpy) from the board.
+# The pin map JSON and config.json stay on the filesystem.
+"""
+
+
+def find_mpy_cross():
+    path = shutil.which("mpy-cross")
+    if path is None:
+        raise ValueError("mpy-cross not found on PATH (pip install mpy-cross)")
+    return path
+
+
+def mpy_cross_version(mpy_cross):
+    out = subprocess.run([mpy_cross, "--version"], capture_output=True, text=True, check=True)
+    return out.stdout.strip()
+
+
+def compile_mpy(source, source_name, cache_dir, mpy_cross, march, version):
+    """
+    Return (path, cache_hit) for source compiled to .mpy.
+
+    Builds are cached by mpy-cross version, arch, source name and content.
+    """
+    key = hashlib.sha256(
+        "{}\0{}\0{}\0".format(version, march, source_name).encode() + Path(source).read_bytes()
+    ).hexdigest()
+    cached = Path(cache_dir) / "{}.mpy".format(key)
+    if cached.exists():
+        return cached, True
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_suffix(".tmp")
+    cmd = [mpy_cross, "-s", source_name, "-o", str(tmp), str(source)]
+    if march:
+        cmd.insert(1, "-march={}".format(march))
+    subprocess.run(cmd, check=True)
+    tmp.replace(cached)
+    return cached, False
+
+
+def lib_modules(lib_dir=LIB_DIR):
+    return sorted(path for path in Path(lib_dir).glob("*.py"))
+
+
+def render_manifest(manifest_path, lib_dir, modules):
+    names = ",\n".join('        "{}"'.format(path.name) for path in modules)
+    return (
+        MANIFEST_HEADER.format(path=manifest_path)
+        + '\ninclude("$(PORT_DIR)/boards/manifest.py")\n'
+        + 'freeze(\n    "{}",\n    (\n{},\n    ),\n)\n'.format(Path(lib_dir).resolve(), names)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-compile V2/lib to .mpy and optionally write a frozen manifest")
+    parser.add_argument("--output-dir", default=str(DEFAULT_OUTPUT_DIR), help="Where to write <module>.mpy")
+    parser.add_argument("--march", default=DEFAULT_MARCH, help="mpy-cross -march value ('' for bytecode only)")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Compile cache keyed by source hash")
+    parser.add_argument("--manifest", help="Also write a frozen-module manifest.py for a firmware build")
+    args = parser.parse_args()
+
+    modules = lib_modules()
+    if args.manifest:
+        manifest_path = Path(args.manifest).resolve()
+        manifest_path.write_text(render_manifest(manifest_path, LIB_DIR, modules))
+        print("Wrote {} ({} modules)".format(manifest_path, len(modules)))
+
+    try:
+        mpy_cross = find_mpy_cross()
+    except ValueError as e:
+        print("Error: {}".format(e))
+        return 1
+    version = mpy_cross_version(mpy_cross)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    total_py = 0
+    total_mpy = 0
+    hits = 0
+    print("{:<28} {:>8} {:>8}".format("module", "py", "mpy"))
+    for source in modules:
+        cached, hit = compile_mpy(source, source.name, args.cache_dir, mpy_cross, args.march, version)
+        target = output_dir / (source.stem + ".mpy")
+        shutil.copyfile(cached, target)
+        py_size = source.stat().st_size
+        mpy_size = target.stat().st_size
+        total_py += py_size
+        total_mpy += mpy_size
+        hits += hit
+        print("{:<28} {:>8} {:>8}".format(source.name, py_size, mpy_size))
+    print("{:<28} {:>8} {:>8}".format("total", total_py, total_mpy))
+    print(
+        "Compiled {} modules ({} from cache) with {} (-march={}) into {}".format(
+            len(modules), hits, version, args.march or "none", output_dir
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
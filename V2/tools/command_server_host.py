@@ -0,0 +1,132 @@
+"""
+Run lib/command_server.py on the host against an emulated chip.
+
+Serves the same protocol as the Pico on stdin/stdout, with the driver wired
+to mosbius_emulator's board (EN 18 / CLK 17 / DATA 16). Runs under CPython
+or the MicroPython unix port, so the host client can be exercised over a pty:
+
+    python3 V2/tools/mosbius_client.py --spawn "python3 V2/tools/command_server_host.py" selftest
+
+Adds a LATCHED command that returns the chip's latched registers as hex.
+The emulated chip starts unprogrammed, so no fingerprint is kept unless
+--fingerprint PATH is given (use a path private to this chip).
+--real-time makes shifts take their real duration; --stall-ms/--stall-count
+delay the first STREAM commands to exercise client timeouts and retries.
+"""
+
+import sys
+import time
+
+
+def _dirname(path):
+    if "/" not in path:
+        return "."
+    head = path.rsplit("/", 1)[0]
+    return head if head else "/"
+
+
+_TOOLS_DIR = _dirname(globals().get("__file__", "") or "./command_server_host.py")
+_V2_DIR = _dirname(_TOOLS_DIR) if _TOOLS_DIR != "." else ".."
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
+
+from mosbius_emulator import LIB_DIR, EmulatedBoard, ShiftChainModel, VirtualClock
+from packed_bitstream import EXPECTED_BITS
+
+
+def _usage():
+    return (
+        "Usage: command_server_host.py [--config PATH] [--fingerprint PATH] [--t-half-us N]"
+        " [--real-time] [--stall-ms N] [--stall-count N]"
+    )
+
+
+def _parse_args(argv):
+    opts = {
+        "config": _V2_DIR + "/config.json",
+        # The emulated chip starts unprogrammed every run, so skipping is opt-in.
+        "fingerprint": None,
+        "t_half_us": 10,
+        "real_time": False,
+        "stall_ms": 0,
+        "stall_count": 0,
+    }
+    i = 1
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("-h", "--help"):
+            print(_usage())
+            raise SystemExit(0)
+        if arg == "--real-time":
+            opts["real_time"] = True
+            i += 1
+            continue
+        if arg not in ("--config", "--fingerprint", "--t-half-us", "--stall-ms", "--stall-count"):
+            raise ValueError("Unknown argument '{}'".format(arg))
+        if i + 1 >= len(argv):
+            raise ValueError("Missing value for {}".format(arg))
+        value = argv[i + 1]
+        if arg == "--config":
+            opts["config"] = value
+        elif arg == "--fingerprint":
+            opts["fingerprint"] = None if value == "none" else value
+        else:
+            opts[arg[2:].replace("-", "_")] = int(value)
+        i += 2
+    return opts
+
+
+def main():
+    try:
+        opts = _parse_args(sys.argv)
+    except ValueError as e:
+        print("Error: {}".format(e))
+        print(_usage())
+        return 2
+
+    board = EmulatedBoard(clock=VirtualClock(real_time=opts["real_time"]), record_edges=False)
+    chip = board.attach_chip(ShiftChainModel(EXPECTED_BITS), en=18, clk=17, data=16)
+    board.install()
+    import driver
+    import pio_shift
+    from command_server import CommandServer
+
+    board.install(driver, pio_shift)
+    drv = driver.MOSbiusV2Driver(
+        pin_en=board.machine.Pin(18, board.machine.Pin.OUT),
+        pin_clk=board.machine.Pin(17, board.machine.Pin.OUT),
+        pin_data=board.machine.Pin(16, board.machine.Pin.OUT),
+        t_clk_half_cycle_us=opts["t_half_us"],
+        config_file=opts["config"],
+        pin_map_path=LIB_DIR + "/pin_name_to_sw_matrix_pin_number.json",
+        fingerprint_file=opts["fingerprint"],
+        cache_dir=None,
+        pin_numbers=(18, 17, 16),
+    )
+
+    def latched(args):
+        return {"latched": "".join("{:02x}".format(b) for b in chip.latched_bitstream().data)}
+
+    server = CommandServer(drv)
+    server.register("LATCHED", latched)
+    if opts["stall_count"]:
+        stream = server.commands["STREAM"]
+        stalls = [opts["stall_count"]]
+
+        def stalled_stream(args):
+            if stalls[0] > 0:
+                stalls[0] -= 1
+                time.sleep(opts["stall_ms"] / 1000)
+            return stream(args)
+
+        server.register("STREAM", stalled_stream)
+    try:
+        server.serve()
+    except OSError:
+        # The client closed the pty.
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
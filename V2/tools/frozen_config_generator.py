@@ -0,0 +1,124 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(os.path.dirname(BASE_DIR), "lib")
+sys.path.insert(0, LIB_DIR)
+
+from bitstream_builder import build_bitstream
+from config_validation import validate_and_normalize_config
+from driver import LIB_VERSION
+
+BYTES_PER_LINE = 32
+HEADER = '''"""
+Compiled MOSbius V2 config.
+
+Generated by V2/tools/frozen_config_generator.py from {source}.
+Do not edit by hand; regenerate after changing the config.
+"""
+
+'''
+
+
+def _default_config_path():
+    return os.path.join(os.path.dirname(BASE_DIR), "config.json")
+
+
+def _default_output_path():
+    return os.path.join(LIB_DIR, "compiled_config.py")
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def compile_config(config_bytes, pin_map_bytes):
+    config = json.loads(config_bytes)
+    pin_to_sw_matrix = json.loads(pin_map_bytes)
+    normalized = validate_and_normalize_config(config, pin_to_sw_matrix)
+    return build_bitstream(
+        normalized["connections"],
+        normalized["sizes"],
+        pin_to_sw_matrix,
+        track_sources=True,
+    )
+
+
+def render_module(bitstream, source_name, source_sha256, pin_map_sha256):
+    payload = bitstream.to_bytes()
+    lines = [
+        HEADER.format(source=source_name),
+        'SOURCE_FILE = "{}"\n'.format(source_name),
+        'SOURCE_SHA256 = "{}"\n'.format(source_sha256),
+        'PIN_MAP_SHA256 = "{}"\n'.format(pin_map_sha256),
+        'LIB_VERSION = "{}"\n'.format(LIB_VERSION),
+        "NBITS = {}\n".format(bitstream.nbits),
+        "NBYTES = {}\n".format(len(payload)),
+        "\n",
+        "BITSTREAM = (\n",
+    ]
+    for i in range(0, len(payload), BYTES_PER_LINE):
+        chunk = payload[i : i + BYTES_PER_LINE]
+        lines.append('    b"{}"\n'.format("".join("\\x{:02x}".format(b) for b in chunk)))
+    lines.append(")\n")
+    return "".join(lines)
+
+
+def _cross_compile(py_path):
+    mpy_cross = shutil.which("mpy-cross")
+    if mpy_cross is None:
+        raise ValueError("mpy-cross not found on PATH (pip install mpy-cross)")
+    mpy_path = py_path[:-3] + ".mpy"
+    subprocess.check_call([mpy_cross, "-o", mpy_path, py_path])
+    return mpy_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile a V2 config into a Python module holding the packed bitstream"
+    )
+    parser.add_argument("config", nargs="?", default=_default_config_path(), help="Config JSON (default: V2/config.json)")
+    parser.add_argument(
+        "--output",
+        default=_default_output_path(),
+        help="Generated module path (default: V2/lib/compiled_config.py)",
+    )
+    parser.add_argument(
+        "--pin-map",
+        default=os.path.join(LIB_DIR, "pin_name_to_sw_matrix_pin_number.json"),
+        help="Pin map JSON (default: V2/lib/pin_name_to_sw_matrix_pin_number.json)",
+    )
+    parser.add_argument("--mpy", action="store_true", help="Also cross-compile the module to .mpy with mpy-cross")
+    args = parser.parse_args()
+
+    config_bytes = _read_bytes(args.config)
+    pin_map_bytes = _read_bytes(args.pin_map)
+    bitstream = compile_config(config_bytes, pin_map_bytes)
+
+    source_sha256 = hashlib.sha256(config_bytes).hexdigest()
+    pin_map_sha256 = hashlib.sha256(pin_map_bytes).hexdigest()
+    with open(args.output, "w") as f:
+        f.write(render_module(bitstream, os.path.basename(args.config), source_sha256, pin_map_sha256))
+    print(
+        "Compiled config saved to {} ({} bits, source sha256 {})".format(
+            args.output, bitstream.nbits, source_sha256[:12]
+        )
+    )
+
+    if args.mpy:
+        mpy_path = _cross_compile(args.output)
+        print("Cross-compiled to {}".format(mpy_path))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ValueError as exc:
+        print("FAIL: {}".format(exc))
+        raise SystemExit(1)
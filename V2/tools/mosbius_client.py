@@ -0,0 +1,301 @@
+import argparse
+import json
+import os
+import select
+import shlex
+import subprocess
+import sys
+import time
+import tty
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+LIB_DIR = BASE_DIR.parent / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from frame_stream import MAX_FRAME_PAYLOAD, REASON_CRC, encode_frame, parse_response
+from packed_bitstream import load_bitstream
+
+DEFAULT_TIMEOUT_S = 10.0
+DEFAULT_FRAME_SIZE = 64
+
+
+class ServerError(Exception):
+    pass
+
+
+class CommandLink:
+    """
+    Line-framed link to lib/command_server.py over a serial port or pty.
+    """
+
+    def __init__(self, fd, process=None, timeout_s=DEFAULT_TIMEOUT_S, verbose=False):
+        self.fd = fd
+        self.process = process
+        self.timeout_s = timeout_s
+        self.verbose = verbose
+        self._pending = b""
+
+    @classmethod
+    def open_port(cls, port, **kwargs):
+        fd = os.open(port, os.O_RDWR | os.O_NOCTTY)
+        tty.setraw(fd)
+        return cls(fd, **kwargs)
+
+    @classmethod
+    def spawn(cls, command, **kwargs):
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        process = subprocess.Popen(shlex.split(command), stdin=slave, stdout=slave, close_fds=True)
+        os.close(slave)
+        link = cls(master, process=process, **kwargs)
+        link.read_reply()  # "@OK {"ready": true}"
+        return link
+
+    def close(self):
+        os.close(self.fd)
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=self.timeout_s)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+    def _fill(self, done):
+        deadline = time.monotonic() + self.timeout_s
+        while not done():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self.fd], [], [], remaining)[0]:
+                raise TimeoutError("no reply within {:.1f} s".format(self.timeout_s))
+            try:
+                chunk = os.read(self.fd, 4096)
+            except OSError:
+                chunk = b""
+            if not chunk:
+                raise ConnectionError("server closed the connection")
+            self._pending += chunk
+
+    def _read_exact(self, nbytes):
+        self._fill(lambda: len(self._pending) >= nbytes)
+        data, self._pending = self._pending[:nbytes], self._pending[nbytes:]
+        return data
+
+    def _read_line(self):
+        self._fill(lambda: b"\n" in self._pending)
+        line, self._pending = self._pending.split(b"\n", 1)
+        return line.decode("utf-8", "replace").rstrip("\r")
+
+    def read_reply(self):
+        """
+        Return the next reply as a dict; device log lines are skipped (or echoed with verbose).
+        """
+        while True:
+            line = self._read_line()
+            if line.startswith("@OK "):
+                return json.loads(line[4:])
+            if line.startswith("@ERR "):
+                raise ServerError(line[5:])
+            if self.verbose and line:
+                print("device: {}".format(line))
+
+    def request(self, command, payload=None):
+        data = (command + "\n").encode()
+        if payload is not None:
+            data += bytes(payload)
+        os.write(self.fd, data)
+        return self.read_reply()
+
+    def ping(self):
+        return self.request("PING")
+
+    def program_bitstream(self, bitstream, force=False):
+        command = "PROGRAM_BITS {} {}".format(bitstream.nbits, len(bitstream.data))
+        return self.request(command + (" force" if force else ""), bitstream.data)
+
+    def program_config(self, config_bytes, force=False, save=False):
+        command = "PROGRAM_CONFIG {}".format(len(config_bytes))
+        if force:
+            command += " force"
+        if save:
+            command += " save"
+        return self.request(command, config_bytes)
+
+    def stream_bitstream(self, bitstream, force=False, frame_size=DEFAULT_FRAME_SIZE, corrupt=()):
+        """
+        Send a bitstream as CRC-checked frames, resending NACKed ones.
+
+        corrupt lists frame numbers whose first transmission gets a bad CRC
+        (to exercise the retransmit path).
+        """
+        if not 0 < frame_size <= MAX_FRAME_PAYLOAD:
+            raise ValueError("frame size must be 1..{}".format(MAX_FRAME_PAYLOAD))
+        os.write(self.fd, "STREAM {}{}\n".format(bitstream.nbits, " force" if force else "").encode())
+        data = bytes(bitstream.data)
+        corrupt = set(corrupt)
+        frame_count = (len(data) + frame_size - 1) // frame_size
+        for index in range(frame_count):
+            payload = data[index * frame_size : (index + 1) * frame_size]
+            frame = encode_frame(index, payload, last=index == frame_count - 1)
+            while True:
+                if index in corrupt:
+                    corrupt.discard(index)
+                    os.write(self.fd, frame[:-1] + bytes([frame[-1] ^ 0xFF]))
+                else:
+                    os.write(self.fd, frame)
+                response = self._read_exact(4)
+                if response.startswith(b"@"):
+                    # The server rejected the command before reading frames.
+                    self._pending = response + self._pending
+                    return self.read_reply()
+                ack, reason, seq = parse_response(response)
+                if ack:
+                    break
+                if reason != REASON_CRC:
+                    return self.read_reply()
+        return self.read_reply()
+
+    def stats(self):
+        return self.request("STATS")["stats"]
+
+    def fingerprint(self):
+        return self.request("FINGERPRINT")["fingerprint"]
+
+    def quit(self):
+        return self.request("QUIT")
+
+
+def _build_local(config_path):
+    from bitstream_builder import build_bitstream
+    from config_validation import validate_and_normalize_config
+
+    pin_map = json.loads((LIB_DIR / "pin_name_to_sw_matrix_pin_number.json").read_text())
+    normalized = validate_and_normalize_config(json.loads(Path(config_path).read_text()), pin_map)
+    return build_bitstream(normalized["connections"], normalized["sizes"], pin_map)
+
+
+def _latched(link):
+    return bytes.fromhex(link.request("LATCHED")["latched"])
+
+
+def _selftest(link):
+    """
+    Exercise every command against command_server_host.py (needs its LATCHED command).
+    """
+    failures = []
+
+    def check(name, ok, detail=""):
+        if not ok:
+            failures.append("{} {}".format(name, detail).strip())
+
+    config_path = BASE_DIR.parent / "config.json"
+    ref_path = BASE_DIR / "config_ref.json"
+
+    check("ping", "version" in link.ping())
+
+    config_bytes = config_path.read_bytes()
+    reply = link.program_config(config_bytes, force=True)
+    check("program-config", reply["programmed"], str(reply))
+    check("program-config latched", _latched(link) == bytes(_build_local(config_path).data))
+
+    reply = link.program_config(config_bytes)
+    fingerprinting = link.fingerprint() is not None
+    check("program-config skip", reply["programmed"] is (not fingerprinting), str(reply))
+
+    expected = _build_local(ref_path)
+    reply = link.program_bitstream(expected, force=True)
+    check("program-bitstream", reply["programmed"] and reply["nbits"] == expected.nbits, str(reply))
+    check("program-bitstream latched", _latched(link) == bytes(expected.data))
+
+    stats = link.stats()
+    check("stats", stats is not None and "shift" in stats["phases"], str(stats))
+
+    expected = _build_local(config_path)
+    reply = link.stream_bitstream(expected, force=True, frame_size=32, corrupt=(1, 7))
+    check("stream", reply["programmed"] and reply["frames"] == 8 and reply["naks"] == 2, str(reply))
+    check("stream latched", _latched(link) == bytes(expected.data))
+    check("stream stats", "receive" in link.stats()["phases"])
+
+    try:
+        link.request("NO_SUCH_COMMAND")
+        check("error reply", False, "unknown command accepted")
+    except ServerError:
+        pass
+    try:
+        link.program_config(b"{not json", force=True)
+        check("bad config", False, "invalid JSON accepted")
+    except ServerError:
+        pass
+    check("ping after errors", "version" in link.ping())
+
+    if failures:
+        for failure in failures:
+            print("FAIL: {}".format(failure))
+        return 1
+    print("PASS: command server selftest (program-config, program-bitstream, stream, skip, stats, errors)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send commands to a resident MOSbius command server")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--port", help="Serial device of the Pico, e.g. /dev/ttyACM0")
+    target.add_argument("--spawn", help="Start a server command on a pty, e.g. 'python3 V2/tools/command_server_host.py'")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Reply timeout in seconds")
+    parser.add_argument("--verbose", action="store_true", help="Print device log lines")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("ping")
+    p = sub.add_parser("program-config")
+    p.add_argument("config", help="Config JSON to validate, build and program on the device")
+    p.add_argument("--force", action="store_true", help="Reprogram even if the fingerprint matches")
+    p.add_argument("--save", action="store_true", help="Also store it as the device's CONFIG_FILE")
+    p = sub.add_parser("program-bitstream")
+    p.add_argument("bitstream", help="Bitstream file (text or binary)")
+    p.add_argument("--force", action="store_true", help="Reprogram even if the fingerprint matches")
+    p = sub.add_parser("stream")
+    p.add_argument("source", help="Config JSON (built here) or bitstream file from bitstream_generator.py")
+    p.add_argument("--force", action="store_true", help="Reprogram even if the fingerprint matches")
+    p.add_argument("--frame-size", type=int, default=DEFAULT_FRAME_SIZE, help="Payload bytes per frame")
+    sub.add_parser("stats")
+    sub.add_parser("fingerprint")
+    sub.add_parser("quit")
+    sub.add_parser("selftest")
+    args = parser.parse_args()
+
+    kwargs = {"timeout_s": args.timeout, "verbose": args.verbose}
+    link = CommandLink.spawn(args.spawn, **kwargs) if args.spawn else CommandLink.open_port(args.port, **kwargs)
+    status = 0
+    try:
+        start = time.perf_counter()
+        if args.command == "selftest":
+            status = _selftest(link)
+            reply = None
+        elif args.command == "program-config":
+            reply = link.program_config(Path(args.config).read_bytes(), force=args.force, save=args.save)
+        elif args.command == "program-bitstream":
+            reply = link.program_bitstream(load_bitstream(args.bitstream), force=args.force)
+        elif args.command == "stream":
+            if args.source.endswith(".json"):
+                bitstream = _build_local(args.source)
+            else:
+                bitstream = load_bitstream(args.source)
+            reply = link.stream_bitstream(bitstream, force=args.force, frame_size=args.frame_size)
+        else:
+            reply = link.request(args.command.upper())
+        if reply is not None:
+            print(json.dumps(reply, indent=2, sort_keys=True))
+            print("round trip: {:.1f} ms".format((time.perf_counter() - start) * 1000))
+    except ServerError as e:
+        print("Error from device: {}".format(e))
+        status = 1
+    finally:
+        if args.spawn and args.command != "quit":
+            try:
+                link.quit()
+            except (ServerError, OSError):
+                pass
+        link.close()
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,1027 @@
+"""
+Host-side MOSbius scan-chain emulator with machine.Pin / time shims.
+
+Lets the V2 driver, the bitstream loader and the V1 programmer be exercised
+without hardware:
+
+    board = EmulatedBoard()
+    chip = board.attach_chip(ShiftChainModel(2008), en=18, clk=17, data=16)
+    board.install()          # machine.Pin / time.sleep_us now hit the board
+    ...program through the normal code path...
+    chip.latched_bitstream() # compare with the builder output
+
+Chip model: every CLK rising edge shifts DATA into register 1 and moves all
+registers up by one (the last bit shifted ends in register 1); an EN rising
+edge latches the chain. Time is virtual by default: sleep_us advances the
+clock, and every pin write can be charged a fixed overhead.
+
+The board also provides an `rp2` stand-in: asm_pio records the program and
+EmulatedStateMachine interprets it (pull/push/out/jmp/nop with side-set and
+delays) against the board pins, cycle by cycle at the configured frequency.
+
+CPython is the supported host; V2/tools/regression_check.py runs every mode
+there. The pin and time shims only use sys.modules and module attributes,
+so the pin-level modes are written to also run on the MicroPython unix port,
+but that port is not part of the regression run. PIO emulation needs
+function.__globals__ and is CPython-only.
+"""
+
+import sys
+import time as _real_time
+
+
+def _dirname(path):
+    if "/" not in path:
+        return "."
+    head = path.rsplit("/", 1)[0]
+    return head if head else "/"
+
+
+_TOOLS_DIR = _dirname(globals().get("__file__", "") or "./mosbius_emulator.py")
+_V2_DIR = _dirname(_TOOLS_DIR) if _TOOLS_DIR != "." else ".."
+LIB_DIR = _V2_DIR + "/lib"
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+from packed_bitstream import EXPECTED_BITS, PackedBitstream
+
+TICKS_PERIOD = 1 << 30
+DEFAULT_CPU_HZ = 125000000
+SIO_BASE = 0xD0000000
+GPIO_COUNT = 30
+
+
+def _real_ns():
+    if hasattr(_real_time, "perf_counter_ns"):
+        return _real_time.perf_counter_ns()
+    return _real_time.ticks_us() * 1000
+
+
+class VirtualClock:
+    """
+    Nanosecond clock. Virtual mode only advances on sleeps and charged
+    overheads; real mode follows the host clock and busy-waits on sleeps.
+    """
+
+    def __init__(self, real_time=False, cpu_hz=DEFAULT_CPU_HZ):
+        self.real_time = real_time
+        self.cpu_hz = cpu_hz
+        self._virtual_ns = 0
+        self._origin_ns = _real_ns()
+        self._paused_ns = None
+
+    def now_ns(self):
+        if self.real_time:
+            now = self._paused_ns if self._paused_ns is not None else _real_ns()
+            return now - self._origin_ns
+        return self._virtual_ns
+
+    def pause(self):
+        """
+        Freeze real-mode time while the emulator does its own bookkeeping.
+
+        Returns a token for resume(); nested pauses return None.
+        """
+        if not self.real_time or self._paused_ns is not None:
+            return None
+        self._paused_ns = _real_ns()
+        return self._paused_ns
+
+    def resume(self, token):
+        if token is not None:
+            self._origin_ns += _real_ns() - token
+            self._paused_ns = None
+
+    def advance_ns(self, ns):
+        if ns <= 0:
+            return
+        if self.real_time:
+            end = self.now_ns() + ns
+            while self.now_ns() < end:
+                pass
+        else:
+            self._virtual_ns += ns
+
+
+class TimeShim:
+    """
+    Stand-in for the `time` module driven by a VirtualClock.
+    """
+
+    def __init__(self, clock):
+        self._clock = clock
+
+    def sleep_us(self, us):
+        self._clock.advance_ns(int(us) * 1000)
+
+    def sleep_ms(self, ms):
+        self._clock.advance_ns(int(ms) * 1000000)
+
+    def sleep(self, seconds):
+        self._clock.advance_ns(int(seconds * 1000000000))
+
+    def ticks_us(self):
+        return (self._clock.now_ns() // 1000) % TICKS_PERIOD
+
+    def ticks_ms(self):
+        return (self._clock.now_ns() // 1000000) % TICKS_PERIOD
+
+    def ticks_cpu(self):
+        return (self._clock.now_ns() * self._clock.cpu_hz // 1000000000) % TICKS_PERIOD
+
+    def ticks_add(self, ticks, delta):
+        return (ticks + delta) % TICKS_PERIOD
+
+    def ticks_diff(self, ticks1, ticks2):
+        diff = (ticks1 - ticks2) % TICKS_PERIOD
+        if diff >= TICKS_PERIOD // 2:
+            diff -= TICKS_PERIOD
+        return diff
+
+    def time(self):
+        return self._clock.now_ns() / 1000000000
+
+    def __getattr__(self, name):
+        return getattr(_real_time, name)
+
+
+class EmulatedPin:
+    """
+    Minimal machine.Pin: value()/on()/off()/__call__, routed to a board GPIO.
+    """
+
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+
+    def __init__(self, board, gpio, mode=-1, pull=-1, value=None):
+        self.board = board
+        self.gpio = gpio
+        self.mode = mode
+        if value is not None:
+            board.write(gpio, value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        self.mode = mode
+        if value is not None:
+            self.board.write(self.gpio, value)
+
+    def value(self, value=None):
+        if value is None:
+            return self.board.read(self.gpio)
+        self.board.write(self.gpio, value)
+
+    def __call__(self, value=None):
+        return self.value(value)
+
+    def on(self):
+        self.board.write(self.gpio, 1)
+
+    def off(self):
+        self.board.write(self.gpio, 0)
+
+    def __repr__(self):
+        return "Pin(GPIO{}, mode=OUT)".format(self.gpio)
+
+
+class ShiftChainModel:
+    """
+    N-bit scan chain with latch. Registers are numbered 1..nbits.
+    """
+
+    def __init__(self, nbits=EXPECTED_BITS):
+        self.nbits = nbits
+        self.en = None
+        self.clk = None
+        self.data = None
+        self._ring = bytearray(nbits)
+        self._head = 0
+        self.latched = PackedBitstream(nbits)
+        self.total_clocks = 0
+        self.window_clocks = 0
+        self.latch_count = 0
+        self.last_window_clocks = 0
+
+    def connect(self, en, clk, data):
+        self.en = en
+        self.clk = clk
+        self.data = data
+
+    def on_edge(self, gpio, value, levels):
+        if gpio == self.clk and value:
+            self._head = (self._head - 1) % self.nbits
+            self._ring[self._head] = levels.get(self.data, 0)
+            self.total_clocks += 1
+            self.window_clocks += 1
+        elif gpio == self.en:
+            if value:
+                self._latch()
+            else:
+                self.window_clocks = 0
+
+    def register(self, register):
+        """
+        Current (unlatched) shift register content for register 1..nbits.
+        """
+        return self._ring[(self._head + register - 1) % self.nbits]
+
+    def _latch(self):
+        latched = PackedBitstream(self.nbits)
+        data = latched.data
+        ring = self._ring
+        head = self._head
+        n = self.nbits
+        for i in range(n):
+            if ring[(head + i) % n]:
+                data[i >> 3] |= 1 << (i & 7)
+        self.latched = latched
+        self.latch_count += 1
+        self.last_window_clocks = self.window_clocks
+
+    def latched_bitstream(self):
+        return self.latched
+
+    def latched_bits(self):
+        return list(self.latched)
+
+
+class EmulatedBoard:
+    """
+    GPIO level store that notifies attached chips and records edges.
+    """
+
+    def __init__(self, clock=None, pin_overhead_ns=0, record_edges=True):
+        self.clock = clock or VirtualClock()
+        self.pin_overhead_ns = pin_overhead_ns
+        self.levels = {}
+        self.chips = []
+        self.edges = [] if record_edges else None
+        self.pin_writes = 0
+        self.port_writes = 0
+        self.time = TimeShim(self.clock)
+        self.machine = _MachineShim(self)
+        self.rp2 = _Rp2Shim(self)
+
+    def attach_chip(self, chip, en, clk, data):
+        chip.connect(en, clk, data)
+        self.chips.append(chip)
+        return chip
+
+    def pin(self, gpio, mode=-1, pull=-1, value=None):
+        return EmulatedPin(self, gpio, mode, pull, value)
+
+    def read(self, gpio):
+        return self.levels.get(gpio, 0)
+
+    def write(self, gpio, value):
+        # Charge the modelled pin cost, then stop the clock so the emulator's
+        # own work (edge log, chip model) does not count as driver time.
+        self.clock.advance_ns(self.pin_overhead_ns)
+        token = self.clock.pause()
+        self.pin_writes += 1
+        self.drive(gpio, value)
+        self.clock.resume(token)
+
+    def drive(self, gpio, value):
+        """
+        Change a pin level without CPU cost (used by PIO state machines).
+        """
+        value = 1 if value else 0
+        if self.levels.get(gpio, 0) == value:
+            return
+        now = self.clock.now_ns()
+        token = self.clock.pause()
+        self.levels[gpio] = value
+        if self.edges is not None:
+            self.edges.append((now, gpio, value))
+        for chip in self.chips:
+            chip.on_edge(gpio, value, self.levels)
+        self.clock.resume(token)
+
+    def write_masks(self, set_mask, clear_mask, toggle_mask=0):
+        """
+        Apply a GPIO port write (SIO OUT_SET / OUT_CLR / OUT_XOR) atomically.
+        """
+        self.clock.advance_ns(self.pin_overhead_ns)
+        token = self.clock.pause()
+        self.pin_writes += 1
+        self.port_writes += 1
+        now = self.clock.now_ns()
+        if toggle_mask:
+            levels = self.levels_mask()
+            set_mask |= toggle_mask & ~levels
+            clear_mask |= toggle_mask & levels
+        changed = []
+        gpio = 0
+        mask = set_mask | clear_mask
+        while mask:
+            if mask & 1:
+                value = 1 if (set_mask >> gpio) & 1 else 0
+                if self.levels.get(gpio, 0) != value:
+                    self.levels[gpio] = value
+                    changed.append((gpio, value))
+            mask >>= 1
+            gpio += 1
+        for gpio, value in changed:
+            if self.edges is not None:
+                self.edges.append((now, gpio, value))
+            for chip in self.chips:
+                chip.on_edge(gpio, value, self.levels)
+        self.clock.resume(token)
+
+    def levels_mask(self):
+        mask = 0
+        for gpio, value in self.levels.items():
+            if value:
+                mask |= 1 << gpio
+        return mask
+
+    def install(self, *modules):
+        """
+        Route `machine`, `rp2` and `time` imports to this board.
+
+        Call it before the runtime modules are imported. Modules imported
+        earlier (e.g. driver) are passed explicitly so their module-level
+        `time` reference is rebound as well.
+        """
+        sys.modules["machine"] = self.machine
+        sys.modules["rp2"] = self.rp2
+        sys.modules["time"] = self.time
+        for module in modules:
+            if hasattr(module, "time"):
+                module.time = self.time
+
+    def rising_edges(self, gpio):
+        if self.edges is None:
+            return []
+        return [t for t, g, v in self.edges if g == gpio and v == 1]
+
+    def half_periods(self, gpio):
+        """
+        Return (high_ns, low_ns) lists of completed high/low phases of a pin.
+
+        Low phases are only counted between two rising edges.
+        """
+        if self.edges is None:
+            return [], []
+        high = []
+        low = []
+        last_rise = None
+        last_fall = None
+        for t, g, v in self.edges:
+            if g != gpio:
+                continue
+            if v:
+                if last_fall is not None and last_rise is not None:
+                    low.append(t - last_fall)
+                last_rise = t
+            elif last_rise is not None:
+                high.append(t - last_rise)
+                last_fall = t
+        return high, low
+
+    def report(self, chip=None):
+        """
+        Return clocking statistics from the recorded edges.
+        """
+        chip = chip or (self.chips[0] if self.chips else None)
+        out = {"pin_writes": self.pin_writes, "elapsed_us": self.clock.now_ns() / 1000}
+        if chip is None:
+            return out
+        out["clocks"] = chip.total_clocks
+        out["last_window_clocks"] = chip.last_window_clocks
+        out["latches"] = chip.latch_count
+        rises = self.rising_edges(chip.clk)
+        high, low = self.half_periods(chip.clk)
+        if high:
+            out["min_high_us"] = min(high) / 1000
+        if low:
+            out["min_low_us"] = min(low) / 1000
+        if len(rises) >= 2:
+            span_ns = rises[-1] - rises[0]
+            period_ns = span_ns / (len(rises) - 1)
+            out["clock_period_us"] = period_ns / 1000
+            out["clock_hz"] = 1000000000 / period_ns if period_ns else None
+            out["bits_per_second"] = out["clock_hz"]
+        return out
+
+
+class _Mem32Shim:
+    """
+    machine.mem32 stand-in mapping the RP2040 SIO GPIO registers to the board.
+    """
+
+    def __init__(self, board):
+        self.board = board
+
+    def __getitem__(self, address):
+        if address in (SIO_BASE + 0x004, SIO_BASE + 0x010):
+            return self.board.levels_mask()
+        raise ValueError("mem32 read of unemulated address 0x{:08x}".format(address))
+
+    def __setitem__(self, address, value):
+        offset = address - SIO_BASE
+        all_pins = (1 << GPIO_COUNT) - 1
+        if offset == 0x010:
+            self.board.write_masks(value & all_pins, ~value & all_pins)
+        elif offset == 0x014:
+            self.board.write_masks(value, 0)
+        elif offset == 0x018:
+            self.board.write_masks(0, value)
+        elif offset == 0x01C:
+            self.board.write_masks(0, 0, value)
+        else:
+            raise ValueError("mem32 write to unemulated address 0x{:08x}".format(address))
+
+
+class _MachineShim:
+    def __init__(self, board):
+        board_ref = board
+
+        class Pin(EmulatedPin):
+            def __init__(self, gpio, mode=-1, pull=-1, value=None):
+                EmulatedPin.__init__(self, board_ref, gpio, mode, pull, value)
+
+        self.Pin = Pin
+        self.mem32 = _Mem32Shim(board)
+
+
+class PioInstruction:
+    """
+    One recorded PIO instruction; .side(v) and [delay] mirror rp2.asm_pio.
+    """
+
+    def __init__(self, op, args):
+        self.op = op
+        self.args = args
+        self.side_value = None
+        self.delay = 0
+
+    def side(self, value):
+        self.side_value = value
+        return self
+
+    def __getitem__(self, delay):
+        self.delay = delay
+        return self
+
+
+class PioProgram:
+    def __init__(self, name, instructions, labels, options):
+        self.name = name
+        self.instructions = instructions
+        self.labels = labels
+        self.options = options
+
+
+_PIO_SYMBOLS = ("block", "noblock", "x", "y", "pins", "null", "isr", "osr", "x_dec", "y_dec", "not_x", "not_y")
+
+
+def asm_pio(**options):
+    """
+    Record the instructions of an rp2.asm_pio program function.
+
+    Like MicroPython's assembler, the PIO names are injected into the
+    function's globals only while it runs. That needs function.__globals__,
+    so PIO emulation is CPython-only (see the module docstring).
+    """
+
+    def decorator(func):
+        instructions = []
+        labels = {}
+
+        def emit(op):
+            def instruction(*args):
+                instr = PioInstruction(op, args)
+                instructions.append(instr)
+                return instr
+
+            return instruction
+
+        def label(name):
+            labels[name] = len(instructions)
+
+        names = {"label": label}
+        for op in ("pull", "push", "out", "jmp", "nop"):
+            names[op] = emit(op)
+        for symbol in _PIO_SYMBOLS:
+            names[symbol] = symbol
+        func_globals = getattr(func, "__globals__", None)
+        if func_globals is None:
+            raise NotImplementedError("PIO emulation needs function.__globals__; run it under CPython")
+        saved = {}
+        for key, value in names.items():
+            if key in func_globals:
+                saved[key] = func_globals[key]
+            func_globals[key] = value
+        try:
+            func()
+        finally:
+            for key in names:
+                if key in saved:
+                    func_globals[key] = saved[key]
+                else:
+                    del func_globals[key]
+        return PioProgram(func.__name__, instructions, labels, options)
+
+    return decorator
+
+
+class _PioConstants:
+    IN_LOW = 0
+    IN_HIGH = 1
+    OUT_LOW = 2
+    OUT_HIGH = 3
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+
+
+class EmulatedStateMachine:
+    """
+    rp2.StateMachine stand-in that runs a recorded PioProgram on the board.
+
+    The FIFOs are unbounded and the machine runs synchronously inside put()
+    until it stalls on an empty TX FIFO, advancing the board clock by one
+    PIO cycle per instruction (plus delays).
+    """
+
+    def __init__(self, board, sm_id, program, freq, out_base=None, sideset_base=None):
+        if not isinstance(program, PioProgram):
+            raise ValueError("program must come from rp2.asm_pio")
+        if freq <= 0:
+            raise ValueError("freq must be > 0")
+        self.board = board
+        self.sm_id = sm_id
+        self.program = program
+        self.freq = freq
+        self.out_base = out_base.gpio if out_base is not None else None
+        self.sideset_base = sideset_base.gpio if sideset_base is not None else None
+        options = program.options
+        self.autopull = options.get("autopull", False)
+        self.pull_thresh = options.get("pull_thresh", 32)
+        self.shift_left = options.get("out_shiftdir", _PioConstants.SHIFT_RIGHT) == _PioConstants.SHIFT_LEFT
+        self.tx = []
+        self.rx = []
+        self.running = False
+        self.pc = 0
+        self.x = 0
+        self.y = 0
+        self.osr = 0
+        self.osr_count = 32
+        self.cycles = 0
+        self._ns_per_cycle = 1000000000 / freq
+        self._pending_ns = 0.0
+        if self.out_base is not None and options.get("out_init") in (_PioConstants.OUT_LOW, _PioConstants.OUT_HIGH):
+            board.drive(self.out_base, options["out_init"] == _PioConstants.OUT_HIGH)
+        if self.sideset_base is not None and options.get("sideset_init") in (_PioConstants.OUT_LOW, _PioConstants.OUT_HIGH):
+            board.drive(self.sideset_base, options["sideset_init"] == _PioConstants.OUT_HIGH)
+
+    def active(self, value=None):
+        if value is None:
+            return self.running
+        self.running = bool(value)
+        if self.running:
+            self._run()
+
+    def put(self, value, shift=0):
+        if isinstance(value, int):
+            value = (value,)
+        for word in value:
+            self.tx.append((word << shift) & 0xFFFFFFFF)
+        if self.running:
+            self._run()
+
+    def get(self, buf=None, shift=0):
+        if not self.rx:
+            raise ValueError("state machine {} would block: RX FIFO empty".format(self.sm_id))
+        return self.rx.pop(0) >> shift
+
+    def rx_fifo(self):
+        return len(self.rx)
+
+    def tx_fifo(self):
+        return len(self.tx)
+
+    def _tick(self, cycles):
+        self.cycles += cycles
+        self._pending_ns += cycles * self._ns_per_cycle
+        whole = int(self._pending_ns)
+        self._pending_ns -= whole
+        self.board.clock.advance_ns(whole)
+
+    def _shift_out(self, count):
+        count = 32 if count == 0 else count
+        mask = (1 << count) - 1
+        if self.shift_left:
+            value = (self.osr >> (32 - count)) & mask
+            self.osr = (self.osr << count) & 0xFFFFFFFF
+        else:
+            value = self.osr & mask
+            self.osr >>= count
+        self.osr_count += count
+        return value
+
+    def _step(self):
+        """
+        Execute one instruction; return False if it stalls.
+        """
+        instr = self.program.instructions[self.pc]
+        if self.sideset_base is not None:
+            self.board.drive(self.sideset_base, instr.side_value or 0)
+        next_pc = self.pc + 1
+        op = instr.op
+        if op == "pull":
+            if not self.tx:
+                return False
+            self.osr = self.tx.pop(0)
+            self.osr_count = 0
+        elif op == "push":
+            self.rx.append(0)
+        elif op == "out":
+            dest, count = instr.args
+            if self.autopull and self.osr_count >= self.pull_thresh:
+                if not self.tx:
+                    return False
+                self.osr = self.tx.pop(0)
+                self.osr_count = 0
+            value = self._shift_out(count)
+            if dest == "pins":
+                for bit in range(count):
+                    self.board.drive(self.out_base + bit, (value >> bit) & 1)
+            elif dest == "x":
+                self.x = value
+            elif dest == "y":
+                self.y = value
+            elif dest != "null":
+                raise ValueError("unsupported out destination '{}'".format(dest))
+        elif op == "jmp":
+            if len(instr.args) == 1:
+                cond, target = None, instr.args[0]
+            else:
+                cond, target = instr.args
+            taken = True
+            if cond == "x_dec":
+                taken = self.x != 0
+                self.x = (self.x - 1) & 0xFFFFFFFF
+            elif cond == "y_dec":
+                taken = self.y != 0
+                self.y = (self.y - 1) & 0xFFFFFFFF
+            elif cond == "not_x":
+                taken = self.x == 0
+            elif cond == "not_y":
+                taken = self.y == 0
+            elif cond is not None:
+                raise ValueError("unsupported jmp condition '{}'".format(cond))
+            if taken:
+                next_pc = self.program.labels[target]
+        elif op != "nop":
+            raise ValueError("unsupported PIO instruction '{}'".format(op))
+        self.pc = next_pc % len(self.program.instructions)
+        self._tick(1 + instr.delay)
+        return True
+
+    def _run(self):
+        while self.running and self._step():
+            pass
+
+
+class _Rp2Shim:
+    def __init__(self, board):
+        board_ref = board
+
+        class StateMachine(EmulatedStateMachine):
+            def __init__(self, sm_id, program, freq=125000000, out_base=None, sideset_base=None, **kwargs):
+                EmulatedStateMachine.__init__(self, board_ref, sm_id, program, freq, out_base, sideset_base)
+
+        self.StateMachine = StateMachine
+        self.PIO = _PioConstants
+        self.asm_pio = asm_pio
+
+
+def _usage():
+    return (
+        "Usage: mosbius_emulator.py [config.json[,chip1.json,...]] [--bitstream file] [--v1 connections.json]\n"
+        "                           [--t-half-us N] [--pin-overhead-ns N] [--real-time]\n"
+        "                           [--engine generic|pio] [--pio-clock-hz N]\n"
+        "                           [--clock-mode fixed|fastest] [--min-half-ns N]\n"
+        "                           [--parallel GPIO=config.json,GPIO=config.json,...]\n"
+        "                           [--async [--max-burst-us N]]\n"
+    )
+
+
+_VALUE_OPTIONS = (
+    "--bitstream",
+    "--v1",
+    "--t-half-us",
+    "--pin-overhead-ns",
+    "--engine",
+    "--pio-clock-hz",
+    "--parallel",
+    "--clock-mode",
+    "--min-half-ns",
+    "--max-burst-us",
+)
+
+
+def _parse_args(argv):
+    opts = {
+        "config": None,
+        "bitstream": None,
+        "v1": None,
+        "t_half_us": 10,
+        "pin_overhead_ns": 0,
+        "real_time": False,
+        "engine": "generic",
+        "pio_clock_hz": None,
+        "parallel": None,
+        "clock_mode": "fixed",
+        "min_half_ns": None,
+        "async": False,
+        "max_burst_us": None,
+    }
+    positionals = []
+    i = 1
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("-h", "--help"):
+            print(_usage())
+            raise SystemExit(0)
+        if arg in _VALUE_OPTIONS:
+            if i + 1 >= len(argv):
+                raise ValueError("Missing value for {}".format(arg))
+            value = argv[i + 1]
+            if arg == "--bitstream":
+                opts["bitstream"] = value
+            elif arg == "--v1":
+                opts["v1"] = value
+            elif arg == "--t-half-us":
+                opts["t_half_us"] = int(value)
+            elif arg == "--engine":
+                opts["engine"] = value
+            elif arg == "--pio-clock-hz":
+                opts["pio_clock_hz"] = int(value)
+            elif arg == "--clock-mode":
+                opts["clock_mode"] = value
+            elif arg == "--min-half-ns":
+                opts["min_half_ns"] = int(value)
+            elif arg == "--max-burst-us":
+                opts["max_burst_us"] = int(value)
+            elif arg == "--parallel":
+                targets = []
+                for item in value.split(","):
+                    if "=" not in item:
+                        raise ValueError("--parallel entries must be GPIO=config.json, got '{}'".format(item))
+                    gpio, path = item.split("=", 1)
+                    targets.append((int(gpio), path))
+                opts["parallel"] = targets
+            else:
+                opts["pin_overhead_ns"] = int(value)
+            i += 1
+        elif arg == "--real-time":
+            opts["real_time"] = True
+        elif arg == "--async":
+            opts["async"] = True
+        else:
+            positionals.append(arg)
+        i += 1
+    if len(positionals) > 1:
+        raise ValueError("Too many positional arguments")
+    if positionals:
+        opts["config"] = positionals[0]
+    return opts
+
+
+def _print_report(report):
+    keys = sorted(report.keys())
+    print("  " + ", ".join("{}={}".format(k, report[k]) for k in keys))
+
+
+def _run_v2(opts, board):
+    # Shims go into sys.modules before the runtime modules import machine/time.
+    board.install()
+    import driver
+    import pio_shift
+
+    board.install(driver, pio_shift)
+    pin_en = board.machine.Pin(18, board.machine.Pin.OUT)
+    pin_clk = board.machine.Pin(17, board.machine.Pin.OUT)
+    pin_data = board.machine.Pin(16, board.machine.Pin.OUT)
+
+    # A comma-separated list programs a daisy chain (first config nearest DATA).
+    configs = (opts["config"] or (_V2_DIR + "/config.json")).split(",")
+    for i, config in enumerate(configs):
+        if not config.startswith("/"):
+            import os
+
+            configs[i] = os.getcwd() + "/" + config
+    drv = driver.MOSbiusV2Driver(
+        pin_en=pin_en,
+        pin_clk=pin_clk,
+        pin_data=pin_data,
+        t_clk_half_cycle_us=opts["t_half_us"],
+        config_file=configs if len(configs) > 1 else configs[0],
+        fingerprint_file=None,
+        cache_dir=None,
+        shift_engine=opts["engine"],
+        pin_numbers=(18, 17, 16),
+        pio_clock_hz=opts["pio_clock_hz"],
+        clock_mode=opts["clock_mode"],
+        min_half_cycle_ns=opts["min_half_ns"] or driver.DEFAULT_MIN_HALF_CYCLE_NS,
+    )
+    if opts["bitstream"]:
+        from packed_bitstream import load_bitstream
+
+        expected = load_bitstream(opts["bitstream"])
+        source = opts["bitstream"]
+        chip = board.attach_chip(ShiftChainModel(expected.nbits), en=18, clk=17, data=16)
+        driver._program_bitstream(expected, pin_en, pin_clk, pin_data, opts["t_half_us"])
+    elif opts["async"]:
+        source = ", ".join(drv.config_paths)
+        expected, chip = _program_async(opts, board, drv)
+    else:
+        expected = drv.build_bitstream_from_config()
+        source = ", ".join(drv.config_paths)
+        # N chained dies behave like one N * 2008-bit scan chain.
+        chip = board.attach_chip(ShiftChainModel(expected.nbits), en=18, clk=17, data=16)
+        drv.program_bitstream(expected, force=True)
+    if not opts["bitstream"]:
+        opts["target_half_ns"] = drv.clock_plan(drv._resolve_engine()).target_ns
+    return source, expected, chip
+
+
+def _program_async(opts, board, drv):
+    """
+    Run drv.build_async/program_bitstream_async next to a ticker task.
+
+    The ticker records the virtual time of each event-loop turn it gets, so
+    the longest gap is the longest the driver held the CPU.
+    """
+    import asyncio
+
+    board.install()
+    import async_program
+    import driver
+
+    board.install(async_program)
+    max_burst_us = opts["max_burst_us"] or driver.DEFAULT_MAX_BURST_US
+    turns = []
+    result = {}
+
+    async def ticker(done):
+        while not done.is_set():
+            turns.append(board.clock.now_ns())
+            await asyncio.sleep(0)
+
+    async def program():
+        done = asyncio.Event()
+        task = asyncio.create_task(ticker(done))
+        await asyncio.sleep(0)
+        try:
+            bitstream = await drv.build_async()
+            chip = board.attach_chip(ShiftChainModel(bitstream.nbits), en=18, clk=17, data=16)
+            start = len(turns)
+            await drv.program_bitstream_async(bitstream, force=True, max_burst_us=max_burst_us)
+            result["bitstream"] = bitstream
+            result["chip"] = chip
+            result["shift_turns"] = turns[start:] + [board.clock.now_ns()]
+        finally:
+            done.set()
+            await task
+
+    asyncio.run(program())
+    shift_turns = result["shift_turns"]
+    gaps = [b - a for a, b in zip(shift_turns, shift_turns[1:])]
+    if gaps and max(gaps) > max_burst_us * 1000:
+        raise ValueError("async shift held the CPU for {} us (max burst {} us)".format(max(gaps) / 1000, max_burst_us))
+    opts["async_report"] = {
+        "async_turns": len(turns),
+        "shift_turns": len(shift_turns) - 1,
+        "max_stall_us": max(gaps) / 1000 if gaps else 0,
+    }
+    return result["bitstream"], result["chip"]
+
+
+def _run_parallel(opts, board):
+    import os
+
+    board.install()
+    import driver
+    import parallel_shift
+
+    board.install(driver, parallel_shift)
+    pin_en = board.machine.Pin(18, board.machine.Pin.OUT)
+    pin_clk = board.machine.Pin(17, board.machine.Pin.OUT)
+    targets = []
+    for gpio, path in opts["parallel"]:
+        targets.append((gpio, path if path.startswith("/") else os.getcwd() + "/" + path))
+    drv = driver.MOSbiusV2Driver(
+        pin_en=pin_en,
+        pin_clk=pin_clk,
+        pin_data=None,
+        t_clk_half_cycle_us=opts["t_half_us"],
+        fingerprint_file=None,
+        cache_dir=None,
+        pin_numbers=(18, 17, None),
+        clock_mode=opts["clock_mode"],
+        min_half_cycle_ns=opts["min_half_ns"] or driver.DEFAULT_MIN_HALF_CYCLE_NS,
+    )
+    data_gpios, bitstreams = drv.build_parallel_bitstreams(targets)
+    results = []
+    for (gpio, path), bitstream in zip(targets, bitstreams):
+        chip = board.attach_chip(ShiftChainModel(bitstream.nbits), en=18, clk=17, data=gpio)
+        results.append(("{} on GPIO{}".format(path, gpio), bitstream, chip))
+    # Calibrate first: its no-op port writes are not part of the shift.
+    opts["target_half_ns"] = drv.clock_plan("parallel").target_ns
+    port_writes = board.port_writes
+    drv.program_parallel_bitstreams(data_gpios, bitstreams, force=True)
+    # One XOR write per falling edge, one SET per rising edge, plus the two idle clears.
+    expected_writes = 2 * bitstreams[0].nbits + 2
+    if board.port_writes - port_writes != expected_writes:
+        raise ValueError(
+            "expected {} port writes, saw {}".format(expected_writes, board.port_writes - port_writes)
+        )
+    return results
+
+
+def _run_v1(opts, board, chip):
+    import json
+
+    sys.path.insert(0, _V2_DIR + "/../V1")
+    board.install()
+    import MOSbius
+
+    board.install(MOSbius)
+    with open(opts["v1"], "r") as f:
+        connections = json.load(f)
+    mk1 = MOSbius.mosbius_mk1(
+        board.machine.Pin(10, board.machine.Pin.OUT),
+        board.machine.Pin(11, board.machine.Pin.OUT),
+        board.machine.Pin(12, board.machine.Pin.OUT),
+    )
+    mk1.T_CLK_HALF_CYCLE_US = opts["t_half_us"]
+    mk1.create_bitstream(connections)
+    mk1.program_bitstream()
+    return opts["v1"], PackedBitstream.from_bits(mk1.bitstream)
+
+
+def main():
+    opts = _parse_args(sys.argv)
+    board = EmulatedBoard(
+        clock=VirtualClock(real_time=opts["real_time"]),
+        pin_overhead_ns=opts["pin_overhead_ns"],
+    )
+    if opts["v1"]:
+        chip = board.attach_chip(ShiftChainModel(650), en=10, clk=11, data=12)
+        source, expected = _run_v1(opts, board, chip)
+        results = [(source, expected, chip)]
+    elif opts["parallel"]:
+        results = _run_parallel(opts, board)
+    else:
+        results = [_run_v2(opts, board)]
+
+    for source, expected, chip in results:
+        _check_chip(source, expected, chip)
+    # Runs through the driver record its plan's target; the rest use plain sleep_us(t).
+    _check_half_periods(board, results[0][2], opts.get("target_half_ns") or opts["t_half_us"] * 1000)
+    report = board.report(results[0][2])
+    report.update(opts.get("async_report") or {})
+    _print_report(report)
+
+
+def _check_half_periods(board, chip, target_ns):
+    high, low = board.half_periods(chip.clk)
+    for name, phases in (("high", high), ("low", low)):
+        if phases and min(phases) < target_ns:
+            raise ValueError(
+                "CLK {} phase of {} us is shorter than the {} us target".format(
+                    name, min(phases) / 1000, target_ns / 1000
+                )
+            )
+
+
+def _check_chip(source, expected, chip):
+    if chip.latch_count != 1:
+        raise ValueError("expected exactly one EN latch, saw {}".format(chip.latch_count))
+    if chip.last_window_clocks != chip.nbits:
+        raise ValueError(
+            "clocked {} bits in the EN window, chain length is {}".format(
+                chip.last_window_clocks, chip.nbits
+            )
+        )
+    latched = chip.latched_bitstream()
+    if latched != expected:
+        for i in range(expected.nbits):
+            if latched.get(i) != expected.get(i):
+                raise ValueError(
+                    "latched register {} = {}, expected {}".format(i + 1, latched.get(i), expected.get(i))
+                )
+    print("PASS: latched registers match {} ({} bits, {} set)".format(source, expected.nbits, expected.count()))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ValueError as exc:
+        print("FAIL: {}".format(exc))
+        raise SystemExit(1)
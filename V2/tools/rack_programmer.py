@@ -0,0 +1,404 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import shlex
+import sys
+import time
+import tty
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+LIB_DIR = BASE_DIR.parent / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from frame_stream import DEFAULT_TIMEOUT_MS, MAX_FRAME_PAYLOAD, REASON_CRC, encode_frame, parse_response
+
+DEFAULT_TIMEOUT_S = 5.0
+DEFAULT_RETRIES = 2
+DEFAULT_FRAME_SIZE = 64
+DEFAULT_CACHE_DIR = "/tmp/mosbius_rack_cache"
+DEFAULT_CACHE_BUDGET_BYTES = 16 * 1024 * 1024
+DISCOVER_PATTERNS = ("/dev/ttyACM*", "/dev/tty.usbmodem*")
+RESYNC_QUIET_S = 0.2
+
+
+class ServerError(Exception):
+    pass
+
+
+class AsyncCommandLink:
+    """
+    Non-blocking counterpart of mosbius_client.CommandLink for one board.
+    """
+
+    def __init__(self, fd, name, process=None):
+        self.fd = fd
+        self.name = name
+        self.process = process
+        self.closed = False
+        self._pending = bytearray()
+        self._data = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        os.set_blocking(fd, False)
+        self._loop.add_reader(fd, self._on_readable)
+
+    @classmethod
+    async def open_port(cls, port):
+        fd = os.open(port, os.O_RDWR | os.O_NOCTTY)
+        tty.setraw(fd)
+        return cls(fd, port)
+
+    @classmethod
+    async def spawn(cls, command, name):
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        args = shlex.split(command)
+        process = await asyncio.create_subprocess_exec(*args, stdin=slave, stdout=slave, close_fds=True)
+        os.close(slave)
+        link = cls(master, name, process=process)
+        await link.read_reply()  # "@OK {"ready": true}"
+        return link
+
+    def _on_readable(self):
+        try:
+            chunk = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self.closed = True
+            self._loop.remove_reader(self.fd)
+        self._pending += chunk
+        self._data.set()
+
+    async def close(self):
+        if not self.closed:
+            self._loop.remove_reader(self.fd)
+            self.closed = True
+        os.close(self.fd)
+        if self.process is not None:
+            try:
+                await asyncio.wait_for(self.process.wait(), DEFAULT_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+
+    async def _fill(self, done):
+        while not done():
+            if self.closed:
+                raise ConnectionError("{} closed the connection".format(self.name))
+            self._data.clear()
+            await self._data.wait()
+
+    async def write(self, data):
+        view = memoryview(data)
+        while view:
+            try:
+                n = os.write(self.fd, view)
+            except BlockingIOError:
+                writable = self._loop.create_future()
+                self._loop.add_writer(self.fd, writable.set_result, None)
+                try:
+                    await writable
+                finally:
+                    self._loop.remove_writer(self.fd)
+                continue
+            view = view[n:]
+
+    async def read_exact(self, nbytes):
+        await self._fill(lambda: len(self._pending) >= nbytes)
+        data = bytes(self._pending[:nbytes])
+        del self._pending[:nbytes]
+        return data
+
+    async def read_line(self):
+        await self._fill(lambda: b"\n" in self._pending)
+        end = self._pending.index(b"\n")
+        line = bytes(self._pending[:end])
+        del self._pending[: end + 1]
+        return line.decode("utf-8", "replace").rstrip("\r")
+
+    async def read_reply(self):
+        while True:
+            line = await self.read_line()
+            if line.startswith("@OK "):
+                return json.loads(line[4:])
+            if line.startswith("@ERR "):
+                raise ServerError(line[5:])
+
+    async def request(self, command):
+        await self.write((command + "\n").encode())
+        return await self.read_reply()
+
+    async def stream_bitstream(self, bitstream, force=False, frame_size=DEFAULT_FRAME_SIZE):
+        await self.write("STREAM {}{}\n".format(bitstream.nbits, " force" if force else "").encode())
+        data = bytes(bitstream.data)
+        frame_count = (len(data) + frame_size - 1) // frame_size
+        for index in range(frame_count):
+            frame = encode_frame(index, data[index * frame_size : (index + 1) * frame_size], index == frame_count - 1)
+            while True:
+                await self.write(frame)
+                response = await self.read_exact(4)
+                if response.startswith(b"@"):
+                    self._pending[:0] = response
+                    return await self.read_reply()
+                ack, reason, _ = parse_response(response)
+                if ack:
+                    break
+                if reason != REASON_CRC:
+                    return await self.read_reply()
+        return await self.read_reply()
+
+    async def resync(self, timeout_s):
+        """
+        Drop whatever a failed attempt left in flight and wait for a PING reply.
+
+        A device still inside STREAM may read the PING as frame bytes and
+        answer @ERR once its frame timeout expires; PING is then sent again.
+        """
+        deadline = time.monotonic() + timeout_s
+        while time.monotonic() < deadline:
+            # Let the device finish (or time out) the interrupted command first.
+            while True:
+                self._data.clear()
+                try:
+                    await asyncio.wait_for(self._data.wait(), RESYNC_QUIET_S)
+                except asyncio.TimeoutError:
+                    break
+                if self.closed:
+                    raise ConnectionError("{} closed the connection".format(self.name))
+            del self._pending[:]
+            await self.write(b"\nPING\n")
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    line = await asyncio.wait_for(self.read_line(), max(remaining, 0.01))
+                    # Stray ACK bytes can precede a reply on the same line.
+                    if "@OK " in line and "version" in line:
+                        return
+                    if "@ERR " in line:
+                        break
+            except asyncio.TimeoutError:
+                pass
+        raise TimeoutError("{} did not answer PING".format(self.name))
+
+
+def _discover_ports():
+    ports = []
+    for pattern in DISCOVER_PATTERNS:
+        ports.extend(sorted(glob.glob(pattern)))
+    return ports
+
+
+def _load_rack(path):
+    """
+    Return [(port, config)] from a rack file: {"boards": [{"port": ..., "config": ...}]}.
+
+    config may be a list of paths for a daisy chain.
+    """
+    rack = json.loads(Path(path).read_text())
+    boards = []
+    for i, entry in enumerate(rack.get("boards", [])):
+        if "port" not in entry:
+            raise ValueError("{}: board {} has no 'port'".format(path, i))
+        boards.append((entry["port"], entry.get("config")))
+    return boards
+
+
+def build_bitstreams(configs, cache_dir):
+    """
+    Build each distinct config once through the driver's build cache.
+
+    Returns ({config_key: PackedBitstream}, cache_hits).
+    """
+    from driver import MOSbiusV2Driver
+
+    bitstreams = {}
+    hits = 0
+    for config in configs:
+        key = tuple(config)
+        if key in bitstreams:
+            continue
+        driver = MOSbiusV2Driver(
+            pin_en=None,
+            pin_clk=None,
+            pin_data=None,
+            t_clk_half_cycle_us=10,
+            config_file=list(config) if len(config) > 1 else config[0],
+            pin_map_path=str(LIB_DIR / "pin_name_to_sw_matrix_pin_number.json"),
+            fingerprint_file=None,
+            cache_dir=cache_dir,
+            cache_budget_bytes=DEFAULT_CACHE_BUDGET_BYTES,
+            collect_stats=True,
+        )
+        bitstreams[key] = driver.build_bitstream_from_config()
+        if driver.stats.values.get("cache_hit"):
+            hits += 1
+    return bitstreams, hits
+
+
+async def program_board(board, bitstream, opts):
+    """
+    Connect, stream and program one board with per-attempt timeouts and retries.
+    """
+    result = {
+        "board": board["name"],
+        "config": ", ".join(board["config"]),
+        "ok": False,
+        "attempts": 0,
+        "latency_ms": None,
+        "total_ms": None,
+        "programmed": None,
+        "clock_hz": None,
+        "naks": 0,
+        "verified": None,
+        "error": None,
+    }
+    start = time.monotonic()
+    link = None
+    try:
+        if board["spawn"]:
+            link = await asyncio.wait_for(AsyncCommandLink.spawn(board["spawn"], board["name"]), opts.timeout)
+        else:
+            link = await asyncio.wait_for(AsyncCommandLink.open_port(board["port"]), opts.timeout)
+        for attempt in range(1, opts.retries + 2):
+            result["attempts"] = attempt
+            attempt_start = time.monotonic()
+            try:
+                reply = await asyncio.wait_for(
+                    link.stream_bitstream(bitstream, force=opts.force, frame_size=opts.frame_size), opts.timeout
+                )
+            except (asyncio.TimeoutError, ServerError, ValueError, OSError) as e:
+                result["error"] = "{}: {}".format(type(e).__name__, e) if str(e) else type(e).__name__
+                if attempt <= opts.retries:
+                    # Allow for the device's own frame timeout on the abandoned stream.
+                    await link.resync(opts.timeout + 2 * DEFAULT_TIMEOUT_MS / 1000)
+                continue
+            result["latency_ms"] = round((time.monotonic() - attempt_start) * 1000, 1)
+            result["programmed"] = reply.get("programmed")
+            result["clock_hz"] = reply.get("clock_hz")
+            result["naks"] = reply.get("naks", 0)
+            result["ok"] = True
+            result["error"] = None
+            break
+        if result["ok"] and board["spawn"]:
+            # An emulated board can show what it latched, so a skip cannot pass for a program.
+            reply = await asyncio.wait_for(link.request("LATCHED"), opts.timeout)
+            result["verified"] = reply["latched"] == bytes(bitstream.data).hex()
+            if not result["verified"]:
+                result["ok"] = False
+                result["error"] = "latched registers do not match the bitstream"
+    except (asyncio.TimeoutError, ServerError, ValueError, OSError) as e:
+        result["error"] = "{}: {}".format(type(e).__name__, e) if str(e) else type(e).__name__
+    finally:
+        if link is not None:
+            if board["spawn"]:
+                try:
+                    await asyncio.wait_for(link.request("QUIT"), opts.timeout)
+                except (asyncio.TimeoutError, ServerError, OSError):
+                    pass
+            await link.close()
+    result["total_ms"] = round((time.monotonic() - start) * 1000, 1)
+    return result
+
+
+async def program_rack(boards, bitstreams, opts):
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(program_board(board, bitstreams[tuple(board["config"])], opts) for board in boards)
+    )
+    wall_ms = round((time.monotonic() - start) * 1000, 1)
+    totals = [r["total_ms"] for r in results]
+    summary = {
+        "boards": len(results),
+        "ok": sum(1 for r in results if r["ok"]),
+        "failed": sum(1 for r in results if not r["ok"]),
+        "retried": sum(1 for r in results if r["attempts"] > 1),
+        "wall_ms": wall_ms,
+        "slowest_ms": max(totals) if totals else 0,
+        "sum_ms": round(sum(totals), 1),
+    }
+    return {"summary": summary, "boards": results}
+
+
+def _print_report(report):
+    print("{:<24} {:<4} {:>8} {:>11} {:>9} {}".format("board", "ok", "attempts", "latency_ms", "total_ms", "detail"))
+    for r in report["boards"]:
+        if r["ok"]:
+            detail = "programmed" if r["programmed"] else "unchanged (skipped)"
+            if r["verified"]:
+                detail += ", latch verified"
+            if r["naks"]:
+                detail += ", {} NAKs".format(r["naks"])
+        else:
+            detail = r["error"]
+        print(
+            "{:<24} {:<4} {:>8} {:>11} {:>9} {}".format(
+                r["board"], "yes" if r["ok"] else "NO", r["attempts"], r["latency_ms"] or "-", r["total_ms"], detail
+            )
+        )
+    s = report["summary"]
+    print(
+        "{ok}/{boards} boards ok ({failed} failed, {retried} retried) in {wall_ms} ms; "
+        "slowest board {slowest_ms} ms, serial sum {sum_ms} ms".format(**s)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Program many MOSbius Picos concurrently over their command servers")
+    parser.add_argument("--port", action="append", default=[], help="Serial port of a board (repeatable)")
+    parser.add_argument("--discover", action="store_true", help="Add every port matching {}".format(", ".join(DISCOVER_PATTERNS)))
+    parser.add_argument("--rack", help="JSON rack file: {\"boards\": [{\"port\": ..., \"config\": ...}]}")
+    parser.add_argument("--config", default=str(BASE_DIR.parent / "config.json"), help="Config for boards without one")
+    parser.add_argument("--fake", type=int, default=0, help="Also spawn N emulated boards on pty pairs")
+    parser.add_argument("--fake-args", default="", help="Extra arguments for command_server_host.py")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Per-attempt timeout in seconds")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per board after a failed attempt")
+    parser.add_argument("--frame-size", type=int, default=DEFAULT_FRAME_SIZE, help="Stream payload bytes per frame")
+    parser.add_argument("--force", action="store_true", help="Reprogram even if a board's fingerprint matches")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Shared build cache for per-board bitstreams")
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON")
+    opts = parser.parse_args()
+    if not 0 < opts.frame_size <= MAX_FRAME_PAYLOAD:
+        parser.error("--frame-size must be 1..{}".format(MAX_FRAME_PAYLOAD))
+
+    entries = _load_rack(opts.rack) if opts.rack else []
+    entries += [(port, None) for port in opts.port]
+    if opts.discover:
+        known = set(port for port, _ in entries)
+        entries += [(port, None) for port in _discover_ports() if port not in known]
+    boards = []
+    for port, config in entries:
+        config = config or opts.config
+        boards.append({"name": port, "port": port, "spawn": None, "config": config if isinstance(config, list) else [config]})
+    for i in range(opts.fake):
+        # Each spawn is a fresh, unprogrammed chip: a fingerprint would only make it skip.
+        command = "{} {} --fingerprint none {}".format(
+            shlex.quote(sys.executable), shlex.quote(str(BASE_DIR / "command_server_host.py")), opts.fake_args
+        )
+        boards.append({"name": "fake{}".format(i), "port": None, "spawn": command, "config": [opts.config]})
+    if not boards:
+        parser.error("no boards: pass --port, --discover, --rack or --fake")
+    for board in boards:
+        board["config"] = [str(Path(path).resolve()) for path in board["config"]]
+
+    start = time.monotonic()
+    bitstreams, hits = build_bitstreams([board["config"] for board in boards], opts.cache_dir)
+    print(
+        "Built {} distinct bitstream(s) for {} board(s) ({} from cache) in {:.1f} ms".format(
+            len(bitstreams), len(boards), hits, (time.monotonic() - start) * 1000
+        )
+    )
+
+    report = asyncio.run(program_rack(boards, bitstreams, opts))
+    _print_report(report)
+    if opts.json_path:
+        Path(opts.json_path).write_text(json.dumps(report, indent=2) + "\n")
+    return 0 if report["summary"]["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(os.path.dirname(BASE_DIR), "lib")
+sys.path.insert(0, LIB_DIR)
+
+import register_map_equations as reg_eq
+
+BYTES_PER_LINE = 32
+HEADER = '''"""
+Precompiled switch register table for MOSbius V2.
+
+Generated by V2/tools/register_table_generator.py from the equations in
+register_map_equations.py. Do not edit by hand.
+
+Layout: little-endian uint16 per entry, row-major over switch index
+s = 1..{rows} and bus column 0..{cols_minus_one} (SBUS1a..SBUS6b, RBUS1..RBUS8).
+Entry value 0 marks an undefined combination (RBUS on internal rows).
+"""
+
+'''
+
+
+def _default_output_path():
+    return os.path.join(LIB_DIR, "register_table.py")
+
+
+def _fail(message):
+    raise ValueError(message)
+
+
+def build_table():
+    table = bytearray(2 * reg_eq.SWITCH_ROWS * reg_eq.SWITCH_COLUMNS)
+    for s in range(1, reg_eq.SWITCH_ROWS + 1):
+        sw_pin = reg_eq.switch_row_key(s)
+        if reg_eq.switch_equation_index(sw_pin) != s:
+            _fail("switch_row_key({}) does not round-trip (got {!r})".format(s, sw_pin))
+        for column, bus in enumerate(reg_eq.SWITCH_BUS_COLUMNS):
+            try:
+                register = reg_eq.switch_register(sw_pin, bus)
+            except ValueError:
+                if not bus.startswith("RBUS"):
+                    raise
+                register = 0
+            k = 2 * ((s - 1) * reg_eq.SWITCH_COLUMNS + column)
+            table[k] = register & 0xFF
+            table[k + 1] = register >> 8
+    return bytes(table)
+
+
+def render_module(table):
+    lines = [
+        HEADER.format(rows=reg_eq.SWITCH_ROWS, cols_minus_one=reg_eq.SWITCH_COLUMNS - 1),
+        "SWITCH_REGISTER_TABLE = (\n",
+    ]
+    for i in range(0, len(table), BYTES_PER_LINE):
+        chunk = table[i : i + BYTES_PER_LINE]
+        lines.append('    b"{}"\n'.format("".join("\\x{:02x}".format(b) for b in chunk)))
+    lines.append(")\n")
+    return "".join(lines)
+
+
+def check_table(table):
+    """
+    Verify every table entry against the reference equations.
+    """
+    expected_size = 2 * reg_eq.SWITCH_ROWS * reg_eq.SWITCH_COLUMNS
+    if len(table) != expected_size:
+        _fail("table size mismatch: expected {} bytes, actual {}".format(expected_size, len(table)))
+
+    entries = 0
+    for s in range(1, reg_eq.SWITCH_ROWS + 1):
+        sw_pin = reg_eq.switch_row_key(s)
+        for column, bus in enumerate(reg_eq.SWITCH_BUS_COLUMNS):
+            k = 2 * ((s - 1) * reg_eq.SWITCH_COLUMNS + column)
+            actual = table[k] | (table[k + 1] << 8)
+            try:
+                expected = reg_eq.switch_register(sw_pin, bus)
+            except ValueError:
+                expected = 0
+            if actual != expected:
+                _fail(
+                    "mismatch at row '{}' bus '{}': expected {}, actual {}".format(
+                        sw_pin, bus, expected, actual
+                    )
+                )
+            entries += 1
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile switch-matrix equations into lib/register_table.py"
+    )
+    parser.add_argument(
+        "--output",
+        default=_default_output_path(),
+        help="Path to the generated module (default: V2/lib/register_table.py)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Verify the existing generated table against the equations instead of writing it",
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        namespace = {}
+        with open(args.output, "r") as f:
+            exec(f.read(), namespace)
+        entries = check_table(namespace["SWITCH_REGISTER_TABLE"])
+        print("PASS: register table identical to equations (entries={})".format(entries))
+        return
+
+    table = build_table()
+    check_table(table)
+    with open(args.output, "w") as f:
+        f.write(render_module(table))
+    print("Register table saved to {} ({} bytes)".format(args.output, len(table)))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ValueError as exc:
+        print("FAIL: {}".format(exc))
+        raise SystemExit(1)
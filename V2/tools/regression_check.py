@@ -0,0 +1,132 @@
+"""
+Run the emulator-backed checks of the V2 runtime as one regression pass.
+
+Each case runs a host tool (scan-chain emulator, command-server selftest,
+rack programmer with fake boards) in its own process, so every case gets
+fresh machine/time shims. A case passes when the tool exits 0 and prints
+the expected number of PASS lines; the run fails if any case fails.
+
+    python3 V2/tools/regression_check.py            # all cases
+    python3 V2/tools/regression_check.py pio async  # cases whose name contains "pio" or "async"
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+V2_DIR = BASE_DIR.parent
+DEFAULT_TIMEOUT_S = 120
+
+EMULATOR = str(BASE_DIR / "mosbius_emulator.py")
+CONFIG = str(V2_DIR / "config.json")
+CONFIG_REF = str(BASE_DIR / "config_ref.json")
+HOST = "{} {}".format(sys.executable, BASE_DIR / "command_server_host.py")
+
+# (name, argv, PASS lines expected)
+CASES = (
+    ("emulator-generic", [EMULATOR, CONFIG], 1),
+    ("emulator-daisy-chain", [EMULATOR, CONFIG + "," + CONFIG_REF], 1),
+    ("emulator-loader", [EMULATOR, "--bitstream", str(BASE_DIR / "bitstream.txt")], 1),
+    ("emulator-v1", [EMULATOR, "--v1", str(V2_DIR.parent / "V1" / "connections.json")], 1),
+    ("emulator-fastest", [EMULATOR, "--pin-overhead-ns", "1500", "--clock-mode", "fastest", "--min-half-ns", "2000"], 1),
+    ("emulator-pio", [EMULATOR, "--engine", "pio"], 1),
+    ("emulator-pio-1mhz", [EMULATOR, "--engine", "pio", "--pio-clock-hz", "1000000"], 1),
+    ("emulator-parallel", [EMULATOR, "--parallel", "16={},15={}".format(CONFIG, CONFIG_REF)], 2),
+    (
+        "emulator-parallel-fastest",
+        [
+            EMULATOR,
+            "--parallel",
+            "16={},15={}".format(CONFIG, CONFIG_REF),
+            "--pin-overhead-ns",
+            "1500",
+            "--clock-mode",
+            "fastest",
+            "--min-half-ns",
+            "2000",
+        ],
+        2,
+    ),
+    ("emulator-async", [EMULATOR, "--async", "--max-burst-us", "500"], 1),
+    ("emulator-async-pio", [EMULATOR, "--async", "--engine", "pio"], 1),
+    ("command-server-selftest", [str(BASE_DIR / "mosbius_client.py"), "--spawn", HOST, "selftest"], 1),
+    (
+        "command-server-selftest-fingerprint",
+        [str(BASE_DIR / "mosbius_client.py"), "--spawn", HOST + " --fingerprint {tmp}/fp", "selftest"],
+        1,
+    ),
+    ("rack-fake", [str(BASE_DIR / "rack_programmer.py"), "--fake", "3", "--cache-dir", "{tmp}/cache"], 0),
+    (
+        "rack-fake-retry",
+        [
+            str(BASE_DIR / "rack_programmer.py"),
+            "--fake",
+            "2",
+            "--timeout",
+            "1",
+            "--cache-dir",
+            "{tmp}/cache",
+            "--fake-args=--stall-ms 2500 --stall-count 1",
+        ],
+        0,
+    ),
+)
+
+
+def run_case(argv, expected_passes, tmp_dir, timeout_s):
+    """
+    Return (ok, detail, seconds) for one case.
+    """
+    argv = [sys.executable] + [arg.replace("{tmp}", tmp_dir) for arg in argv]
+    start = time.monotonic()
+    try:
+        out = subprocess.run(argv, capture_output=True, text=True, timeout=timeout_s)
+    except subprocess.TimeoutExpired:
+        return False, "timed out after {} s".format(timeout_s), time.monotonic() - start
+    seconds = time.monotonic() - start
+    lines = (out.stdout + out.stderr).splitlines()
+    passes = sum(1 for line in lines if line.startswith("PASS"))
+    if out.returncode != 0:
+        failures = [line for line in lines if line.startswith("FAIL")] or lines[-3:]
+        return False, "exit {}: {}".format(out.returncode, " | ".join(failures)), seconds
+    if passes < expected_passes:
+        return False, "expected {} PASS line(s), saw {}".format(expected_passes, passes), seconds
+    return True, "{} PASS line(s)".format(passes), seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the emulator-backed V2 regression checks")
+    parser.add_argument("names", nargs="*", help="Only run cases whose name contains one of these")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Per-case timeout in seconds")
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if not args.names or any(name in case[0] for name in args.names)]
+    if args.list:
+        for name, _, _ in cases:
+            print(name)
+        return 0
+    if not cases:
+        parser.error("no case matches {}".format(", ".join(args.names)))
+
+    import tempfile
+
+    failed = []
+    with tempfile.TemporaryDirectory(prefix="mosbius_regression_") as tmp_dir:
+        for name, argv, expected_passes in cases:
+            ok, detail, seconds = run_case(argv, expected_passes, tmp_dir, args.timeout)
+            print("{} {:<36} {:>6.1f} s  {}".format("PASS" if ok else "FAIL", name, seconds, detail))
+            if not ok:
+                failed.append(name)
+    if failed:
+        print("FAIL: {} of {} case(s): {}".format(len(failed), len(cases), ", ".join(failed)))
+        return 1
+    print("PASS: all {} regression case(s)".format(len(cases)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,221 @@
+"""
+Cold-start profile of the V2 runtime: import time and heap per module.
+
+Run it as the first thing in a fresh interpreter, on the Pico
+(`mpremote run V2/tools/startup_benchmark.py`), the unix port or CPython.
+Modules are imported one by one in dependency order, so each row is that
+module's own load cost (compile from .py, load from .mpy, or frozen).
+After the imports it constructs the driver and builds the bitstream the way
+main.py does, and reports the modules that build imported lazily plus the
+time from start to "bitstream ready".
+
+Options:
+  --config PATH     config to build (default: V2/config.json, /config.json on the board)
+  --lib DIR         runtime lib directory (default: V2/lib, /lib on the board)
+  --miss-path       also time the cache-miss modules (json, validation,
+                    builder) one by one and build without the cache
+  --json            print the report as one JSON line
+"""
+
+import gc
+import sys
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def _ticks_us():
+    if hasattr(time, "ticks_us"):
+        return time.ticks_us()
+    return time.perf_counter_ns() // 1000
+
+
+def _ticks_diff(end, start):
+    if hasattr(time, "ticks_diff"):
+        return time.ticks_diff(end, start)
+    return end - start
+
+
+def _heap_used():
+    gc.collect()
+    if hasattr(gc, "mem_alloc"):
+        return gc.mem_alloc()
+    if tracemalloc is not None and tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return None
+
+
+def _dirname(path):
+    if "/" not in path:
+        return "."
+    head = path.rsplit("/", 1)[0]
+    return head if head else "/"
+
+
+_TOOLS_DIR = _dirname(globals().get("__file__", "") or "./startup_benchmark.py")
+_V2_DIR = _dirname(_TOOLS_DIR) if _TOOLS_DIR != "." else ".."
+if not globals().get("__file__"):
+    # `mpremote run` has no __file__: use the board's runtime layout (/lib, /config.json).
+    _V2_DIR = "."
+
+# main.py's import chain, leaves first.
+RUNTIME_MODULES = (
+    "packed_bitstream",
+    "program_stats",
+    "build_cache",
+    "clock_timing",
+    "driver",
+)
+# Imported by the driver only on a build-cache miss.
+MISS_MODULES = (
+    "json",
+    "register_table",
+    "register_map_equations",
+    "config_validation",
+    "bitstream_builder",
+)
+
+
+def _source_kind(module):
+    path = getattr(module, "__file__", None)
+    if not path:
+        return "frozen" if sys.implementation.name == "micropython" else "builtin"
+    if path.endswith(".mpy"):
+        return "mpy"
+    if path.endswith(".py"):
+        return "py"
+    return path.rsplit(".", 1)[-1]
+
+
+class StartupProfile:
+    def __init__(self):
+        self.start_us = _ticks_us()
+        self.rows = []
+
+    def measure(self, name, fn, kind=""):
+        heap_before = _heap_used()
+        t = _ticks_us()
+        result = fn()
+        us = _ticks_diff(_ticks_us(), t)
+        heap_after = _heap_used()
+        heap = heap_after - heap_before if heap_before is not None and heap_after is not None else None
+        self.rows.append({"step": name, "kind": kind, "us": us, "heap_bytes": heap})
+        return result
+
+    def import_module(self, name):
+        if name in sys.modules:
+            self.rows.append({"step": name, "kind": "loaded", "us": 0, "heap_bytes": 0})
+            return sys.modules[name]
+        module = self.measure(name, lambda: __import__(name))
+        self.rows[-1]["kind"] = _source_kind(module)
+        return module
+
+    def elapsed_us(self):
+        return _ticks_diff(_ticks_us(), self.start_us)
+
+
+def _parse_args(argv):
+    opts = {"config": _V2_DIR + "/config.json", "lib": _V2_DIR + "/lib", "miss_path": False, "json": False}
+    i = 1
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("-h", "--help"):
+            print(__doc__)
+            raise SystemExit(0)
+        if arg == "--miss-path":
+            opts["miss_path"] = True
+        elif arg == "--json":
+            opts["json"] = True
+        elif arg in ("--config", "--lib"):
+            if i + 1 >= len(argv):
+                raise ValueError("Missing value for {}".format(arg))
+            opts[arg[2:]] = argv[i + 1]
+            i += 1
+        else:
+            raise ValueError("Unknown argument '{}'".format(arg))
+        i += 1
+    return opts
+
+
+def run(opts):
+    if tracemalloc is not None:
+        tracemalloc.start()
+    profile = StartupProfile()
+    if opts["lib"] not in sys.path:
+        sys.path.insert(0, opts["lib"])
+
+    for name in RUNTIME_MODULES:
+        driver = profile.import_module(name)
+    imports_us = sum(row["us"] for row in profile.rows)
+
+    drv = profile.measure(
+        "driver_init",
+        lambda: driver.MOSbiusV2Driver(
+            pin_en=None,
+            pin_clk=None,
+            pin_data=None,
+            t_clk_half_cycle_us=10,
+            config_file=opts["config"],
+            pin_map_path=opts["lib"] + "/pin_name_to_sw_matrix_pin_number.json",
+            fingerprint_file=None,
+            cache_dir=None if opts["miss_path"] else driver.CACHE_DIRNAME,
+            collect_stats=True,
+        ),
+    )
+    if opts["miss_path"]:
+        for name in MISS_MODULES:
+            profile.import_module(name)
+
+    before = set(sys.modules)
+    bitstream = profile.measure("build", drv.build_bitstream_from_config)
+    lazy = sorted(name for name in sys.modules if name not in before)
+    stats = drv.stats.as_dict()
+    return {
+        "implementation": sys.implementation.name,
+        "rows": profile.rows,
+        "imports_us": imports_us,
+        "ready_us": profile.elapsed_us(),
+        "cache_hit": stats.get("cache_hit"),
+        "build_phases": dict((name, phase["us"]) for name, phase in stats["phases"].items()),
+        "lazy_imports": lazy,
+        "nbits": bitstream.nbits,
+    }
+
+
+def _print_report(report):
+    print("{:<24} {:<8} {:>10} {:>11}".format("step", "source", "us", "heap_bytes"))
+    for row in report["rows"]:
+        heap = row["heap_bytes"]
+        print("{:<24} {:<8} {:>10} {:>11}".format(row["step"], row["kind"], row["us"], "-" if heap is None else heap))
+    print(
+        "imports: {} us; bitstream ready {} us after start ({})".format(
+            report["imports_us"], report["ready_us"], report["implementation"]
+        )
+    )
+    phases = " ".join("{}={}us".format(name, us) for name, us in report["build_phases"].items())
+    print("build: cache_hit={} {}".format(report["cache_hit"], phases))
+    if report["lazy_imports"]:
+        print("imported during build: {}".format(", ".join(report["lazy_imports"])))
+
+
+def main():
+    try:
+        opts = _parse_args(sys.argv)
+    except ValueError as e:
+        print("Error: {}".format(e))
+        return 2
+    report = run(opts)
+    if opts["json"]:
+        import json
+
+        print(json.dumps(report))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+"""
+Write sizing-sweep variants of one config as batched binary files.
+
+    python3 V2/tools/sweep_generator.py V2/config.json --sweep CC_N=0:31 --sweep OTA_P=4,8,16 --output-dir /tmp/sweep
+
+The config is compiled once and each grid point only rewrites the sizing
+bytes (see lib/sizing_sweep.py). Each batch file holds --batch-size packed
+rows of 251 bytes back to back (numpy: np.fromfile(path, np.uint8).reshape(-1, 251));
+points.jsonl lists every row's file, row index and sizes.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+LIB_DIR = BASE_DIR.parent / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from sizing_sweep import NBYTES, sweep_batches, sweep_count
+
+
+def parse_sweep(spec):
+    """
+    Parse DEVICE=LO:HI[:STEP] (HI inclusive) or DEVICE=V1,V2,... into (device, values).
+    """
+    device, sep, values = spec.partition("=")
+    if not sep or not device or not values:
+        raise ValueError("sweep '{}' must look like DEVICE=LO:HI[:STEP] or DEVICE=V1,V2".format(spec))
+    try:
+        if ":" in values:
+            parts = [int(part) for part in values.split(":")]
+            if len(parts) not in (2, 3) or (len(parts) == 3 and parts[2] <= 0):
+                raise ValueError
+            step = parts[2] if len(parts) == 3 else 1
+            return device, range(parts[0], parts[1] + 1, step)
+        return device, [int(value) for value in values.split(",")]
+    except ValueError:
+        raise ValueError("sweep '{}': bad value list '{}'".format(spec, values))
+
+
+def _write_batches(batches, output_dir, devices):
+    count = 0
+    with (output_dir / "points.jsonl").open("w") as index:
+        for n, (points, rows) in enumerate(batches):
+            name = "sweep_{:05d}.bin".format(n)
+            (output_dir / name).write_bytes(rows)
+            for row, sizes in enumerate(points):
+                index.write(json.dumps({"file": name, "row": row, "sizes": dict(zip(devices, sizes))}) + "\n")
+            count += len(points)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write sizing-sweep variants of a config as batched binary files")
+    parser.add_argument("config", help="Base config JSON")
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        required=True,
+        help="DEVICE=LO:HI[:STEP] or DEVICE=V1,V2,...; repeat for a grid (last varies fastest)",
+    )
+    parser.add_argument("--output-dir", help="Where to write sweep_NNNNN.bin and points.jsonl (omit to only time)")
+    parser.add_argument("--batch-size", type=int, default=4096, help="Rows per batch file")
+    args = parser.parse_args()
+
+    pin_map = json.loads((LIB_DIR / "pin_name_to_sw_matrix_pin_number.json").read_text())
+    config = json.loads(Path(args.config).read_text())
+    try:
+        grid = [parse_sweep(spec) for spec in args.sweep]
+        total = sweep_count(grid)
+        batches = sweep_batches(config, pin_map, grid, args.batch_size)
+        start = time.perf_counter()
+        if args.output_dir:
+            output_dir = Path(args.output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            count = _write_batches(batches, output_dir, [device for device, _ in grid])
+        else:
+            count = sum(len(points) for points, _ in batches)
+        elapsed = time.perf_counter() - start
+    except ValueError as e:
+        print("Error: {}".format(e))
+        return 1
+    print(
+        "{} of {} variants ({} bytes each) in {:.1f} ms ({:.2f} us/variant){}".format(
+            count,
+            total,
+            NBYTES,
+            elapsed * 1000,
+            elapsed * 1e6 / max(count, 1),
+            " -> {}".format(args.output_dir) if args.output_dir else "",
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
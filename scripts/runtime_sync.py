@@ -0,0 +1,178 @@
+"""
+Incremental runtime upload for scripts/upload_runtime.sh --sync.
+
+Hashes the local files, reads the board's hashes in one `mpremote exec`
+session (which also creates directories and removes .py/.mpy leftovers,
+or with --dry-run only reports them, leaving the board untouched),
+then copies only the changed files in one chained `mpremote` connection.
+With --mpy, lib/*.py is cross-compiled first; compiled files are cached by
+source hash, mpy-cross version and architecture.
+"""
+
+import argparse
+import hashlib
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "V2" / "tools"))
+
+from build_mpy import DEFAULT_CACHE_DIR, DEFAULT_MARCH, compile_mpy, mpy_cross_version
+
+REMOTE_HASH_SCRIPT = """
+import os, hashlib, binascii
+for d in {dirs!r}:
+    try:
+        os.stat(d)
+    except OSError:
+        if {write!r}:
+            os.mkdir(d)
+        else:
+            print('D', d)
+for p in {stale!r}:
+    try:
+        if {write!r}:
+            os.remove(p)
+            print('R', p)
+        else:
+            os.stat(p)
+            print('S', p)
+    except OSError:
+        pass
+buf = bytearray(512)
+for p in {paths!r}:
+    try:
+        f = open(p, 'rb')
+    except OSError:
+        print('H', p, '-')
+        continue
+    try:
+        h = hashlib.sha256()
+    except AttributeError:
+        f.close()
+        print('H', p, '?')
+        continue
+    mv = memoryview(buf)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        h.update(mv[:n])
+    f.close()
+    print('H', p, binascii.hexlify(h.digest()).decode())
+"""
+
+
+def _sha256(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def plan_files(pairs, use_mpy, cache_dir, mpy_cross, march):
+    """
+    Return (uploads, stale): uploads as [(local, remote)], stale remote paths to delete.
+    """
+    uploads = []
+    stale = []
+    version = mpy_cross_version(mpy_cross) if use_mpy else None
+    compiled = 0
+    cached = 0
+    for local, remote in pairs:
+        if remote.startswith("lib/") and remote.endswith(".py"):
+            if use_mpy:
+                remote_mpy = remote[:-3] + ".mpy"
+                local, hit = compile_mpy(local, Path(remote).name, cache_dir, mpy_cross, march, version)
+                compiled += 1
+                cached += hit
+                stale.append(remote)
+                remote = remote_mpy
+            else:
+                stale.append(remote[:-3] + ".mpy")
+        elif remote.startswith("lib/") and remote.endswith(".mpy"):
+            stale.append(remote[:-4] + ".py")
+        uploads.append((Path(local), remote))
+    if use_mpy:
+        print("mpy-cross: {} module(s), {} from cache ({})".format(compiled, cached, version))
+    return uploads, stale
+
+
+def remote_hashes(mpremote, uploads, stale, dry_run=False):
+    """
+    Return {remote: sha256 hex} for the board's copies of uploads.
+
+    Creates missing directories and removes stale files first, unless
+    dry_run: then the board is only read, and both are reported instead.
+    """
+    dirs = sorted(set(remote.rsplit("/", 1)[0] for _, remote in uploads if "/" in remote))
+    script = REMOTE_HASH_SCRIPT.format(
+        dirs=dirs, stale=stale, paths=[remote for _, remote in uploads], write=not dry_run
+    )
+    out = subprocess.run(mpremote + ["exec", script], capture_output=True, text=True, check=True)
+    hashes = {}
+    for line in out.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[0] == "H":
+            hashes[parts[1]] = parts[2]
+        elif len(parts) == 2 and parts[0] == "R":
+            print("Removed stale :{}".format(parts[1]))
+        elif len(parts) == 2 and parts[0] == "S":
+            print("Would remove stale :{}".format(parts[1]))
+        elif len(parts) == 2 and parts[0] == "D":
+            print("Would create :{}".format(parts[1]))
+    return hashes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload only changed runtime files to a Pico")
+    parser.add_argument("pairs", nargs="+", help="local:remote file pairs (remote relative to /)")
+    parser.add_argument("--port", help="Serial port passed to 'mpremote connect'")
+    parser.add_argument("--mpy", action="store_true", help="Cross-compile lib/*.py to .mpy before upload")
+    parser.add_argument("--march", default=DEFAULT_MARCH, help="mpy-cross -march value ('' for bytecode only)")
+    parser.add_argument("--mpy-cache", default=str(DEFAULT_CACHE_DIR), help="Directory for compiled .mpy files")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without touching the board")
+    args = parser.parse_args()
+
+    mpremote = ["mpremote"]
+    if args.port:
+        mpremote += ["connect", args.port]
+    mpy_cross = shutil.which("mpy-cross")
+    if args.mpy and mpy_cross is None:
+        print("Error: --mpy needs mpy-cross (pip install mpy-cross)", file=sys.stderr)
+        return 1
+
+    pairs = []
+    for pair in args.pairs:
+        local, sep, remote = pair.partition(":")
+        if not sep or not remote:
+            parser.error("expected local:remote, got '{}'".format(pair))
+        if not Path(local).is_file():
+            parser.error("missing local file {}".format(local))
+        pairs.append((local, remote))
+
+    uploads, stale = plan_files(pairs, args.mpy, Path(args.mpy_cache), mpy_cross, args.march)
+    hashes = remote_hashes(mpremote, uploads, stale, dry_run=args.dry_run)
+    changed = [(local, remote) for local, remote in uploads if hashes.get(remote) != _sha256(local)]
+    changed_bytes = sum(local.stat().st_size for local, _ in changed)
+    print(
+        "{} of {} file(s) changed ({} bytes); {} up to date".format(
+            len(changed), len(uploads), changed_bytes, len(uploads) - len(changed)
+        )
+    )
+    if not changed:
+        return 0
+    cmd = list(mpremote)
+    for i, (local, remote) in enumerate(changed):
+        shown = local.relative_to(ROOT_DIR) if local.is_relative_to(ROOT_DIR) else local
+        print("  {} -> :{}".format(shown, remote))
+        if i:
+            cmd.append("+")
+        cmd += ["fs", "cp", str(local), ":" + remote]
+    if args.dry_run:
+        return 0
+    subprocess.run(cmd, check=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,17 +6,23 @@ ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 usage() {
   cat <<'EOF'
 Usage:
-  scripts/upload_runtime.sh v1 [--port PORT] [--clean]
-  scripts/upload_runtime.sh v2 [--port PORT] [--clean]
+  scripts/upload_runtime.sh v1 [--port PORT] [--clean] [--sync]
+  scripts/upload_runtime.sh v2 [--port PORT] [--clean] [--sync [--mpy]]
 
 Examples:
   scripts/upload_runtime.sh v1
   scripts/upload_runtime.sh v2 --port /dev/tty.usbmodem1101
   scripts/upload_runtime.sh v2 --clean
+  scripts/upload_runtime.sh v2 --sync
+  scripts/upload_runtime.sh v2 --sync --mpy
 
 Notes:
   - Requires mpremote: https://docs.micropython.org/en/latest/reference/mpremote.html
   - Upload target is Pico root (/), with no V1/V2 parent directory.
+  - --sync compares SHA-256 hashes with the board (one mpremote session) and
+    copies only changed files in one more session (scripts/runtime_sync.py).
+  - --mpy (with --sync) cross-compiles lib/*.py with mpy-cross first; builds
+    are cached in .mpy_cache/ by source hash.
 EOF
 }
 
@@ -35,6 +41,8 @@ shift
 
 PORT=""
 CLEAN=0
+SYNC=0
+MPY=0
 
 while [[ $# -gt 0 ]]; do
   case "$1" in
@@ -50,6 +58,14 @@ while [[ $# -gt 0 ]]; do
       CLEAN=1
       shift
       ;;
+    --sync)
+      SYNC=1
+      shift
+      ;;
+    --mpy)
+      MPY=1
+      shift
+      ;;
     -h|--help)
       usage
       exit 0
@@ -62,6 +78,11 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
+if [[ "$MPY" -eq 1 && "$SYNC" -eq 0 ]]; then
+  echo "Error: --mpy requires --sync" >&2
+  exit 1
+fi
+
 MPR=(mpremote)
 if [[ -n "$PORT" ]]; then
   MPR+=(connect "$PORT")
@@ -81,51 +102,127 @@ safe_mkdir() {
   run_mp fs mkdir "$remote_path" >/dev/null 2>&1 || true
 }
 
+# Runtime modules under V2/lib (uploaded as lib/<name>.py, or .mpy with --mpy).
+V2_LIB_MODULES=(
+  async_program
+  bitstream_builder
+  build_cache
+  circuit
+  clock_timing
+  command_server
+  config_validation
+  driver
+  fast_shift
+  frame_stream
+  packed_bitstream
+  parallel_shift
+  pio_shift
+  program_stats
+  register_map_equations
+  register_table
+  sizing_sweep
+  viper_shift
+)
+
+V1_FILES=(
+  "V1/main.py:main.py"
+  "V1/MOSbius.py:MOSbius.py"
+  "V1/connections.json:connections.json"
+)
+
+v2_files() {
+  local module
+  echo "V2/main.py:main.py"
+  echo "V2/config.json:config.json"
+  for module in "${V2_LIB_MODULES[@]}"; do
+    echo "V2/lib/$module.py:lib/$module.py"
+  done
+  echo "V2/lib/pin_name_to_sw_matrix_pin_number.json:lib/pin_name_to_sw_matrix_pin_number.json"
+  # Optional output of V2/tools/frozen_config_generator.py.
+  if [[ -f "$ROOT_DIR/V2/lib/compiled_config.mpy" ]]; then
+    echo "V2/lib/compiled_config.mpy:lib/compiled_config.mpy"
+  elif [[ -f "$ROOT_DIR/V2/lib/compiled_config.py" ]]; then
+    echo "V2/lib/compiled_config.py:lib/compiled_config.py"
+  fi
+}
+
+clean_target() {
+  local module
+  safe_rm :main.py
+  safe_rm :config.json
+  safe_rm :MOSbius.py
+  safe_rm :connections.json
+  for module in "${V2_LIB_MODULES[@]}" compiled_config; do
+    safe_rm ":lib/$module.py"
+    safe_rm ":lib/$module.mpy"
+  done
+  safe_rm :lib/pin_name_to_sw_matrix_pin_number.json
+  safe_rm :lib
+}
+
+copy_files() {
+  local pair
+  for pair in "$@"; do
+    run_mp fs cp "$ROOT_DIR/${pair%%:*}" ":${pair#*:}"
+  done
+}
+
+sync_files() {
+  local args=() pair
+  if [[ -n "$PORT" ]]; then
+    args+=(--port "$PORT")
+  fi
+  if [[ "$MPY" -eq 1 ]]; then
+    args+=(--mpy)
+  fi
+  for pair in "$@"; do
+    args+=("$ROOT_DIR/${pair%%:*}:${pair#*:}")
+  done
+  python3 "$ROOT_DIR/scripts/runtime_sync.py" "${args[@]}"
+}
+
 upload_v1() {
   if [[ "$CLEAN" -eq 1 ]]; then
     echo "Cleaning target files for V1..."
-    safe_rm :main.py
-    safe_rm :MOSbius.py
-    safe_rm :connections.json
-    safe_rm :config.json
-    safe_rm :lib/bitstream_builder.py
-    safe_rm :lib/config_validation.py
-    safe_rm :lib/driver.py
-    safe_rm :lib/register_map_equations.py
-    safe_rm :lib/pin_name_to_sw_matrix_pin_number.json
-    safe_rm :lib
+    clean_target
   fi
 
+  if [[ "$SYNC" -eq 1 ]]; then
+    echo "Syncing V1 runtime to Pico root..."
+    sync_files "${V1_FILES[@]}"
+    return
+  fi
   echo "Uploading V1 runtime to Pico root..."
-  run_mp fs cp "$ROOT_DIR/V1/main.py" :main.py
-  run_mp fs cp "$ROOT_DIR/V1/MOSbius.py" :MOSbius.py
-  run_mp fs cp "$ROOT_DIR/V1/connections.json" :connections.json
+  copy_files "${V1_FILES[@]}"
 }
 
 upload_v2() {
+  local files=()
+  local pair
+  while IFS= read -r pair; do
+    files+=("$pair")
+  done < <(v2_files)
+
   if [[ "$CLEAN" -eq 1 ]]; then
     echo "Cleaning target files for V2..."
-    safe_rm :main.py
-    safe_rm :config.json
-    safe_rm :MOSbius.py
-    safe_rm :connections.json
-    safe_rm :lib/bitstream_builder.py
-    safe_rm :lib/config_validation.py
-    safe_rm :lib/driver.py
-    safe_rm :lib/register_map_equations.py
-    safe_rm :lib/pin_name_to_sw_matrix_pin_number.json
-    safe_rm :lib
+    clean_target
   fi
 
+  if [[ "$SYNC" -eq 1 ]]; then
+    echo "Syncing V2 runtime to Pico root..."
+    sync_files "${files[@]}"
+    return
+  fi
   echo "Uploading V2 runtime to Pico root..."
   safe_mkdir :lib
-  run_mp fs cp "$ROOT_DIR/V2/main.py" :main.py
-  run_mp fs cp "$ROOT_DIR/V2/config.json" :config.json
-  run_mp fs cp "$ROOT_DIR/V2/lib/bitstream_builder.py" :lib/bitstream_builder.py
-  run_mp fs cp "$ROOT_DIR/V2/lib/config_validation.py" :lib/config_validation.py
-  run_mp fs cp "$ROOT_DIR/V2/lib/driver.py" :lib/driver.py
-  run_mp fs cp "$ROOT_DIR/V2/lib/register_map_equations.py" :lib/register_map_equations.py
-  run_mp fs cp "$ROOT_DIR/V2/lib/pin_name_to_sw_matrix_pin_number.json" :lib/pin_name_to_sw_matrix_pin_number.json
+  # A stale compiled_config of the other format would shadow the new one.
+  for pair in "${files[@]}"; do
+    case "${pair#*:}" in
+      lib/compiled_config.mpy) safe_rm :lib/compiled_config.py ;;
+      lib/compiled_config.py) safe_rm :lib/compiled_config.mpy ;;
+    esac
+  done
+  copy_files "${files[@]}"
 }
 
 case "$FLOW" in